@@ -95,6 +95,45 @@ class ModelPermission:
 
         return cls._inheritances[model]
 
+    @classmethod
+    def get_inheritance_lookups(cls, model):
+        """
+        Return the field lookups from a model to every model it inherits
+        access from, recursively. Generic foreign key inheritances have no
+        model.
+        """
+        result = []
+
+        try:
+            inheritances = cls.get_inheritances(model=model)
+        except KeyError:
+            return result
+
+        for inheritance in inheritances:
+            related_model = get_related_field(
+                model=model, related_field_name=inheritance['field_name']
+            ).related_model
+
+            result.append(
+                {
+                    'field_lookup': inheritance['field_name'],
+                    'model': related_model
+                }
+            )
+
+            if related_model and related_model != model:
+                for entry in cls.get_inheritance_lookups(model=related_model):
+                    result.append(
+                        {
+                            'field_lookup': '{}__{}'.format(
+                                inheritance['field_name'],
+                                entry['field_lookup']
+                            ), 'model': entry['model']
+                        }
+                    )
+
+        return result
+
     @classmethod
     def get_manager(cls, model):
         try:
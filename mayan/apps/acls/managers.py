@@ -293,6 +293,64 @@ class AccessControlListManager(models.Manager):
             # or is staff. Return the entire queryset.
             return queryset
 
+    def get_access_role_ids(self, obj, permission):
+        """
+        Return the ids of the roles granted a permission for an object via
+        its ACLs or the ACLs inherited from its related objects.
+        """
+        result = set()
+
+        if not obj:
+            return result
+
+        content_type = ContentType.objects.get_for_model(model=obj)
+        result.update(
+            self.filter(
+                content_type=content_type, object_id=obj.pk,
+                permissions=permission.stored_permission
+            ).values_list('role_id', flat=True)
+        )
+
+        try:
+            inheritances = ModelPermission.get_inheritances(
+                model=type(obj)
+            )
+        except KeyError:
+            """
+            Does not have inheritance to other models.
+            """
+        else:
+            for inheritance in inheritances:
+                try:
+                    parent_object = resolve_attribute(
+                        obj=obj, attribute=inheritance['field_name']
+                    )
+                except AttributeError:
+                    # Parent accessor is not an attribute, try it as a related
+                    # field.
+                    parent_object = return_related(
+                        instance=obj, related_field=inheritance['field_name']
+                    )
+
+                if type(parent_object) == type(obj):
+                    # Object and parent are of the same type. Add only the
+                    # parent's ACLs to break the recursion.
+                    result.update(
+                        self.filter(
+                            content_type=content_type,
+                            object_id=parent_object.pk,
+                            permissions=permission.stored_permission
+                        ).values_list('role_id', flat=True)
+                    )
+                else:
+                    result.update(
+                        self.get_access_role_ids(
+                            obj=parent_object, permission=permission
+                        )
+                    )
+
+        return result
+
     def get_inherited_permissions(self, obj, role):
         # Get permission inherited from a related object's ACLs.
         queryset = self._get_inherited_object_permissions(obj=obj, role=role)
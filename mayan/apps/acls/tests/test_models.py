@@ -166,6 +166,34 @@ class PermissionTestCase(ACLTestMixin, BaseTestCase):
         )
         self.assertTrue(self.test_object_child in result)
 
+    def test_get_access_role_ids_with_inherited_acl(self):
+        self._setup_child_parent_test_objects()
+
+        self.assertEqual(
+            AccessControlList.objects.get_access_role_ids(
+                obj=self.test_object_child, permission=self.test_permission
+            ), set()
+        )
+
+        self.grant_access(
+            obj=self.test_object_parent, permission=self.test_permission
+        )
+
+        self.assertEqual(
+            AccessControlList.objects.get_access_role_ids(
+                obj=self.test_object_child, permission=self.test_permission
+            ), {self._test_case_role.pk}
+        )
+
+    def test_get_inheritance_lookups(self):
+        self._setup_child_parent_test_objects()
+
+        self.assertEqual(
+            ModelPermission.get_inheritance_lookups(
+                model=self.TestModelChild
+            ), [{'field_lookup': 'parent', 'model': self.TestModelParent}]
+        )
+
     def test_method_get_absolute_url(self):
         self._create_acl_test_object()
         self._create_test_acl()
@@ -92,10 +92,7 @@ class APIAssetImageView(generics.RetrieveAPIView):
             kwargs['disable_sync_subtasks'] = False
 
         cache_filename = task.get(**kwargs)
-        cache_file = self.get_object().cache_partition.get_file(
-            filename=cache_filename
-        )
-        with cache_file.open() as file_object:
+        with self.get_object().cache_partition.open_file(filename=cache_filename) as file_object:
             response = HttpResponse(file_object.read(), content_type='image')
             if '_hash' in request.GET:
                 patch_cache_control(
@@ -1,6 +1,6 @@
 import io
 import logging
-import shutil
+import os
 import struct
 
 from PIL import Image
@@ -10,7 +10,7 @@ import sh
 from django.utils.encoding import force_text
 from django.utils.translation import ugettext_lazy as _
 
-from mayan.apps.storage.utils import NamedTemporaryFile
+from mayan.apps.storage.utils import fs_cleanup, mkdtemp
 
 from ..classes import ConverterBase
 from ..exceptions import PageCountError
@@ -66,23 +66,46 @@ class Python(ConverterBase):
         super().convert(*args, **kwargs)
 
         if self.mime_type == 'application/pdf' and pdftoppm:
-            new_file_object = NamedTemporaryFile()
-            input_filepath = new_file_object.name
-            self.file_object.seek(0)
-            shutil.copyfileobj(fsrc=self.file_object, fdst=new_file_object)
-            self.file_object.seek(0)
-            new_file_object.seek(0)
-
             image_buffer = io.BytesIO()
+            pdftoppm(
+                self.get_source_path(), f=self.page_number + 1,
+                l=self.page_number + 1, _out=image_buffer
+            )
+            image_buffer.seek(0)
+            return Image.open(fp=image_buffer)
+
+    def convert_many(self, first_page_number, last_page_number):
+        if self.mime_type == 'application/pdf' and pdftoppm:
+            # Render the whole range with a single pdftoppm execution. Each
+            # page is written to a separate file named
+            # "<prefix>-<page number>.<extension>".
+            output_directory = mkdtemp()
             try:
                 pdftoppm(
-                    input_filepath, f=self.page_number + 1,
-                    l=self.page_number + 1, _out=image_buffer
+                    self.get_source_path(),
+                    os.path.join(output_directory, 'page'),
+                    f=first_page_number + 1, l=last_page_number + 1
                 )
-                image_buffer.seek(0)
-                return Image.open(fp=image_buffer)
+
+                filenames = {}
+                for filename in os.listdir(output_directory):
+                    page_number = int(
+                        os.path.splitext(filename)[0].rsplit('-', 1)[1]
+                    )
+                    filenames[page_number - 1] = filename
+
+                for page_number in sorted(filenames):
+                    with open(file=os.path.join(output_directory, filenames[page_number]), mode='rb') as file_object:
+                        image = Image.open(fp=io.BytesIO(file_object.read()))
+
+                    yield page_number, image
             finally:
-                new_file_object.close()
+                fs_cleanup(filename=output_directory)
+        else:
+            yield from super().convert_many(
+                first_page_number=first_page_number,
+                last_page_number=last_page_number
+            )
 
     def get_page_count(self):
         super().get_page_count()
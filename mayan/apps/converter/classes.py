@@ -1,8 +1,11 @@
+from collections import OrderedDict
 import copy
 from io import BytesIO
 import logging
+import math
 import os
 import shutil
+import threading
 
 import PIL
 from PIL import Image
@@ -18,24 +21,27 @@ from django.utils.module_loading import import_string
 from django.utils.translation import ugettext_lazy as _
 
 from mayan.apps.appearance.classes import Icon
-from mayan.apps.mimetype.api import get_mimetype
+from mayan.apps.common.serialization import yaml_load
+from mayan.apps.mimetype.api import get_mimetype_from_path
 from mayan.apps.navigation.classes import Link
 from mayan.apps.storage.compressed_files import MsgArchive
 from mayan.apps.storage.literals import MSG_MIME_TYPES
-from mayan.apps.storage.settings import setting_temporary_directory
 from mayan.apps.storage.utils import (
-    NamedTemporaryFile, fs_cleanup, mkdtemp
+    MaterializedFile, NamedTemporaryFile, fs_cleanup, mkdtemp
 )
 
 from .exceptions import (
     InvalidOfficeFormat, LayerError, OfficeConversionError
 )
+from .libreoffice import LibreOfficeServerPool
 from .literals import (
     CONVERTER_OFFICE_FILE_MIMETYPES, DEFAULT_LIBREOFFICE_PATH,
-    DEFAULT_PAGE_NUMBER, DEFAULT_PILLOW_FORMAT
+    DEFAULT_PAGE_NUMBER, DEFAULT_PILLOW_FORMAT,
+    LAYER_TRANSFORMATION_ARGUMENTS_CACHE_SIZE
 )
 from .settings import (
-    setting_graphics_backend, setting_graphics_backend_arguments
+    setting_asset_image_memory_cache_maximum_size, setting_graphics_backend,
+    setting_graphics_backend_arguments
 )
 
 logger = logging.getLogger(name=__name__)
@@ -71,6 +77,56 @@ class AppImageErrorImage:
         return staticfiles_storage.open(name=self.image_path, mode='rb')
 
 
+class AssetImageCache:
+    """
+    Per process cache of the asset images prepared for the paste and
+    watermark transformations, limited to a total size in bytes. Least
+    recently used entries are discarded first.
+    """
+    _entries = OrderedDict()
+    _lock = threading.Lock()
+    _size = 0
+
+    @staticmethod
+    def get_entry_size(value):
+        return sum(
+            len(image.getbands()) * image.width * image.height for image in value.values()
+        )
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._entries.clear()
+            cls._size = 0
+
+    @classmethod
+    def get(cls, key):
+        with cls._lock:
+            entry = cls._entries.get(key)
+
+            if entry:
+                cls._entries.move_to_end(key=key)
+                return entry['value']
+
+    @classmethod
+    def set(cls, key, value):
+        maximum_size = setting_asset_image_memory_cache_maximum_size.value
+        size = cls.get_entry_size(value=value)
+
+        if size > maximum_size:
+            return
+
+        with cls._lock:
+            if key in cls._entries:
+                cls._size -= cls._entries.pop(key)['size']
+
+            while cls._entries and cls._size + size > maximum_size:
+                cls._size -= cls._entries.popitem(last=False)[1]['size']
+
+            cls._entries[key] = {'size': size, 'value': value}
+            cls._size += size
+
+
 class ConverterBase:
     @staticmethod
     def get_converter_class():
@@ -79,8 +135,9 @@ class ConverterBase:
     def __init__(self, file_object, mime_type=None):
         self.file_object = file_object
         self.image = None
-        self.mime_type = mime_type or get_mimetype(
-            file_object=file_object, mimetype_only=False
+        self.materialized_file = None
+        self.mime_type = mime_type or get_mimetype_from_path(
+            mimetype_only=False, path=self.get_source_path()
         )[0]
         self.soffice_file = None
         Image.init()
@@ -91,9 +148,46 @@ class ConverterBase:
         except sh.CommandNotFound:
             self.command_libreoffice = None
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _get_pages_paged_image(self, first_page_number, image, last_page_number):
+        for page_number in range(first_page_number, last_page_number + 1):
+            try:
+                image.seek(page_number)
+            except EOFError:
+                return
+            else:
+                image.load()
+                yield page_number, image
+
+    def close(self):
+        """
+        Release the temporary copy of the source file and the converted
+        PDF file, if any.
+        """
+        if self.materialized_file:
+            self.materialized_file.close()
+            self.materialized_file = None
+
+        if self.soffice_file:
+            self.soffice_file.close()
+            self.soffice_file = None
+
     def convert(self, page_number=DEFAULT_PAGE_NUMBER):
         self.page_number = page_number
 
+    def convert_many(self, first_page_number, last_page_number):
+        """
+        Generator of the page number and image of a range of pages. Backends
+        able to render several pages in a single pass override this method.
+        """
+        for page_number in range(first_page_number, last_page_number + 1):
+            yield page_number, self.convert(page_number=page_number)
+
     def get_page(self, output_format=None):
         output_format = output_format or setting_graphics_backend_arguments.value.get(
             'pillow_format', DEFAULT_PILLOW_FORMAT
@@ -122,6 +216,48 @@ class ConverterBase:
         except InvalidOfficeFormat as exception:
             logger.debug('Is not an office format document; %s', exception)
 
+    def get_pages(self, first_page_number, last_page_number, output_format=None):
+        """
+        Generator of the page number and image buffer of a range of pages,
+        both ends included. Page numbers start with #0. The source file
+        object is read once for the whole range.
+        """
+        self.file_object.seek(0)
+
+        try:
+            image = Image.open(fp=self.file_object)
+        except IOError:
+            # Cannot identify image file
+            images = self.convert_many(
+                first_page_number=first_page_number,
+                last_page_number=last_page_number
+            )
+        else:
+            images = self._get_pages_paged_image(
+                first_page_number=first_page_number, image=image,
+                last_page_number=last_page_number
+            )
+
+        for page_number, image in images:
+            self.image = image
+            yield page_number, self.get_page(output_format=output_format)
+
+    def get_source_path(self):
+        """
+        Return a filesystem path with the content of the source file object.
+        Sources not stored in a local file are copied to a temporary file
+        only once per converter instance and source file object.
+        """
+        if not self.materialized_file or self.materialized_file.file_object is not self.file_object:
+            if self.materialized_file:
+                self.materialized_file.close()
+
+            self.materialized_file = MaterializedFile(
+                file_object=self.file_object
+            )
+
+        return self.materialized_file.get_path()
+
     def seek_page(self, page_number):
         """
         Seek the specified page number from the source file object.
@@ -150,91 +286,114 @@ class ConverterBase:
 
     def soffice(self):
         """
-        Executes LibreOffice as a sub process
+        Convert the source file to PDF using LibreOffice. Conversions are
+        sent to the LibreOffice server pool when enabled, falling back to
+        executing LibreOffice as a sub process.
         """
         if not self.command_libreoffice:
             raise OfficeConversionError(
                 _('LibreOffice not installed or not found.')
             )
 
-        with NamedTemporaryFile() as temporary_file_object:
-            # Copy the source file object of the converter instance to a
-            # named temporary file to be able to pass it to the LibreOffice
-            # execution.
-            self.file_object.seek(0)
-            shutil.copyfileobj(
-                fsrc=self.file_object, fdst=temporary_file_object
-            )
-            self.file_object.seek(0)
-            temporary_file_object.seek(0)
-
-            libreoffice_home_directory = mkdtemp()
-            args = (
-                temporary_file_object.name, '--outdir', setting_temporary_directory.value,
-                '-env:UserInstallation=file://{}'.format(
-                    os.path.join(
-                        libreoffice_home_directory, 'LibreOffice_Conversion'
-                    )
-                ),
-            )
+        # The output directory is unique to avoid name collisions when the
+        # same source file is converted concurrently.
+        source_path = self.get_source_path()
+        output_directory = mkdtemp()
 
-            kwargs = {'_env': {'HOME': libreoffice_home_directory}}
+        # LibreOffice return a PDF file with the same name as the input
+        # provided but with the .pdf extension.
 
-            if self.mime_type == 'text/plain':
-                kwargs.update(
-                    {'infilter': 'Text (encoded):UTF8,LF,,,'}
-                )
+        # Get the converted output file path out of the source file
+        # name plus the output directory
 
-            try:
-                self.command_libreoffice(*args, **kwargs)
-            except sh.ErrorReturnCode as exception:
-                temporary_file_object.close()
-                raise OfficeConversionError(exception)
-            except Exception as exception:
-                temporary_file_object.close()
-                logger.error(
-                    'Exception launching LibreOffice; %s', exception,
-                    exc_info=True
+        filename, extension = os.path.splitext(
+            os.path.basename(source_path)
+        )
+
+        logger.debug('filename: %s', filename)
+        logger.debug('extension: %s', extension)
+
+        converted_file_path = os.path.join(
+            output_directory, os.path.extsep.join((filename, 'pdf'))
+        )
+        logger.debug('converted_file_path: %s', converted_file_path)
+
+        try:
+            # Plain text files need an import filter option not supported
+            # by the server.
+            if LibreOfficeServerPool.is_enabled() and self.mime_type != 'text/plain':
+                try:
+                    LibreOfficeServerPool.convert(
+                        output_path=converted_file_path,
+                        source_path=source_path
+                    )
+                except OfficeConversionError as exception:
+                    logger.warning(
+                        'Unable to convert using the LibreOffice server, '
+                        'executing LibreOffice instead; %s', exception
+                    )
+                    self.soffice_execute(
+                        output_directory=output_directory,
+                        source_path=source_path
+                    )
+            else:
+                self.soffice_execute(
+                    output_directory=output_directory,
+                    source_path=source_path
                 )
-                raise
-            finally:
-                fs_cleanup(filename=libreoffice_home_directory)
 
-            # LibreOffice return a PDF file with the same name as the input
-            # provided but with the .pdf extension.
+            # Don't use context manager with the NamedTemporaryFile on
+            # purpose so that it is deleted when the caller closes the file
+            # and not before.
 
-            # Get the converted output file path out of the temporary file
-            # name plus the temporary directory
+            temporary_converted_file_object = NamedTemporaryFile()
 
-            filename, extension = os.path.splitext(
-                os.path.basename(temporary_file_object.name)
-            )
+            # Copy the LibreOffice output file to a new named temporary file
+            # and delete the converted file
+            with open(file=converted_file_path, mode='rb') as converted_file_object:
+                shutil.copyfileobj(
+                    fsrc=converted_file_object,
+                    fdst=temporary_converted_file_object
+                )
+        finally:
+            fs_cleanup(filename=output_directory)
 
-            logger.debug('filename: %s', filename)
-            logger.debug('extension: %s', extension)
+        temporary_converted_file_object.seek(0)
+        return temporary_converted_file_object
 
-            converted_file_path = os.path.join(
-                setting_temporary_directory.value, os.path.extsep.join(
-                    (filename, 'pdf')
+    def soffice_execute(self, output_directory, source_path):
+        """
+        Executes LibreOffice as a sub process
+        """
+        libreoffice_home_directory = mkdtemp()
+        args = (
+            source_path, '--outdir', output_directory,
+            '-env:UserInstallation=file://{}'.format(
+                os.path.join(
+                    libreoffice_home_directory, 'LibreOffice_Conversion'
                 )
-            )
-            logger.debug('converted_file_path: %s', converted_file_path)
+            ),
+        )
 
-        # Don't use context manager with the NamedTemporaryFile on purpose
-        # so that it is deleted when the caller closes the file and not
-        # before.
+        kwargs = {'_env': {'HOME': libreoffice_home_directory}}
 
-        temporary_converted_file_object = NamedTemporaryFile()
+        if self.mime_type == 'text/plain':
+            kwargs.update(
+                {'infilter': 'Text (encoded):UTF8,LF,,,'}
+            )
 
-        # Copy the LibreOffice output file to a new named temporary file
-        # and delete the converted file
-        with open(file=converted_file_path, mode='rb') as converted_file_object:
-            shutil.copyfileobj(
-                fsrc=converted_file_object, fdst=temporary_converted_file_object
+        try:
+            self.command_libreoffice(*args, **kwargs)
+        except sh.ErrorReturnCode as exception:
+            raise OfficeConversionError(exception)
+        except Exception as exception:
+            logger.error(
+                'Exception launching LibreOffice; %s', exception,
+                exc_info=True
             )
-        fs_cleanup(filename=converted_file_path)
-        temporary_converted_file_object.seek(0)
-        return temporary_converted_file_object
+            raise
+        finally:
+            fs_cleanup(filename=libreoffice_home_directory)
 
     def to_pdf(self):
         # Handle .msg files
@@ -251,8 +410,8 @@ class ConverterBase:
                         filename=members[0]
                     )
 
-                self.mime_type = get_mimetype(
-                    file_object=self.file_object, mimetype_only=True
+                self.mime_type = get_mimetype_from_path(
+                    mimetype_only=True, path=self.get_source_path()
                 )[0]
 
         if self.mime_type in CONVERTER_OFFICE_FILE_MIMETYPES:
@@ -267,13 +426,100 @@ class ConverterBase:
         self.image = transformation.execute_on(image=self.image)
 
     def transform_many(self, transformations):
+        """
+        Apply a list of transformations compiled to fuse the adjacent
+        geometric transformations.
+        """
+        # Hide a circular import.
+        from .transformations import BaseTransformation
+
         if not self.image:
             self.seek_page(page_number=0)
 
-        for transformation in transformations:
+        for transformation in BaseTransformation.compile(transformations=transformations):
             self.image = transformation.execute_on(image=self.image)
 
 
+class ImageTilePyramid:
+    """
+    Deep Zoom style pyramid of square tiles of an image. Level 0 is the
+    image reduced to a single pixel, each level doubles the size of the
+    previous one and the last level is the image at its full size.
+    """
+    def __init__(self, height, tile_size, width):
+        self.height = height
+        self.tile_size = tile_size
+        self.width = width
+
+    def get_level_count(self):
+        return math.ceil(math.log2(max(self.height, self.width, 1))) + 1
+
+    def get_level_size(self, level):
+        if not 0 <= level < self.get_level_count():
+            raise IndexError('Invalid level: {}'.format(level))
+
+        divisor = 2 ** (self.get_level_count() - 1 - level)
+
+        return (
+            math.ceil(self.width / divisor), math.ceil(self.height / divisor)
+        )
+
+    def get_tile_box(self, column, level, row):
+        """
+        Return the left, top, right and bottom coordinates of a tile in the
+        image of its level.
+        """
+        width, height = self.get_level_size(level=level)
+        column_count, row_count = self.get_tile_count(level=level)
+
+        if not (0 <= column < column_count and 0 <= row < row_count):
+            raise IndexError(
+                'Invalid tile: {}, {}, {}'.format(level, column, row)
+            )
+
+        left = column * self.tile_size
+        top = row * self.tile_size
+
+        return (
+            left, top, min(left + self.tile_size, width),
+            min(top + self.tile_size, height)
+        )
+
+    def get_tile_count(self, level):
+        width, height = self.get_level_size(level=level)
+
+        return (
+            math.ceil(width / self.tile_size),
+            math.ceil(height / self.tile_size)
+        )
+
+    def render_tile(self, column, image, level, row):
+        """
+        Return the tile image from the full size image. `image` must not
+        be loaded yet to allow formats like JPEG to decode the image
+        directly at a reduced size for the lower levels.
+        """
+        left, top, right, bottom = self.get_tile_box(
+            column=column, level=level, row=row
+        )
+        level_width, level_height = self.get_level_size(level=level)
+
+        image.draft(None, (level_width, level_height))
+
+        scale_x = image.width / level_width
+        scale_y = image.height / level_height
+
+        if scale_x == 1 and scale_y == 1:
+            return image.crop(box=(left, top, right, bottom))
+        else:
+            return image.resize(
+                box=(
+                    left * scale_x, top * scale_y, right * scale_x,
+                    bottom * scale_y
+                ), resample=Image.LANCZOS, size=(right - left, bottom - top)
+            )
+
+
 class Layer:
     _registry = {}
 
@@ -506,3 +752,45 @@ class LayerLinkKwargsFactory:
             }
 
         return get_kwargs
+
+
+class LayerTransformationArgumentCache:
+    """
+    Per process cache of the parsed YAML arguments of the layer
+    transformations, keyed by the argument text. The arguments are parsed
+    once instead of on every image request. Keying by the text itself
+    keeps the entries valid when transformations are edited by other
+    processes.
+    """
+    _entries = OrderedDict()
+    _lock = threading.Lock()
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._entries.clear()
+
+    @classmethod
+    def get(cls, arguments):
+        """
+        Return a new dictionary with the parsed arguments.
+        """
+        if not arguments:
+            # Some transformations don't require arguments return an empty
+            # dictionary as ** doesn't allow None.
+            return {}
+
+        with cls._lock:
+            if arguments in cls._entries:
+                cls._entries.move_to_end(key=arguments)
+                return dict(cls._entries[arguments])
+
+        result = yaml_load(stream=arguments)
+
+        with cls._lock:
+            cls._entries[arguments] = result
+
+            while len(cls._entries) > LAYER_TRANSFORMATION_ARGUMENTS_CACHE_SIZE:
+                cls._entries.popitem(last=False)
+
+        return dict(result)
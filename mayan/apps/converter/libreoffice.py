@@ -0,0 +1,221 @@
+import atexit
+import logging
+import os
+import queue
+import signal
+import socket
+import subprocess
+import threading
+import time
+import xmlrpc.client
+
+from django.utils.translation import ugettext_lazy as _
+
+from mayan.apps.storage.utils import fs_cleanup, mkdtemp
+
+from .exceptions import OfficeConversionError
+from .literals import (
+    DEFAULT_LIBREOFFICE_PATH, DEFAULT_LIBREOFFICE_SERVER_COUNT,
+    DEFAULT_LIBREOFFICE_SERVER_TIMEOUT, DEFAULT_UNOSERVER_PATH,
+    LIBREOFFICE_SERVER_INTERFACE, LIBREOFFICE_SERVER_STARTUP_TIMEOUT,
+    LIBREOFFICE_SERVER_STOP_TIMEOUT
+)
+from .settings import setting_graphics_backend_arguments
+
+logger = logging.getLogger(name=__name__)
+
+
+class TimeoutTransport(xmlrpc.client.Transport):
+    """
+    XML-RPC transport with a socket timeout.
+    """
+    def __init__(self, timeout, *args, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def make_connection(self, host):
+        connection = super().make_connection(host)
+        connection.timeout = self.timeout
+        return connection
+
+
+class LibreOfficeServer:
+    """
+    Local LibreOffice instance managed by an unoserver listener. The
+    LibreOffice process and its user profile stay loaded between
+    conversions.
+    """
+    @staticmethod
+    def get_free_port():
+        with socket.socket(family=socket.AF_INET, type=socket.SOCK_STREAM) as sock:
+            sock.bind((LIBREOFFICE_SERVER_INTERFACE, 0))
+            return sock.getsockname()[1]
+
+    def __init__(self, executable_path, libreoffice_path):
+        self.executable_path = executable_path
+        self.libreoffice_path = libreoffice_path
+        self.port = None
+        self.process = None
+        self.profile_directory = None
+
+    def convert(self, source_path, output_path, timeout):
+        proxy = xmlrpc.client.ServerProxy(
+            allow_none=True, transport=TimeoutTransport(timeout=timeout),
+            uri='http://{}:{}'.format(LIBREOFFICE_SERVER_INTERFACE, self.port)
+        )
+        # The output format is deduced from the output file extension.
+        proxy.convert(source_path, None, output_path)
+
+    def is_running(self):
+        return self.process is not None and self.process.poll() is None
+
+    def start(self):
+        self.port = self.get_free_port()
+        self.profile_directory = mkdtemp()
+
+        self.process = subprocess.Popen(
+            args=(
+                self.executable_path, '--executable', self.libreoffice_path,
+                '--interface', LIBREOFFICE_SERVER_INTERFACE,
+                '--port', str(self.port),
+                '--uno-interface', LIBREOFFICE_SERVER_INTERFACE,
+                '--uno-port', str(self.get_free_port()),
+                '--user-installation', 'file://{}'.format(
+                    self.profile_directory
+                )
+            ), env=dict(os.environ, HOME=self.profile_directory),
+            start_new_session=True, stderr=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL
+        )
+
+        time_limit = time.monotonic() + LIBREOFFICE_SERVER_STARTUP_TIMEOUT
+
+        while time.monotonic() < time_limit:
+            if not self.is_running():
+                break
+
+            try:
+                socket.create_connection(
+                    address=(LIBREOFFICE_SERVER_INTERFACE, self.port),
+                    timeout=1
+                ).close()
+            except OSError:
+                time.sleep(0.5)
+            else:
+                logger.debug(
+                    'LibreOffice server started on port %d', self.port
+                )
+                return
+
+        self.stop()
+        raise OfficeConversionError(
+            _('Unable to start the LibreOffice server.')
+        )
+
+    def stop(self):
+        if self.process:
+            try:
+                # Stop the listener and the LibreOffice process it started.
+                os.killpg(self.process.pid, signal.SIGTERM)
+                self.process.wait(timeout=LIBREOFFICE_SERVER_STOP_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                os.killpg(self.process.pid, signal.SIGKILL)
+                self.process.wait()
+            except ProcessLookupError:
+                """Already exited."""
+
+            self.process = None
+
+        if self.profile_directory:
+            fs_cleanup(filename=self.profile_directory)
+            self.profile_directory = None
+
+
+class LibreOfficeServerPool:
+    """
+    Per process pool of LibreOffice servers. Servers are started on first
+    use, restarted when they stop or a conversion fails and stopped when
+    the process exits.
+    """
+    _lock = threading.Lock()
+    _queue = None
+    _servers = []
+
+    @classmethod
+    def _get_queue(cls):
+        with cls._lock:
+            if cls._queue is None:
+                cls._queue = queue.Queue()
+                arguments = setting_graphics_backend_arguments.value
+
+                for index in range(cls.get_size()):
+                    server = LibreOfficeServer(
+                        executable_path=arguments.get(
+                            'libreoffice_server_path', DEFAULT_UNOSERVER_PATH
+                        ), libreoffice_path=arguments.get(
+                            'libreoffice_path', DEFAULT_LIBREOFFICE_PATH
+                        )
+                    )
+                    cls._servers.append(server)
+                    cls._queue.put(server)
+
+                atexit.register(cls.stop)
+
+            return cls._queue
+
+    @classmethod
+    def convert(cls, source_path, output_path):
+        """
+        Convert a file using the first available server. Raises
+        OfficeConversionError if no server becomes available or the
+        conversion fails or takes longer than the timeout.
+        """
+        timeout = setting_graphics_backend_arguments.value.get(
+            'libreoffice_server_timeout', DEFAULT_LIBREOFFICE_SERVER_TIMEOUT
+        )
+
+        server_queue = cls._get_queue()
+
+        try:
+            server = server_queue.get(timeout=timeout)
+        except queue.Empty:
+            raise OfficeConversionError(
+                _('No LibreOffice server available.')
+            )
+
+        try:
+            if not server.is_running():
+                server.stop()
+                server.start()
+
+            server.convert(
+                output_path=output_path, source_path=source_path,
+                timeout=timeout
+            )
+        except OfficeConversionError:
+            raise
+        except Exception as exception:
+            # Discard the server state, it is restarted on the next use.
+            server.stop()
+            raise OfficeConversionError(exception)
+        finally:
+            server_queue.put(server)
+
+    @staticmethod
+    def get_size():
+        return setting_graphics_backend_arguments.value.get(
+            'libreoffice_server_count', DEFAULT_LIBREOFFICE_SERVER_COUNT
+        )
+
+    @classmethod
+    def is_enabled(cls):
+        return cls.get_size() > 0
+
+    @classmethod
+    def stop(cls):
+        with cls._lock:
+            for server in cls._servers:
+                server.stop()
+
+            cls._queue = None
+            cls._servers = []
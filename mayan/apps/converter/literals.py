@@ -57,13 +57,17 @@ if platform.system() in ('FreeBSD', 'OpenBSD', 'Darwin'):
     DEFAULT_LIBREOFFICE_PATH = '/usr/local/bin/libreoffice'
     DEFAULT_PDFINFO_PATH = '/usr/local/bin/pdfinfo'
     DEFAULT_PDFTOPPM_PATH = '/usr/local/bin/pdftoppm'
+    DEFAULT_UNOSERVER_PATH = '/usr/local/bin/unoserver'
 else:
     DEFAULT_LIBREOFFICE_PATH = '/usr/bin/libreoffice'
     DEFAULT_PDFINFO_PATH = '/usr/bin/pdfinfo'
     DEFAULT_PDFTOPPM_PATH = '/usr/bin/pdftoppm'
+    DEFAULT_UNOSERVER_PATH = '/usr/bin/unoserver'
 
 DEFAULT_CONVERTER_ASSET_CACHE_MAXIMUM_SIZE = 10 * 2 ** 20  # 10 Megabytes
 DEFAULT_CONVERTER_ASSET_CACHE_TIME = '31556926'
+DEFAULT_CONVERTER_ASSET_IMAGE_FILE_CACHE_ENABLED = False
+DEFAULT_CONVERTER_ASSET_IMAGE_MEMORY_CACHE_MAXIMUM_SIZE = 32 * 2 ** 20  # 32 Megabytes
 DEFAULT_CONVERTER_ASSET_CACHE_STORAGE_BACKEND = 'django.core.files.storage.FileSystemStorage'
 DEFAULT_CONVERTER_ASSET_CACHE_STORAGE_BACKEND_ARGUMENTS = {
     'location': os.path.join(settings.MEDIA_ROOT, 'converter_assets_cache')
@@ -73,6 +77,8 @@ DEFAULT_CONVERTER_ASSET_STORAGE_BACKEND_ARGUMENTS = {
     'location': os.path.join(settings.MEDIA_ROOT, 'converter_assets')
 }
 DEFAULT_CONVERTER_GRAPHICS_BACKEND = 'mayan.apps.converter.backends.python.Python'
+DEFAULT_LIBREOFFICE_SERVER_COUNT = 0
+DEFAULT_LIBREOFFICE_SERVER_TIMEOUT = 120  # seconds
 DEFAULT_PAGE_NUMBER = 1
 DEFAULT_PDFTOPPM_DPI = 300
 DEFAULT_PDFTOPPM_FORMAT = 'jpeg'  # Possible values jpeg, png, tiff
@@ -83,6 +89,9 @@ DEFAULT_ZOOM_LEVEL = 100
 
 DEFAULT_CONVERTER_GRAPHICS_BACKEND_ARGUMENTS = {
     'libreoffice_path': DEFAULT_LIBREOFFICE_PATH,
+    'libreoffice_server_count': DEFAULT_LIBREOFFICE_SERVER_COUNT,
+    'libreoffice_server_path': DEFAULT_UNOSERVER_PATH,
+    'libreoffice_server_timeout': DEFAULT_LIBREOFFICE_SERVER_TIMEOUT,
     'pdftoppm_dpi': DEFAULT_PDFTOPPM_DPI,
     'pdftoppm_format': DEFAULT_PDFTOPPM_FORMAT,
     'pdftoppm_path': DEFAULT_PDFTOPPM_PATH,
@@ -91,6 +100,12 @@ DEFAULT_CONVERTER_GRAPHICS_BACKEND_ARGUMENTS = {
     'pillow_maximum_image_pixels': DEFAULT_PILLOW_MAXIMUM_IMAGE_PIXELS,
 }
 
+# Number of distinct transformation argument texts kept parsed in memory.
+LAYER_TRANSFORMATION_ARGUMENTS_CACHE_SIZE = 1024
+LIBREOFFICE_SERVER_INTERFACE = '127.0.0.1'
+LIBREOFFICE_SERVER_STARTUP_TIMEOUT = 60  # seconds
+LIBREOFFICE_SERVER_STOP_TIMEOUT = 10  # seconds
+
 STORAGE_NAME_ASSETS = 'converter__assets'
 STORAGE_NAME_ASSETS_CACHE = 'converter__assets_cache'
 
@@ -1,20 +1,48 @@
 import logging
 
-from django.apps import apps
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import PermissionDenied
 from django.db import models
 
 from mayan.apps.acls.models import AccessControlList
-from mayan.apps.common.serialization import yaml_load
 
-from .classes import Layer
+from .classes import Layer, LayerTransformationArgumentCache
 from .transformations import BaseTransformation
 
 logger = logging.getLogger(name=__name__)
 
 
 class LayerTransformationManager(models.Manager):
+    def get_excluded_stored_layer_ids(self, obj, user=None):
+        """
+        Return the IDs of the stored layers whose access permission the
+        user lacks for the object. Each distinct permission is checked once
+        for all the layers requiring it.
+        """
+        permission_access = {}
+        result = []
+
+        for layer in Layer.all():
+            access_permission = layer.permissions.get(
+                'access_permission', None
+            )
+            if access_permission:
+                if access_permission not in permission_access:
+                    try:
+                        AccessControlList.objects.check_access(
+                            obj=obj, permissions=(access_permission,),
+                            user=user
+                        )
+                    except PermissionDenied:
+                        permission_access[access_permission] = False
+                    else:
+                        permission_access[access_permission] = True
+
+                if not permission_access[access_permission]:
+                    result.append(layer.stored_layer.pk)
+
+        return result
+
     def get_for_object(
         self, obj, as_classes=False, maximum_layer_order=None,
         only_stored_layer=None, user=None
@@ -23,11 +51,10 @@ class LayerTransformationManager(models.Manager):
         as_classes == True returns the transformation classes from .classes
         ready to be feed to the converter class
         """
+        # Stored layers are cached by the layer classes, no stored layer
+        # queries are needed after the first call.
         Layer.update()
 
-        StoredLayer = apps.get_model(
-            app_label='converter', model_name='StoredLayer'
-        )
         content_type = ContentType.objects.get_for_model(model=obj)
 
         transformations = self.filter(
@@ -35,61 +62,20 @@ class LayerTransformationManager(models.Manager):
             object_layer__object_id=obj.pk, object_layer__enabled=True
         )
 
-        access_layers = StoredLayer.objects.all()
-        exclude_layers = StoredLayer.objects.none()
-
         if maximum_layer_order:
-            access_layers = StoredLayer.objects.filter(
-                order__lte=maximum_layer_order
-            )
-            exclude_layers = StoredLayer.objects.filter(
-                order__gt=maximum_layer_order
-            )
-
-        for stored_layer in access_layers:
-            try:
-                layer_class = stored_layer.get_layer()
-            except KeyError:
-                """
-                This was a class defined but later erased. Ignore it.
-                """
-            else:
-                access_permission = layer_class.permissions.get(
-                    'access_permission', None
-                )
-                if access_permission:
-                    try:
-                        AccessControlList.objects.check_access(
-                            obj=obj, permissions=(access_permission,), user=user
-                        )
-                    except PermissionDenied:
-                        access_layers = access_layers.exclude(pk=stored_layer.pk)
-
-        for stored_layer in exclude_layers:
-            exclude_permission = stored_layer.get_layer().permissions.get(
-                'exclude_permission', None
+            transformations = transformations.filter(
+                object_layer__stored_layer__order__lte=maximum_layer_order
             )
-            if exclude_permission:
-                try:
-                    AccessControlList.objects.check_access(
-                        obj=obj, permissions=(exclude_permission,), user=user
-                    )
-                except PermissionDenied:
-                    pass
-                else:
-                    exclude_layers = exclude_layers.exclude(pk=stored_layer.pk)
 
         if only_stored_layer:
             transformations = transformations.filter(
                 object_layer__stored_layer=only_stored_layer
             )
 
-        transformations = transformations.filter(
-            object_layer__stored_layer__in=access_layers
-        )
-
         transformations = transformations.exclude(
-            object_layer__stored_layer__in=exclude_layers
+            object_layer__stored_layer__in=self.get_excluded_stored_layer_ids(
+                obj=obj, user=user
+            )
         )
 
         if as_classes:
@@ -107,18 +93,11 @@ class LayerTransformationManager(models.Manager):
                     )
                 else:
                     try:
-                        # Some transformations don't require arguments
-                        # return an empty dictionary as ** doesn't allow None
-                        if transformation.arguments:
-                            kwargs = yaml_load(
-                                stream=transformation.arguments,
-                            )
-                        else:
-                            kwargs = {}
-
                         result.append(
                             transformation_class(
-                                **kwargs
+                                **LayerTransformationArgumentCache.get(
+                                    arguments=transformation.arguments
+                                )
                             )
                         )
                     except Exception as exception:
@@ -12,6 +12,7 @@ from django.contrib.contenttypes.models import ContentType
 from django.db import models
 from django.db.models import Max
 from django.urls import reverse
+from django.utils.encoding import force_bytes
 from django.utils.functional import cached_property
 from django.utils.translation import ugettext, ugettext_lazy as _
 
@@ -21,12 +22,14 @@ from mayan.apps.common.validators import (
 )
 from mayan.apps.events.classes import EventManagerSave
 from mayan.apps.events.decorators import method_event
+from mayan.apps.file_caching.models import CachePartitionFile
 from mayan.apps.storage.classes import DefinedStorageLazy
 
-from .classes import Layer
+from .classes import AssetImageCache, Layer
 from .events import event_asset_created, event_asset_edited
 from .literals import STORAGE_NAME_ASSETS, STORAGE_NAME_ASSETS_CACHE
 from .managers import LayerTransformationManager, ObjectLayerManager
+from .settings import setting_asset_image_file_cache_enabled
 from .transformations import BaseTransformation
 
 logger = logging.getLogger(name=__name__)
@@ -128,12 +131,82 @@ class Asset(ExtraDataModelMixin, models.Model):
     def get_image(self):
         with self.open() as file_object:
             image = Image.open(fp=file_object)
+            # Decode the image before the file is closed.
+            image.load()
 
             if image.mode != 'RGBA':
                 image.putalpha(alpha=255)
 
             return image
 
+    def get_image_transformed(self, rotation, transparency, zoom):
+        """
+        Return the asset image rotated and zoomed and its paste mask with
+        the transparency applied. Results are kept in memory keyed by the
+        asset file, which is renamed when the file is replaced, and
+        optionally in the asset cache.
+        """
+        key = (self.pk, self.file.name, rotation, transparency, zoom)
+
+        result = AssetImageCache.get(key=key)
+
+        if result:
+            return result
+
+        cache_filename = 'transformed-{}'.format(
+            hashlib.sha256(
+                force_bytes(
+                    s='{}-{}-{}'.format(self.file.name, rotation, zoom)
+                )
+            ).hexdigest()
+        )
+        image_asset = None
+
+        if setting_asset_image_file_cache_enabled.value:
+            try:
+                with self.cache_partition.open_file(filename=cache_filename) as file_object:
+                    image_asset = Image.open(fp=file_object)
+                    image_asset.load()
+            except CachePartitionFile.DoesNotExist:
+                logger.debug(
+                    'asset cache file "%s" not found', cache_filename
+                )
+
+        if image_asset is None:
+            image_asset = self.get_image()
+
+            if image_asset.mode != 'RGBA':
+                image_asset.putalpha(alpha=255)
+
+            image_asset = image_asset.rotate(
+                angle=360 - rotation, resample=Image.BICUBIC,
+                expand=True
+            )
+
+            if zoom != 100.0:
+                decimal_value = zoom / 100.0
+                image_asset = image_asset.resize(
+                    (
+                        int(image_asset.size[0] * decimal_value),
+                        int(image_asset.size[1] * decimal_value)
+                    ), Image.ANTIALIAS
+                )
+
+            if setting_asset_image_file_cache_enabled.value:
+                image_buffer = io.BytesIO()
+                image_asset.save(image_buffer, format='PNG')
+                with self.cache_partition.create_file(filename=cache_filename) as file_object:
+                    file_object.write(image_buffer.getvalue())
+
+        paste_mask = image_asset.getchannel(channel='A').point(
+            lambda i: i * transparency / 100.0
+        )
+
+        result = {'image_asset': image_asset, 'paste_mask': paste_mask}
+        AssetImageCache.set(key=key, value=result)
+
+        return result
+
     def open(self):
         return self.file.storage.open(name=self.file.name)
 
@@ -7,6 +7,8 @@ from .literals import (
     DEFAULT_CONVERTER_ASSET_CACHE_TIME,
     DEFAULT_CONVERTER_ASSET_CACHE_STORAGE_BACKEND,
     DEFAULT_CONVERTER_ASSET_CACHE_STORAGE_BACKEND_ARGUMENTS,
+    DEFAULT_CONVERTER_ASSET_IMAGE_FILE_CACHE_ENABLED,
+    DEFAULT_CONVERTER_ASSET_IMAGE_MEMORY_CACHE_MAXIMUM_SIZE,
     DEFAULT_CONVERTER_ASSET_STORAGE_BACKEND,
     DEFAULT_CONVERTER_ASSET_STORAGE_BACKEND_ARGUMENTS,
     DEFAULT_CONVERTER_GRAPHICS_BACKEND,
@@ -52,6 +54,23 @@ setting_asset_cache_storage_backend_arguments = namespace.add_setting(
         'Arguments to pass to the CONVERTER_ASSET_CACHE_STORAGE_BACKEND.'
     )
 )
+setting_asset_image_file_cache_enabled = namespace.add_setting(
+    default=DEFAULT_CONVERTER_ASSET_IMAGE_FILE_CACHE_ENABLED,
+    global_name='CONVERTER_ASSET_IMAGE_FILE_CACHE_ENABLED', help_text=_(
+        'Also store the rotated and zoomed asset images used by the paste '
+        'and watermark transformations in the asset cache, to share them '
+        'between processes.'
+    )
+)
+setting_asset_image_memory_cache_maximum_size = namespace.add_setting(
+    default=DEFAULT_CONVERTER_ASSET_IMAGE_MEMORY_CACHE_MAXIMUM_SIZE,
+    global_name='CONVERTER_ASSET_IMAGE_MEMORY_CACHE_MAXIMUM_SIZE',
+    help_text=_(
+        'Maximum size in bytes of the decoded asset images kept in the '
+        'memory of each process for the paste and watermark '
+        'transformations. Use 0 to disable.'
+    )
+)
 setting_asset_storage_backend = namespace.add_setting(
     default=DEFAULT_CONVERTER_ASSET_STORAGE_BACKEND,
     global_name='CONVERTER_ASSET_STORAGE_BACKEND', help_text=_(
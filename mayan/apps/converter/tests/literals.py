@@ -31,3 +31,25 @@ TEST_TRANSFORMATION_ROTATE_DEGRESS = 34
 TEST_TRANSFORMATION_ROTATE_NAME = 'rotate'
 TEST_TRANSFORMATION_ZOOM_CACHE_HASH = b'ac7a864de6a95889d5892301e142f8cdc5808f55010c0b820ed056902fc25a73'
 TEST_TRANSFORMATION_ZOOM_PERCENT = 49
+
+TEST_UNOSERVER_SCRIPT = '''#!{executable}
+import argparse
+import shutil
+from xmlrpc.server import SimpleXMLRPCServer
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--interface')
+parser.add_argument('--port', type=int)
+arguments, unknown = parser.parse_known_args()
+
+
+def convert(inpath, indata, outpath):
+    shutil.copyfile(inpath, outpath)
+
+
+server = SimpleXMLRPCServer(
+    (arguments.interface, arguments.port), allow_none=True, logRequests=False
+)
+server.register_function(convert)
+server.serve_forever()
+'''
@@ -1,5 +1,9 @@
+from django.test import override_settings
+
 from mayan.apps.testing.tests.base import BaseTestCase
 
+from ..classes import AssetImageCache
+
 from .mixins import AssetTestMixin
 
 
@@ -10,3 +14,68 @@ class AssetModelTestCase(
         self._create_test_asset()
 
         self.test_asset.get_absolute_url()
+
+
+class AssetImageTransformedTestCase(AssetTestMixin, BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        AssetImageCache.clear()
+        self._create_test_asset()
+
+    def tearDown(self):
+        AssetImageCache.clear()
+        super().tearDown()
+
+    def test_get_image_transformed(self):
+        image = self.test_asset.get_image()
+
+        result = self.test_asset.get_image_transformed(
+            rotation=90, transparency=50.0, zoom=50.0
+        )
+
+        self.assertEqual(
+            result['image_asset'].size,
+            (int(image.size[1] * 0.5), int(image.size[0] * 0.5))
+        )
+        self.assertEqual(result['paste_mask'].size, result['image_asset'].size)
+
+    def test_get_image_transformed_memory_cache(self):
+        result_1 = self.test_asset.get_image_transformed(
+            rotation=0, transparency=100.0, zoom=100.0
+        )
+        result_2 = self.test_asset.get_image_transformed(
+            rotation=0, transparency=100.0, zoom=100.0
+        )
+
+        self.assertTrue(result_1 is result_2)
+
+    @override_settings(CONVERTER_ASSET_IMAGE_MEMORY_CACHE_MAXIMUM_SIZE=0)
+    def test_get_image_transformed_memory_cache_disabled(self):
+        result_1 = self.test_asset.get_image_transformed(
+            rotation=0, transparency=100.0, zoom=100.0
+        )
+        result_2 = self.test_asset.get_image_transformed(
+            rotation=0, transparency=100.0, zoom=100.0
+        )
+
+        self.assertFalse(result_1 is result_2)
+
+    @override_settings(
+        CONVERTER_ASSET_IMAGE_FILE_CACHE_ENABLED=True,
+        CONVERTER_ASSET_IMAGE_MEMORY_CACHE_MAXIMUM_SIZE=0
+    )
+    def test_get_image_transformed_file_cache(self):
+        result_1 = self.test_asset.get_image_transformed(
+            rotation=90, transparency=100.0, zoom=100.0
+        )
+
+        self.assertEqual(self.test_asset.cache_partition.files.count(), 1)
+
+        result_2 = self.test_asset.get_image_transformed(
+            rotation=90, transparency=100.0, zoom=100.0
+        )
+
+        self.assertEqual(
+            result_1['image_asset'].size, result_2['image_asset'].size
+        )
+        self.assertEqual(self.test_asset.cache_partition.files.count(), 1)
@@ -0,0 +1,114 @@
+import io
+import os
+
+from PIL import Image
+
+from django.test import TestCase
+
+from ..classes import (
+    ConverterBase, ImageTilePyramid, LayerTransformationArgumentCache
+)
+
+
+class ConverterBaseTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.test_file_object = io.BytesIO()
+        Image.new(mode='RGB', size=(10, 10)).save(
+            self.test_file_object, format='PNG'
+        )
+        self.test_file_object.seek(0)
+
+    def test_close(self):
+        converter = ConverterBase.get_converter_class()(
+            file_object=self.test_file_object
+        )
+        path = converter.get_source_path()
+        self.assertTrue(os.path.exists(path))
+
+        converter.close()
+        self.assertFalse(os.path.exists(path))
+
+    def test_context_manager(self):
+        with ConverterBase.get_converter_class()(
+            file_object=self.test_file_object
+        ) as converter:
+            converter.seek_page(page_number=0)
+            path = converter.get_source_path()
+            self.assertTrue(os.path.exists(path))
+
+        self.assertFalse(os.path.exists(path))
+
+
+class ImageTilePyramidTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.test_tile_pyramid = ImageTilePyramid(
+            height=300, tile_size=256, width=1000
+        )
+
+    def test_level_count(self):
+        self.assertEqual(self.test_tile_pyramid.get_level_count(), 11)
+
+    def test_level_size(self):
+        self.assertEqual(self.test_tile_pyramid.get_level_size(level=0), (1, 1))
+        self.assertEqual(
+            self.test_tile_pyramid.get_level_size(level=9), (500, 150)
+        )
+        self.assertEqual(
+            self.test_tile_pyramid.get_level_size(level=10), (1000, 300)
+        )
+
+    def test_tile_box(self):
+        self.assertEqual(
+            self.test_tile_pyramid.get_tile_box(column=3, level=10, row=1),
+            (768, 256, 1000, 300)
+        )
+
+    def test_tile_box_invalid(self):
+        with self.assertRaises(IndexError):
+            self.test_tile_pyramid.get_tile_box(column=4, level=10, row=0)
+
+        with self.assertRaises(IndexError):
+            self.test_tile_pyramid.get_tile_box(column=0, level=11, row=0)
+
+    def test_tile_count(self):
+        self.assertEqual(
+            self.test_tile_pyramid.get_tile_count(level=10), (4, 2)
+        )
+
+    def test_render_tile(self):
+        image = Image.new(mode='RGB', size=(1000, 300))
+
+        self.assertEqual(
+            self.test_tile_pyramid.render_tile(
+                column=3, image=image, level=10, row=1
+            ).size, (232, 44)
+        )
+        self.assertEqual(
+            self.test_tile_pyramid.render_tile(
+                column=1, image=image, level=9, row=0
+            ).size, (244, 150)
+        )
+
+
+class LayerTransformationArgumentCacheTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        LayerTransformationArgumentCache.clear()
+
+    def test_empty_arguments(self):
+        self.assertEqual(LayerTransformationArgumentCache.get(arguments=''), {})
+
+    def test_get(self):
+        arguments_1 = LayerTransformationArgumentCache.get(
+            arguments='{"degrees": 90}'
+        )
+        arguments_1['degrees'] = 180
+
+        arguments_2 = LayerTransformationArgumentCache.get(
+            arguments='{"degrees": 90}'
+        )
+
+        self.assertEqual(arguments_2, {'degrees': 90})
+        self.assertEqual(len(LayerTransformationArgumentCache._entries), 1)
@@ -0,0 +1,79 @@
+import os
+from pathlib import Path
+import stat
+import sys
+
+from django.test import override_settings
+
+from mayan.apps.storage.utils import NamedTemporaryFile, fs_cleanup, mkdtemp
+from mayan.apps.testing.tests.base import BaseTestCase
+
+from ..libreoffice import LibreOfficeServerPool
+
+from .literals import TEST_UNOSERVER_SCRIPT
+
+
+class LibreOfficeServerPoolTestCase(BaseTestCase):
+    test_content = b'test content'
+
+    def setUp(self):
+        super().setUp()
+        self.test_directory = mkdtemp()
+        self.test_unoserver_path = os.path.join(
+            self.test_directory, 'unoserver'
+        )
+
+        with open(file=self.test_unoserver_path, mode='w') as file_object:
+            file_object.write(
+                TEST_UNOSERVER_SCRIPT.format(executable=sys.executable)
+            )
+
+        os.chmod(self.test_unoserver_path, stat.S_IRWXU)
+
+        self.test_source_file = NamedTemporaryFile()
+        self.test_source_file.write(self.test_content)
+        self.test_source_file.flush()
+
+    def tearDown(self):
+        LibreOfficeServerPool.stop()
+        self.test_source_file.close()
+        fs_cleanup(filename=self.test_directory)
+        super().tearDown()
+
+    def _convert_test_file(self):
+        output_path = os.path.join(self.test_directory, 'output.pdf')
+
+        with override_settings(
+            CONVERTER_GRAPHICS_BACKEND_ARGUMENTS={
+                'libreoffice_server_count': 1,
+                'libreoffice_server_path': self.test_unoserver_path
+            }
+        ):
+            LibreOfficeServerPool.convert(
+                output_path=output_path,
+                source_path=self.test_source_file.name
+            )
+
+        return Path(output_path).read_bytes()
+
+    def test_convert(self):
+        self.assertEqual(self._convert_test_file(), self.test_content)
+
+    def test_server_reused(self):
+        self._convert_test_file()
+        process = LibreOfficeServerPool._servers[0].process
+
+        self._convert_test_file()
+
+        self.assertEqual(LibreOfficeServerPool._servers[0].process, process)
+
+    def test_server_restart(self):
+        self._convert_test_file()
+        process = LibreOfficeServerPool._servers[0].process
+        process.kill()
+        process.wait()
+
+        self.assertEqual(self._convert_test_file(), self.test_content)
+        self.assertNotEqual(
+            LibreOfficeServerPool._servers[0].process, process
+        )
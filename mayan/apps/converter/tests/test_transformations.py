@@ -1,9 +1,12 @@
+from PIL import Image
+
 from django.test import TestCase
 
 from mayan.apps.documents.tests.base import GenericDocumentTestCase
 
+from ..models import LayerTransformation
 from ..transformations import (
-    BaseTransformation, TransformationCrop, TransformationLineArt,
+    BaseTransformation, FusedGeometricTransformation, TransformationCrop, TransformationLineArt,
     TransformationResize, TransformationRotate, TransformationRotate90,
     TransformationRotate180, TransformationRotate270, TransformationZoom
 )
@@ -18,7 +21,7 @@ from .literals import (
     TEST_TRANSFORMATION_ROTATE_DEGRESS, TEST_TRANSFORMATION_ZOOM_CACHE_HASH,
     TEST_TRANSFORMATION_ZOOM_PERCENT
 )
-from .mixins import LayerTestMixin
+from .mixins import LayerTestMixin, TransformationTestMixin
 
 
 class TransformationBaseTestCase(TestCase):
@@ -108,6 +111,137 @@ class TransformationBaseTestCase(TestCase):
         )
 
 
+class TransformationCompileTestCase(TestCase):
+    def _get_test_image(self):
+        # Left half white, right half black.
+        image = Image.new(color='black', mode='RGB', size=(1200, 800))
+        image.paste(im='white', box=(0, 0, 600, 800))
+        return image
+
+    def _execute_sequentially(self, image, transformations):
+        for transformation in transformations:
+            image = transformation.execute_on(image=image)
+
+        return image
+
+    def test_compile_fuses_adjacent_geometric_transformations(self):
+        transformations = BaseTransformation.compile(
+            transformations=(
+                TransformationRotate90(), TransformationResize(width=300),
+                TransformationZoom(percent=150)
+            )
+        )
+
+        self.assertEqual(len(transformations), 1)
+        self.assertTrue(
+            isinstance(transformations[0], FusedGeometricTransformation)
+        )
+
+    def test_compile_keeps_other_transformations(self):
+        transformation_crop = TransformationCrop(top=10)
+        transformation_rotate = TransformationRotate(degrees=45)
+        transformation_zoom = TransformationZoom(percent=50)
+
+        transformations = BaseTransformation.compile(
+            transformations=(
+                transformation_rotate, transformation_zoom,
+                transformation_crop, TransformationRotate180(),
+                TransformationZoom(percent=200)
+            )
+        )
+
+        self.assertEqual(len(transformations), 4)
+        self.assertEqual(transformations[0], transformation_rotate)
+        self.assertEqual(transformations[1], transformation_zoom)
+        self.assertEqual(transformations[2], transformation_crop)
+        self.assertTrue(
+            isinstance(transformations[3], FusedGeometricTransformation)
+        )
+
+    def test_fused_transformation_output(self):
+        transformation_lists = (
+            (
+                TransformationRotate(degrees=90),
+                TransformationResize(width=300),
+                TransformationZoom(percent=150)
+            ),
+            (
+                TransformationRotate270(),
+                TransformationResize(width=500, height=200),
+                TransformationZoom(percent=25)
+            ),
+            (
+                TransformationRotate180(), TransformationResize(width=3000),
+                TransformationZoom(percent=100)
+            )
+        )
+
+        for transformation_list in transformation_lists:
+            image_sequential = self._execute_sequentially(
+                image=self._get_test_image(),
+                transformations=transformation_list
+            )
+            image_fused = FusedGeometricTransformation(
+                transformations=transformation_list
+            ).execute_on(image=self._get_test_image())
+
+            self.assertEqual(image_fused.size, image_sequential.size)
+            self.assertEqual(
+                image_fused.getpixel(xy=(0, 0)),
+                image_sequential.getpixel(xy=(0, 0))
+            )
+            self.assertEqual(
+                image_fused.getpixel(
+                    xy=(image_fused.width - 1, image_fused.height - 1)
+                ), image_sequential.getpixel(
+                    xy=(image_fused.width - 1, image_fused.height - 1)
+                )
+            )
+
+
+class LayerTransformationManagerTestCase(
+    TransformationTestMixin, GenericDocumentTestCase
+):
+    def setUp(self):
+        super().setUp()
+        self.test_layer.permissions['access_permission'] = self.test_layer_permission
+        self._create_test_transformation()
+
+    def test_get_for_object_access_permission_no_access(self):
+        self.assertEqual(
+            len(
+                LayerTransformation.objects.get_for_object(
+                    as_classes=True, obj=self.test_document,
+                    user=self._test_case_user
+                )
+            ), 0
+        )
+
+    def test_get_for_object_access_permission_with_access(self):
+        self.grant_access(
+            obj=self.test_document, permission=self.test_layer_permission
+        )
+
+        transformations = LayerTransformation.objects.get_for_object(
+            as_classes=True, obj=self.test_document,
+            user=self._test_case_user
+        )
+
+        self.assertEqual(len(transformations), 1)
+
+    def test_get_for_object_maximum_layer_order(self):
+        self.grant_access(
+            obj=self.test_document, permission=self.test_layer_permission
+        )
+
+        self.assertEqual(
+            LayerTransformation.objects.get_for_object(
+                maximum_layer_order=self.test_layer.order - 1,
+                obj=self.test_document, user=self._test_case_user
+            ).count(), 0
+        )
+
+
 class TransformationTestCase(LayerTestMixin, GenericDocumentTestCase):
     auto_create_test_transformation_class = False
 
@@ -1,5 +1,6 @@
 import hashlib
 import logging
+import math
 
 from PIL import Image, ImageColor, ImageDraw, ImageFilter
 
@@ -40,6 +41,36 @@ class BaseTransformation(metaclass=BaseTransformationType):
 
         return result.hexdigest()
 
+    @staticmethod
+    def compile(transformations):
+        """
+        Return an equivalent list of transformations where each run of two
+        or more adjacent right angle rotations, resizes and zooms is
+        replaced by a single fused transformation.
+        """
+        result = []
+        fusable_transformations = []
+
+        for transformation in list(transformations) + [None]:
+            if transformation is not None and transformation.is_fusable():
+                fusable_transformations.append(transformation)
+            else:
+                if len(fusable_transformations) > 1:
+                    result.append(
+                        FusedGeometricTransformation(
+                            transformations=fusable_transformations
+                        )
+                    )
+                else:
+                    result.extend(fusable_transformations)
+
+                fusable_transformations = []
+
+                if transformation is not None:
+                    result.append(transformation)
+
+        return result
+
     @classmethod
     def get(cls, name):
         return cls._registry[name]
@@ -125,6 +156,59 @@ class BaseTransformation(metaclass=BaseTransformationType):
         self.image = image
         self.aspect = 1.0 * image.size[0] / image.size[1]
 
+    def get_output_size(self, size):
+        """
+        Size of the image returned by `execute_on` for an image of the
+        given size. Only required for fusable transformations.
+        """
+        raise NotImplementedError
+
+    def is_fusable(self):
+        return False
+
+
+class FusedGeometricTransformation:
+    """
+    Run of right angle rotations, resizes and zooms applied as a single
+    resample followed by a lossless transpose. The resample is done before
+    the transpose, when the image is usually smaller.
+    """
+    transpose_methods = {
+        90: Image.ROTATE_270, 180: Image.ROTATE_180, 270: Image.ROTATE_90
+    }
+
+    def __init__(self, transformations):
+        self.transformations = transformations
+
+    def execute_on(self, image):
+        rotation, size = self.get_output_rotation_and_size(size=image.size)
+
+        if rotation in (90, 270):
+            size = (size[1], size[0])
+
+        if image.size != size:
+            image = image.resize(
+                size=size, resample=Image.LANCZOS, reducing_gap=2.0
+            )
+
+        if rotation:
+            image = image.transpose(self.transpose_methods[rotation])
+
+        return image
+
+    def get_output_rotation_and_size(self, size):
+        rotation = 0
+
+        for transformation in self.transformations:
+            size = transformation.get_output_size(size=size)
+
+            if isinstance(transformation, TransformationRotate):
+                rotation = (
+                    rotation + transformation.get_right_angle()
+                ) % 360
+
+        return rotation, size
+
 
 class AssertTransformationMixin:
     @classmethod
@@ -163,33 +247,10 @@ class AssertTransformationMixin:
             logger.error('Asset "%s" not found.', asset_name)
             raise
         else:
-            image_asset = asset.get_image()
-
-            if image_asset.mode != 'RGBA':
-                image_asset.putalpha(alpha=255)
-
-            image_asset = image_asset.rotate(
-                angle=360 - rotation, resample=Image.BICUBIC,
-                expand=True
+            return asset.get_image_transformed(
+                rotation=rotation, transparency=transparency, zoom=zoom
             )
 
-            if zoom != 100.0:
-                decimal_value = zoom / 100.0
-                image_asset = image_asset.resize(
-                    (
-                        int(image_asset.size[0] * decimal_value),
-                        int(image_asset.size[1] * decimal_value)
-                    ), Image.ANTIALIAS
-                )
-
-            paste_mask = image_asset.getchannel(channel='A').point(
-                lambda i: i * transparency / 100.0
-            )
-
-            return {
-                'image_asset': image_asset, 'paste_mask': paste_mask
-            }
-
 
 class TransformationAssetPaste(AssertTransformationMixin, BaseTransformation):
     arguments = ('left', 'top')
@@ -691,6 +752,55 @@ class TransformationResize(BaseTransformation):
 
         return self.image
 
+    @staticmethod
+    def get_thumbnail_size(box, size):
+        """
+        Size of an image of the given size after a call to
+        `Image.thumbnail` with the box size.
+        """
+        x, y = map(math.floor, box)
+        width, height = size
+
+        if x >= width and y >= height:
+            return size
+
+        aspect = width / height
+
+        if x / y >= aspect:
+            x = max(
+                min(
+                    math.floor(y * aspect), math.ceil(y * aspect),
+                    key=lambda n: abs(aspect - n / y)
+                ), 1
+            )
+        else:
+            y = max(
+                min(
+                    math.floor(x / aspect), math.ceil(x / aspect),
+                    key=lambda n: abs(aspect - x / n)
+                ), 1
+            )
+
+        return (x, y)
+
+    def get_output_size(self, size):
+        width = int(self.width)
+        height = int(self.height or 1.0 * width / (size[0] / size[1]))
+
+        factor = 1
+        while size[0] / factor > 2 * width and size[1] * 2 / factor > 2 * height:
+            factor *= 2
+
+        if factor > 1:
+            size = self.get_thumbnail_size(
+                box=(size[0] / factor, size[1] / factor), size=size
+            )
+
+        return self.get_thumbnail_size(box=(width, height), size=size)
+
+    def is_fusable(self):
+        return bool(self.width)
+
 
 class TransformationRotate(BaseTransformation):
     arguments = ('degrees', 'fillcolor')
@@ -716,6 +826,28 @@ class TransformationRotate(BaseTransformation):
             fillcolor=fillcolor
         )
 
+    def get_output_size(self, size):
+        if self.get_right_angle() in (90, 270):
+            return (size[1], size[0])
+        else:
+            return size
+
+    def get_right_angle(self):
+        """
+        Return the rotation in degrees if it is a multiple of 90 degrees or
+        None otherwise.
+        """
+        try:
+            degrees = float(self.degrees) % 360
+        except (TypeError, ValueError):
+            return None
+
+        if degrees % 90 == 0:
+            return int(degrees)
+
+    def is_fusable(self):
+        return self.get_right_angle() is not None
+
 
 class TransformationRotate90(TransformationRotate):
     arguments = ()
@@ -785,6 +917,16 @@ class TransformationZoom(BaseTransformation):
             ), Image.ANTIALIAS
         )
 
+    def get_output_size(self, size):
+        if self.percent == 100:
+            return size
+
+        decimal_value = float(self.percent) / 100
+        return (int(size[0] * decimal_value), int(size[1] * decimal_value))
+
+    def is_fusable(self):
+        return self.percent is not None
+
 
 BaseTransformation.register(
     layer=layer_decorations, transformation=TransformationAssetPaste
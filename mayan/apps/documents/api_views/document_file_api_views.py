@@ -1,17 +1,25 @@
 import logging
 
+from PIL import Image
+
 from django.conf import settings
-from django.http import HttpResponse
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
 from django.views.decorators.cache import cache_control, patch_cache_control
 
 from rest_framework import status
 from rest_framework.response import Response
 
+from mayan.apps.file_caching.models import CachePartitionFile
 from mayan.apps.rest_api import generics
 from mayan.apps.storage.models import SharedUploadedFile
 from mayan.apps.views.generics import DownloadViewMixin
 
-from ..literals import DOCUMENT_IMAGE_TASK_TIMEOUT
+from ..literals import (
+    DOCUMENT_FILE_PAGE_TILE_FORMAT, DOCUMENT_FILE_PAGE_TILE_MIME_TYPE,
+    DOCUMENT_IMAGE_TASK_TIMEOUT
+)
 from ..permissions import (
     permission_document_file_delete, permission_document_file_download,
     permission_document_file_edit, permission_document_file_new,
@@ -22,11 +30,14 @@ from ..serializers.document_file_serializers import (
 )
 from ..settings import setting_document_file_page_image_cache_time
 from ..tasks import (
-    task_document_file_page_image_generate, task_document_file_upload
+    task_document_file_page_image_generate,
+    task_document_file_page_tile_generate,
+    task_document_file_page_tile_source_generate, task_document_file_upload
 )
 
 from .mixins import (
-    ParentObjectDocumentAPIViewMixin, ParentObjectDocumentFileAPIViewMixin
+    DocumentPageImageAPIViewMixin, ParentObjectDocumentAPIViewMixin,
+    ParentObjectDocumentFileAPIViewMixin
 )
 
 logger = logging.getLogger(name=__name__)
@@ -149,11 +160,15 @@ class APIDocumentFilePageDetailView(
 
 
 class APIDocumentFilePageImageView(
-    ParentObjectDocumentFileAPIViewMixin, generics.RetrieveAPIView
+    DocumentPageImageAPIViewMixin, ParentObjectDocumentFileAPIViewMixin,
+    generics.RetrieveAPIView
 ):
     """
     get: Returns an image representation of the selected document.
     """
+    image_cache_time_setting = setting_document_file_page_image_cache_time
+    image_task = task_document_file_page_image_generate
+    image_task_object_argument = 'document_file_page_id'
     lookup_url_kwarg = 'document_file_page_id'
     mayan_object_permissions = {
         'GET': (permission_document_file_view,),
@@ -168,33 +183,45 @@ class APIDocumentFilePageImageView(
     def get_serializer_class(self):
         return None
 
-    @cache_control(private=True)
-    def retrieve(self, request, *args, **kwargs):
-        width = request.GET.get('width')
-        height = request.GET.get('height')
-        zoom = request.GET.get('zoom')
 
-        if zoom:
-            zoom = int(zoom)
+class APIDocumentFilePageListView(
+    ParentObjectDocumentFileAPIViewMixin, generics.ListAPIView
+):
+    serializer_class = DocumentFilePageSerializer
+
+    def get_queryset(self):
+        return self.get_document_file(
+            permission=permission_document_file_view
+        ).pages.all()
 
-        rotation = request.GET.get('rotation')
 
-        if rotation:
-            rotation = int(rotation)
+class APIDocumentFilePageTilePyramidView(
+    ParentObjectDocumentFileAPIViewMixin, generics.RetrieveAPIView
+):
+    """
+    get: Returns the size and the levels of the tile pyramid of the image of the selected document file page.
+    """
+    lookup_url_kwarg = 'document_file_page_id'
+    mayan_object_permissions = {
+        'GET': (permission_document_file_view,),
+    }
+
+    def get_queryset(self):
+        return self.get_document_file().pages.all()
+
+    def get_serializer(self, *args, **kwargs):
+        return None
+
+    def get_serializer_class(self):
+        return None
 
-        maximum_layer_order = request.GET.get('maximum_layer_order')
-        if maximum_layer_order:
-            maximum_layer_order = int(maximum_layer_order)
+    def retrieve(self, request, *args, **kwargs):
+        document_file_page = self.get_object()
 
-        task = task_document_file_page_image_generate.apply_async(
+        task = task_document_file_page_tile_source_generate.apply_async(
             kwargs={
-                'document_file_page_id': self.get_object().pk,
-                'height': height,
-                'maximum_layer_order': maximum_layer_order,
-                'rotation': rotation,
-                'user_id': request.user.pk,
-                'width': width,
-                'zoom': zoom
+                'document_file_page_id': document_file_page.pk,
+                'user_id': request.user.pk
             }
         )
 
@@ -206,23 +233,120 @@ class APIDocumentFilePageImageView(
             kwargs['disable_sync_subtasks'] = False
 
         cache_filename = task.get(**kwargs)
-        cache_file = self.get_object().cache_partition.get_file(filename=cache_filename)
-        with cache_file.open() as file_object:
-            response = HttpResponse(file_object.read(), content_type='image')
-            if '_hash' in request.GET:
-                patch_cache_control(
-                    response=response,
-                    max_age=setting_document_file_page_image_cache_time.value
-                )
-            return response
+        with document_file_page.cache_partition.open_file(filename=cache_filename) as file_object:
+            tile_pyramid = document_file_page.get_tile_pyramid_for_image(
+                image=Image.open(fp=file_object)
+            )
+
+        return Response(
+            data={
+                'format': DOCUMENT_FILE_PAGE_TILE_FORMAT.lower(),
+                'hash': document_file_page.get_tile_hash(
+                    cache_filename=cache_filename
+                ),
+                'height': tile_pyramid.height,
+                'level_count': tile_pyramid.get_level_count(),
+                'tile_size': tile_pyramid.tile_size,
+                'width': tile_pyramid.width
+            }
+        )
 
 
-class APIDocumentFilePageListView(
-    ParentObjectDocumentFileAPIViewMixin, generics.ListAPIView
+class APIDocumentFilePageTileView(
+    ParentObjectDocumentFileAPIViewMixin, generics.RetrieveAPIView
 ):
-    serializer_class = DocumentFilePageSerializer
+    """
+    get: Returns a tile of the image of the selected document file page.
+    """
+    lookup_url_kwarg = 'document_file_page_id'
+    mayan_object_permissions = {
+        'GET': (permission_document_file_view,),
+    }
 
     def get_queryset(self):
-        return self.get_document_file(
-            permission=permission_document_file_view
-        ).pages.all()
+        return self.get_document_file().pages.all()
+
+    def get_serializer(self, *args, **kwargs):
+        return None
+
+    def get_serializer_class(self):
+        return None
+
+    @cache_control(private=True)
+    def retrieve(self, request, *args, **kwargs):
+        document_file_page = self.get_object()
+        column = int(self.kwargs['column'])
+        level = int(self.kwargs['level'])
+        row = int(self.kwargs['row'])
+
+        source_cache_filename = document_file_page.get_stored_image_cache_filename(
+            user=request.user
+        )
+        cache_filename = document_file_page.get_tile_cache_filename(
+            column=column, level=level, row=row,
+            source_cache_filename=source_cache_filename
+        )
+
+        # The tile URL does not change when the stored transformations of
+        # the page change. Revalidate using the tile cache filename, which
+        # includes the transformations.
+        etag = quote_etag(
+            etag_str=document_file_page.get_tile_hash(
+                cache_filename=cache_filename
+            )
+        )
+        response = get_conditional_response(etag=etag, request=request)
+
+        if response is None:
+            response = HttpResponse(
+                content=self.get_tile_content(
+                    cache_filename=cache_filename, column=column,
+                    document_file_page=document_file_page, level=level,
+                    row=row
+                ), content_type=DOCUMENT_FILE_PAGE_TILE_MIME_TYPE
+            )
+
+        response['ETag'] = etag
+
+        # Only tile URLs including the current hash of the tile pyramid
+        # are cached without revalidation.
+        if request.GET.get('_hash') == document_file_page.get_tile_hash(
+            cache_filename=source_cache_filename
+        ):
+            patch_cache_control(
+                response=response,
+                max_age=setting_document_file_page_image_cache_time.value
+            )
+
+        return response
+
+    def get_tile_content(
+        self, cache_filename, column, document_file_page, level, row
+    ):
+        try:
+            with document_file_page.cache_partition.open_file(filename=cache_filename) as file_object:
+                return file_object.read()
+        except CachePartitionFile.DoesNotExist:
+            task = task_document_file_page_tile_generate.apply_async(
+                kwargs={
+                    'column': column,
+                    'document_file_page_id': document_file_page.pk,
+                    'level': level, 'row': row,
+                    'user_id': self.request.user.pk
+                }
+            )
+
+            kwargs = {'timeout': DOCUMENT_IMAGE_TASK_TIMEOUT}
+            if settings.DEBUG:
+                # In debug more, task are run synchronously, causing this
+                # method to be called inside another task. Disable the check
+                # of nested tasks when using debug mode.
+                kwargs['disable_sync_subtasks'] = False
+
+            cache_filename = task.get(**kwargs)
+
+            if not cache_filename:
+                raise Http404
+
+            with document_file_page.cache_partition.open_file(filename=cache_filename) as file_object:
+                return file_object.read()
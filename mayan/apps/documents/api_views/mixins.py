@@ -1,11 +1,151 @@
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import (
+    get_conditional_response, patch_cache_control, patch_vary_headers
+)
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.cache import cache_control
+
+from rest_framework import status
 from rest_framework.generics import get_object_or_404
 
 from mayan.apps.acls.models import AccessControlList
+from mayan.apps.file_caching.models import CachePartitionFile
+from mayan.apps.views.compat import FileResponse
 
+from ..literals import (
+    DOCUMENT_IMAGE_API_PREFERENCE_ASYNC, DOCUMENT_IMAGE_API_RETRY_AFTER,
+    DOCUMENT_IMAGE_TASK_TIMEOUT
+)
 from ..models.document_models import Document
 from ..models.document_type_models import DocumentType
 
 
+class DocumentPageImageAPIViewMixin:
+    """
+    Serve a page image directly from the cache of the page when it exists.
+    Otherwise generate the image with a task and wait for the result or,
+    when the client sends the "Prefer: respond-async" header, return
+    202 Accepted with a Retry-After header instead of waiting.
+    """
+    image_cache_time_setting = None
+    image_task = None
+    image_task_object_argument = None
+
+    def get_image_kwargs(self):
+        result = {
+            'height': self.request.GET.get('height'),
+            'maximum_layer_order': self.request.GET.get('maximum_layer_order'),
+            'rotation': self.request.GET.get('rotation'),
+            'width': self.request.GET.get('width'),
+            'zoom': self.request.GET.get('zoom')
+        }
+
+        for key in ('maximum_layer_order', 'rotation', 'zoom'):
+            if result[key]:
+                result[key] = int(result[key])
+
+        return result
+
+    def get_accepted_response(self):
+        response = HttpResponse(status=status.HTTP_202_ACCEPTED)
+        response['Retry-After'] = DOCUMENT_IMAGE_API_RETRY_AFTER
+        return response
+
+    def get_image_response(self, cache_filename, document_page):
+        """
+        Serve a cached image through the memory tier of the cache. Raises
+        CachePartitionFile.DoesNotExist if the image is not cached.
+        """
+        file_entry = document_page.cache_partition.open_file_entry(
+            filename=cache_filename
+        )
+
+        etag = quote_etag(etag_str=file_entry['checksum'] or cache_filename)
+        last_modified = int(file_entry['datetime'].timestamp())
+
+        response = get_conditional_response(
+            etag=etag, last_modified=last_modified, request=self.request
+        )
+
+        if response is None:
+            response = FileResponse(
+                content_type='image',
+                streaming_content=file_entry['file_object']
+            )
+        else:
+            file_entry['file_object'].close()
+
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(epoch_seconds=last_modified)
+
+        if '_hash' in self.request.GET:
+            patch_cache_control(
+                response=response,
+                max_age=self.image_cache_time_setting.value
+            )
+
+        return response
+
+    def is_async_preferred(self):
+        preferences = self.request.META.get('HTTP_PREFER', '').split(',')
+        return DOCUMENT_IMAGE_API_PREFERENCE_ASYNC in (
+            preference.split(';')[0].strip().lower() for preference in preferences
+        )
+
+    @cache_control(private=True)
+    def retrieve(self, request, *args, **kwargs):
+        document_page = self.get_object()
+        image_kwargs = self.get_image_kwargs()
+
+        # Same name calculation as the .generate_image() method of the
+        # page.
+        cache_filename = document_page.get_combined_cache_filename(
+            _transformation_list=document_page.get_combined_transformation_list(
+                user=request.user, **image_kwargs
+            )
+        )
+
+        try:
+            response = self.get_image_response(
+                cache_filename=cache_filename, document_page=document_page
+            )
+        except CachePartitionFile.DoesNotExist:
+            task_kwargs = {
+                self.image_task_object_argument: document_page.pk,
+                'user_id': request.user.pk
+            }
+            task_kwargs.update(image_kwargs)
+
+            task = self.image_task.apply_async(kwargs=task_kwargs)
+
+            if self.is_async_preferred():
+                response = self.get_accepted_response()
+                response['Preference-Applied'] = DOCUMENT_IMAGE_API_PREFERENCE_ASYNC
+                patch_vary_headers(response=response, newheaders=('Prefer',))
+                return response
+
+            kwargs = {'timeout': DOCUMENT_IMAGE_TASK_TIMEOUT}
+            if settings.DEBUG:
+                # In debug more, task are run synchronously, causing this
+                # method to be called inside another task. Disable the check
+                # of nested tasks when using debug mode.
+                kwargs['disable_sync_subtasks'] = False
+
+            try:
+                response = self.get_image_response(
+                    cache_filename=task.get(**kwargs),
+                    document_page=document_page
+                )
+            except CachePartitionFile.DoesNotExist:
+                # The image was pruned before it could be read. Ask the
+                # client to retry instead of generating it again.
+                response = self.get_accepted_response()
+
+        patch_vary_headers(response=response, newheaders=('Prefer',))
+        return response
+
+
 class ParentObjectDocumentAPIViewMixin:
     def get_document(self, permission=None):
         queryset = Document.objects.all()
@@ -75,7 +75,8 @@ from .events import (
 from .handlers import (
     handler_create_default_document_type,
     handler_create_document_file_page_image_cache,
-    handler_create_document_version_page_image_cache
+    handler_create_document_version_page_image_cache,
+    handler_document_file_pages_image_prerender
 )
 from .html_widgets import ThumbnailWidget
 from .links.document_links import (
@@ -113,8 +114,8 @@ from .links.document_type_links import (
     link_document_type_edit, link_document_type_filename_create,
     link_document_type_filename_delete, link_document_type_filename_edit,
     link_document_type_filename_list, link_document_type_filename_generator,
-    link_document_type_list, link_document_type_policies,
-    link_document_type_setup
+    link_document_type_list, link_document_type_page_image_prerender,
+    link_document_type_policies, link_document_type_setup
 )
 from .links.document_version_links import (
     link_document_version_active, link_document_version_create,
@@ -158,6 +159,7 @@ from .literals import (
     IMAGE_ERROR_NO_ACTIVE_VERSION, IMAGE_ERROR_NO_VERSION_PAGES
 )
 from .menus import menu_documents
+from .signals import signal_post_document_file_upload
 
 # Documents
 
@@ -820,7 +822,8 @@ class DocumentsApp(MayanAppConfig):
             links=(
                 link_document_type_filename_list,
                 link_document_type_policies,
-                link_document_type_filename_generator, link_acl_list
+                link_document_type_filename_generator,
+                link_document_type_page_image_prerender, link_acl_list
             ), sources=(DocumentType,)
         )
 
@@ -968,6 +971,11 @@ class DocumentsApp(MayanAppConfig):
             dispatch_uid='documents_handler_create_document_version_page_image_cache',
             receiver=handler_create_document_version_page_image_cache,
         )
+        signal_post_document_file_upload.connect(
+            dispatch_uid='documents_handler_document_file_pages_image_prerender',
+            receiver=handler_document_file_pages_image_prerender,
+            sender=DocumentFile
+        )
         signal_post_initial_setup.connect(
             dispatch_uid='documents_handler_create_default_document_type',
             receiver=handler_create_default_document_type
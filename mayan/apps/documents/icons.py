@@ -186,6 +186,9 @@ icon_document_type_filename_generator = Icon(
     ]
 )
 
+icon_document_type_page_image_prerender = Icon(
+    driver_name='fontawesome', symbol='images'
+)
 icon_document_type_policies = Icon(driver_name='fontawesome', symbol='times')
 icon_document_type_setup = icon_document_type
 
@@ -8,8 +8,8 @@ from ..icons import (
     icon_document_type_edit, icon_document_type_filename_create,
     icon_document_type_filename_delete, icon_document_type_filename_edit,
     icon_document_type_filename_list, icon_document_type_filename_generator,
-    icon_document_type_policies, icon_document_type_setup,
-    icon_document_type_list
+    icon_document_type_page_image_prerender, icon_document_type_policies,
+    icon_document_type_setup, icon_document_type_list
 )
 from ..permissions import (
     permission_document_type_create, permission_document_type_delete,
@@ -77,6 +77,13 @@ link_document_type_list = Link(
     ), icon=icon_document_type_list, text=_('Document types'),
     view='documents:document_type_list'
 )
+link_document_type_page_image_prerender = Link(
+    args='resolved_object.id',
+    icon=icon_document_type_page_image_prerender,
+    permissions=(permission_document_type_edit,),
+    text=_('Page image pre-rendering'),
+    view='documents:document_type_page_image_prerender'
+)
 link_document_type_setup = Link(
     condition=get_cascade_condition(
         app_label='documents', model_name='DocumentType',
@@ -36,6 +36,8 @@ DEFAULT_DOCUMENTS_FILE_PAGE_IMAGE_CACHE_STORAGE_BACKEND_ARGUMENTS = {
 DEFAULT_DOCUMENTS_HASH_BLOCK_SIZE = 65535
 DEFAULT_DOCUMENTS_LIST_THUMBNAIL_WIDTH = '50'
 DEFAULT_DOCUMENTS_PAGE_IMAGE_CACHE_TIME = '31556926'
+DEFAULT_DOCUMENTS_PAGE_IMAGE_PRERENDER_CACHE_USAGE_LIMIT = 90
+DEFAULT_DOCUMENTS_PAGE_IMAGE_TILE_SIZE = 256
 DEFAULT_DOCUMENTS_PREVIEW_HEIGHT = ''
 DEFAULT_DOCUMENTS_PREVIEW_WIDTH = '800'
 DEFAULT_DOCUMENTS_PRINT_HEIGHT = ''
@@ -76,6 +78,14 @@ DEFAULT_LANGUAGE_CODES = (
 DEFAULT_STUB_EXPIRATION_INTERVAL = 60 * 60 * 24  # 24 hours
 DEFAULT_TASK_GENERATE_DOCUMENT_FILE_PAGE_IMAGE_RETRY_DELAY = 5
 DEFAULT_TASK_GENERATE_DOCUMENT_VERSION_PAGE_IMAGE_RETRY_DELAY = 5
+DOCUMENT_FILE_PAGE_BASE_IMAGE_CACHE_FILENAME = 'base_image'
+DOCUMENT_FILE_PAGE_STORED_IMAGE_CACHE_FILENAME = '{}-stored_image'
+# Lossless, the stored image is decoded again to apply the interactive
+# transformations and to cut the tiles.
+DOCUMENT_FILE_PAGE_STORED_IMAGE_FORMAT = 'PNG'
+DOCUMENT_FILE_PAGE_TILE_CACHE_FILENAME = 'tile-{source}-{tile_size}-{level}-{column}-{row}'
+DOCUMENT_FILE_PAGE_TILE_FORMAT = 'JPEG'
+DOCUMENT_FILE_PAGE_TILE_MIME_TYPE = 'image/jpeg'
 DOCUMENT_FILE_ACTION_PAGES_NEW = 1
 DOCUMENT_FILE_ACTION_PAGES_APPEND = 2
 DOCUMENT_FILE_ACTION_PAGES_KEEP = 3
@@ -84,6 +94,8 @@ DOCUMENT_FILE_ACTION_PAGE_CHOICES = (
     (DOCUMENT_FILE_ACTION_PAGES_APPEND, _('Append. Create a new version and append the new file pages.')),
     (DOCUMENT_FILE_ACTION_PAGES_KEEP, _('Keep. Do not create a new version and keep the current version pages.')),
 )
+DOCUMENT_IMAGE_API_PREFERENCE_ASYNC = 'respond-async'
+DOCUMENT_IMAGE_API_RETRY_AFTER = 2
 DOCUMENT_IMAGE_TASK_TIMEOUT = 120
 
 IMAGE_ERROR_NO_ACTIVE_VERSION = 'document_no_active_version'
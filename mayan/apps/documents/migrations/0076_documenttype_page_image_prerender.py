@@ -0,0 +1,22 @@
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0075_delete_duplicateddocumentold'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='documenttype',
+            name='page_image_prerender',
+            field=models.BooleanField(default=False, help_text='Generate the page images of the new document files of this type in the background after they are uploaded.', verbose_name='Pre-render page images'),
+        ),
+        migrations.AddField(
+            model_name='documenttype',
+            name='page_image_prerender_page_count',
+            field=models.PositiveIntegerField(blank=True, help_text='Number of pages, from the first one, of which to pre-render the images. Leave empty to pre-render all the pages.', null=True, validators=[django.core.validators.MinValueValidator(limit_value=1)], verbose_name='Pre-render page count'),
+        ),
+    ]
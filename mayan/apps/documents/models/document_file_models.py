@@ -3,6 +3,7 @@ import logging
 import shutil
 
 from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
 from django.db import models, transaction
 from django.urls import reverse
 from django.utils.encoding import force_text
@@ -19,6 +20,7 @@ from mayan.apps.converter.exceptions import (
 from mayan.apps.events.classes import EventManagerMethodAfter
 from mayan.apps.events.decorators import method_event
 from mayan.apps.file_caching.models import CachePartitionFile
+from mayan.apps.lock_manager.exceptions import LockError
 from mayan.apps.mimetype.api import get_mimetype
 from mayan.apps.storage.classes import DefinedStorageLazy
 
@@ -27,10 +29,15 @@ from ..events import (
     event_document_file_downloaded, event_document_file_edited
 )
 from ..literals import (
+    DOCUMENT_FILE_PAGE_BASE_IMAGE_CACHE_FILENAME,
     STORAGE_NAME_DOCUMENT_FILE_PAGE_IMAGE_CACHE, STORAGE_NAME_DOCUMENT_FILES
 )
 from ..managers import DocumentFileManager, ValidDocumentFileManager
-from ..settings import setting_hash_block_size
+from ..settings import (
+    setting_display_height, setting_display_width, setting_hash_block_size,
+    setting_page_image_prerender_cache_usage_limit, setting_preview_height,
+    setting_preview_width, setting_thumbnail_height, setting_thumbnail_width
+)
 from ..signals import (
     signal_post_document_created, signal_post_document_file_upload
 )
@@ -286,16 +293,16 @@ class DocumentFile(
 
             try:
                 with self.open() as file_object:
-                    converter = ConverterBase.get_converter_class()(
+                    with ConverterBase.get_converter_class()(
                         file_object=file_object
-                    )
-                    with converter.to_pdf() as pdf_file_object:
-                        with self.cache_partition.create_file(filename=cache_filename) as file_object:
-                            shutil.copyfileobj(
-                                fsrc=pdf_file_object, fdst=file_object
-                            )
-
-                        return self.cache_partition.get_file(filename=cache_filename).open()
+                    ) as converter:
+                        with converter.to_pdf() as pdf_file_object:
+                            with self.cache_partition.create_file(filename=cache_filename) as file_object:
+                                shutil.copyfileobj(
+                                    fsrc=pdf_file_object, fdst=file_object
+                                )
+
+                            return self.cache_partition.get_file(filename=cache_filename).open()
             except InvalidOfficeFormat:
                 return self.open()
             except Exception as exception:
@@ -369,10 +376,10 @@ class DocumentFile(
     def page_count_update(self, save=True):
         try:
             with self.open() as file_object:
-                converter = ConverterBase.get_converter_class()(
+                with ConverterBase.get_converter_class()(
                     file_object=file_object, mime_type=self.mimetype
-                )
-                detected_pages = converter.get_page_count()
+                ) as converter:
+                    detected_pages = converter.get_page_count()
         except PageCountError:
             """Converter backend doesn't understand the format."""
         else:
@@ -392,6 +399,132 @@ class DocumentFile(
 
             return detected_pages
 
+    def pages_image_generate(self, first_page_number=None, last_page_number=None):
+        """
+        Create the base image of the pages in the range that are not cached
+        yet. All the pages are rendered in a single converter pass over the
+        intermediate file. Page numbers start with #1.
+        """
+        queryset = self.file_pages.all()
+
+        if first_page_number:
+            queryset = queryset.filter(page_number__gte=first_page_number)
+
+        if last_page_number:
+            queryset = queryset.filter(page_number__lte=last_page_number)
+
+        document_file_pages = {}
+
+        for document_file_page in queryset:
+            try:
+                document_file_page.cache_partition.get_file(
+                    filename=DOCUMENT_FILE_PAGE_BASE_IMAGE_CACHE_FILENAME
+                )
+            except CachePartitionFile.DoesNotExist:
+                document_file_pages[
+                    document_file_page.page_number
+                ] = document_file_page
+
+        if not document_file_pages:
+            return 0
+
+        with self.get_intermediate_file() as file_object:
+            with ConverterBase.get_converter_class()(
+                file_object=file_object
+            ) as converter:
+                pages = converter.get_pages(
+                    first_page_number=min(document_file_pages) - 1,
+                    last_page_number=max(document_file_pages) - 1
+                )
+
+                count = 0
+                for page_number, page_image in pages:
+                    # Pages in the range that were already cached are skipped.
+                    document_file_page = document_file_pages.get(page_number + 1)
+
+                    if document_file_page:
+                        try:
+                            with document_file_page.cache_partition.create_file(filename=DOCUMENT_FILE_PAGE_BASE_IMAGE_CACHE_FILENAME) as file_object:
+                                file_object.write(page_image.getvalue())
+                        except LockError:
+                            # The image is being generated by another
+                            # request.
+                            logger.debug(
+                                'Base image of document file page %s '
+                                'already being generated.',
+                                document_file_page
+                            )
+                        else:
+                            count += 1
+
+        return count
+
+    def pages_image_prerender(self):
+        """
+        Generate the base image of the pages of the file and the display,
+        preview and thumbnail images of the active document version pages
+        showing them, up to the page count of the document type. Stops
+        when a page image cache is near full to avoid evicting the images
+        being used.
+        """
+        DocumentFilePage = apps.get_model(
+            app_label='documents', model_name='DocumentFilePage'
+        )
+
+        usage_limit = setting_page_image_prerender_cache_usage_limit.value
+
+        if self.cache.get_usage() >= usage_limit:
+            logger.info(
+                'Document file page image cache is near full, not '
+                'pre-rendering the pages of document file: %s', self
+            )
+            return
+
+        last_page_number = self.document.document_type.page_image_prerender_page_count
+
+        self.pages_image_generate(last_page_number=last_page_number)
+
+        document_version = self.document.version_active
+        if not document_version:
+            return
+
+        queryset = self.file_pages.all()
+        if last_page_number:
+            queryset = queryset.filter(page_number__lte=last_page_number)
+
+        document_version_pages = document_version.pages.filter(
+            content_type=ContentType.objects.get_for_model(
+                model=DocumentFilePage
+            ), object_id__in=queryset.values('pk')
+        )
+
+        sizes = (
+            (setting_display_width.value, setting_display_height.value),
+            (setting_preview_width.value, setting_preview_height.value),
+            (setting_thumbnail_width.value, setting_thumbnail_height.value)
+        )
+
+        for document_version_page in document_version_pages:
+            if document_version.cache.get_usage() >= usage_limit:
+                logger.info(
+                    'Document version page image cache is near full, '
+                    'stopping the pre-rendering of the pages of document '
+                    'file: %s', self
+                )
+                return
+
+            for width, height in sizes:
+                try:
+                    document_version_page.generate_image(
+                        height=height, width=width
+                    )
+                except LockError:
+                    # The image is being generated by another request.
+                    logger.debug(
+                        'Image of document version page %s already being '
+                        'generated.', document_version_page
+                    )
+
     @property
     def pages(self):
         DocumentFilePage = apps.get_model(
@@ -1,13 +1,17 @@
+import hashlib
+from io import BytesIO
 import logging
 
 from furl import furl
+from PIL import Image
 
 from django.db import models
 from django.urls import reverse
+from django.utils.encoding import force_bytes
 from django.utils.functional import cached_property
 from django.utils.translation import ugettext_lazy as _
 
-from mayan.apps.converter.classes import ConverterBase
+from mayan.apps.converter.classes import ConverterBase, ImageTilePyramid
 from mayan.apps.converter.literals import DEFAULT_ZOOM_LEVEL, DEFAULT_ROTATION
 from mayan.apps.converter.models import LayerTransformation
 from mayan.apps.converter.transformations import (
@@ -17,10 +21,17 @@ from mayan.apps.converter.transformations import (
 from mayan.apps.file_caching.models import CachePartitionFile
 from mayan.apps.lock_manager.backends.base import LockingBackend
 
-from ..literals import DOCUMENT_IMAGE_TASK_TIMEOUT
+from ..literals import (
+    DOCUMENT_FILE_PAGE_BASE_IMAGE_CACHE_FILENAME,
+    DOCUMENT_FILE_PAGE_STORED_IMAGE_CACHE_FILENAME,
+    DOCUMENT_FILE_PAGE_STORED_IMAGE_FORMAT,
+    DOCUMENT_FILE_PAGE_TILE_CACHE_FILENAME, DOCUMENT_FILE_PAGE_TILE_FORMAT,
+    DOCUMENT_IMAGE_TASK_TIMEOUT
+)
 from ..managers import DocumentFilePageManager, ValidDocumentFilePageManager
 from ..settings import (
-    setting_display_width, setting_display_height, setting_zoom_max_level,
+    setting_display_width, setting_display_height,
+    setting_page_image_tile_size, setting_zoom_max_level,
     setting_zoom_min_level
 )
 
@@ -71,9 +82,14 @@ class DocumentFilePage(PagedModelMixin, models.Model):
         super().delete(*args, **kwargs)
 
     def generate_image(self, _acquire_lock=True, user=None, **kwargs):
-        transformation_list = self.get_combined_transformation_list(
-            user=user, **kwargs
+        stored_transformation_list = self.get_stored_transformation_list(
+            maximum_layer_order=kwargs.get('maximum_layer_order', None),
+            user=user
         )
+        interactive_transformation_list = self.get_interactive_transformation_list(
+            **kwargs
+        )
+        transformation_list = stored_transformation_list + interactive_transformation_list
         combined_cache_filename = self.get_combined_cache_filename(
             _transformation_list=transformation_list
         )
@@ -104,7 +120,10 @@ class DocumentFilePage(PagedModelMixin, models.Model):
                     logger.debug(
                         'transformations cache file "%s" not found', combined_cache_filename
                     )
-                    image = self.get_image(transformations=transformation_list)
+                    image = self.get_image(
+                        stored_transformations=stored_transformation_list,
+                        transformations=interactive_transformation_list
+                    )
                     with self.cache_partition.create_file(filename=combined_cache_filename) as file_object:
                         file_object.write(image.getvalue())
                 else:
@@ -117,6 +136,77 @@ class DocumentFilePage(PagedModelMixin, models.Model):
                 if _acquire_lock:
                     lock.release()
 
+    def generate_stored_image(
+        self, _transformation_list=None, maximum_layer_order=None, user=None
+    ):
+        """
+        Return the cache filename of the base image with the stored
+        transformations applied. Interactive transformations and tiles
+        start from this image instead of reapplying the stored
+        transformations to the base image. The base image is used directly
+        when there are no stored transformations.
+        """
+        if _transformation_list is None:
+            _transformation_list = self.get_stored_transformation_list(
+                maximum_layer_order=maximum_layer_order, user=user
+            )
+
+        cache_filename = self.get_stored_image_cache_filename(
+            _transformation_list=_transformation_list
+        )
+
+        try:
+            self.cache_partition.get_file(filename=cache_filename)
+        except CachePartitionFile.DoesNotExist:
+            if _transformation_list:
+                image = self.get_image(
+                    output_format=DOCUMENT_FILE_PAGE_STORED_IMAGE_FORMAT,
+                    transformations=_transformation_list
+                )
+                with self.cache_partition.create_file(filename=cache_filename) as file_object:
+                    file_object.write(image.getvalue())
+            else:
+                self.document_file.pages_image_generate(
+                    first_page_number=self.page_number,
+                    last_page_number=self.page_number
+                )
+
+        return cache_filename
+
+    def generate_tile(self, column, level, row, user=None):
+        """
+        Return the cache filename of a tile of the page image. Only the
+        requested tile is rendered, from the cached tile source image.
+        Raises IndexError if the tile is not part of the tile pyramid.
+        """
+        source_cache_filename = self.generate_stored_image(user=user)
+        cache_filename = self.get_tile_cache_filename(
+            column=column, level=level, row=row,
+            source_cache_filename=source_cache_filename
+        )
+
+        try:
+            self.cache_partition.get_file(filename=cache_filename)
+        except CachePartitionFile.DoesNotExist:
+            logger.debug('Tile cache file "%s" not found', cache_filename)
+
+            with self.cache_partition.open_file(filename=source_cache_filename) as file_object:
+                image = Image.open(fp=file_object)
+                tile_pyramid = self.get_tile_pyramid_for_image(image=image)
+                tile = tile_pyramid.render_tile(
+                    column=column, image=image, level=level, row=row
+                )
+
+            image_buffer = BytesIO()
+            tile.convert('RGB').save(
+                image_buffer, format=DOCUMENT_FILE_PAGE_TILE_FORMAT
+            )
+
+            with self.cache_partition.create_file(filename=cache_filename) as file_object:
+                file_object.write(image_buffer.getvalue())
+
+        return cache_filename
+
     def get_absolute_url(self):
         return reverse(
             viewname='documents:document_file_page_view', kwargs={
@@ -166,55 +256,43 @@ class DocumentFilePage(PagedModelMixin, models.Model):
         document page transformation as well as tranformations created
         from the arguments as transient interactive transformation.
         """
-        # Convert arguments into transformations
-        transformations = kwargs.get('transformations', [])
-
-        # Set sensible defaults if the argument is not specified or if the
-        # argument is None
-        width = kwargs.get('width', setting_display_width.value) or setting_display_width.value
-        height = kwargs.get('height', setting_display_height.value) or setting_display_height.value
-        rotation = kwargs.get('rotation', DEFAULT_ROTATION) or DEFAULT_ROTATION
-        zoom_level = kwargs.get('zoom', DEFAULT_ZOOM_LEVEL) or DEFAULT_ZOOM_LEVEL
-
-        if zoom_level < setting_zoom_min_level.value:
-            zoom_level = setting_zoom_min_level.value
-
-        if zoom_level > setting_zoom_max_level.value:
-            zoom_level = setting_zoom_max_level.value
-
-        # Generate transformation hash
-        transformation_list = []
-
-        maximum_layer_order = kwargs.get('maximum_layer_order', None)
-
         # Stored transformations first.
-        transformation_list.extend(
-            LayerTransformation.objects.get_for_object(
-                obj=self, maximum_layer_order=maximum_layer_order,
-                as_classes=True, user=user
-            )
+        transformation_list = self.get_stored_transformation_list(
+            maximum_layer_order=kwargs.get('maximum_layer_order', None),
+            user=user
         )
 
         # Interactive transformations second.
-        transformation_list.extend(transformations)
+        transformation_list.extend(
+            self.get_interactive_transformation_list(**kwargs)
+        )
 
-        if rotation:
-            transformation_list.append(
-                TransformationRotate(degrees=rotation)
-            )
+        return transformation_list
 
-        if width:
-            transformation_list.append(
-                TransformationResize(width=width, height=height)
+    def get_image(
+        self, output_format=None, stored_transformations=None,
+        transformations=None
+    ):
+        """
+        Return the base image with the transformations applied. When
+        `stored_transformations` are provided, the transformations are
+        applied to the cached result of the stored transformations.
+        """
+        if stored_transformations:
+            cache_filename = self.generate_stored_image(
+                _transformation_list=stored_transformations
             )
 
-        if zoom_level:
-            transformation_list.append(TransformationZoom(percent=zoom_level))
+            with self.cache_partition.open_file(filename=cache_filename) as file_object:
+                with ConverterBase.get_converter_class()(
+                    file_object=file_object
+                ) as converter:
+                    converter.seek_page(page_number=0)
+                    converter.transform_many(transformations=transformations or ())
 
-        return transformation_list
+                    return converter.get_page(output_format=output_format)
 
-    def get_image(self, transformations=None):
-        cache_filename = 'base_image'
+        cache_filename = DOCUMENT_FILE_PAGE_BASE_IMAGE_CACHE_FILENAME
         logger.debug('Page cache filename: %s', cache_filename)
 
         try:
@@ -224,22 +302,21 @@ class DocumentFilePage(PagedModelMixin, models.Model):
 
             try:
                 with self.document_file.get_intermediate_file() as file_object:
-                    converter = ConverterBase.get_converter_class()(
+                    with ConverterBase.get_converter_class()(
                         file_object=file_object
-                    )
-                    converter.seek_page(page_number=self.page_number - 1)
+                    ) as converter:
+                        converter.seek_page(page_number=self.page_number - 1)
 
-                    page_image = converter.get_page()
+                        page_image = converter.get_page()
 
-                    # Since open "wb+" doesn't create files, create it explicitly
-                    with self.cache_partition.create_file(filename=cache_filename) as file_object:
-                        file_object.write(page_image.getvalue())
+                        # Since open "wb+" doesn't create files, create it explicitly
+                        with self.cache_partition.create_file(filename=cache_filename) as file_object:
+                            file_object.write(page_image.getvalue())
 
-                    # Apply runtime transformations
-                    for transformation in transformations or ():
-                        converter.transform(transformation=transformation)
+                        # Apply runtime transformations
+                        converter.transform_many(transformations=transformations or ())
 
-                    return converter.get_page()
+                        return converter.get_page(output_format=output_format)
             except Exception as exception:
                 logger.error(
                     'Error creating document file page cache file from '
@@ -252,19 +329,53 @@ class DocumentFilePage(PagedModelMixin, models.Model):
             logger.debug('Page cache file "%s" found', cache_filename)
 
             with cache_file.open() as file_object:
-                converter = ConverterBase.get_converter_class()(
+                with ConverterBase.get_converter_class()(
                     file_object=file_object
-                )
+                ) as converter:
+                    converter.seek_page(page_number=0)
+
+                    # This code is also repeated below to allow using a context
+                    # manager with cache_file.open and close it automatically.
+                    # Apply runtime transformations
+                    converter.transform_many(transformations=transformations or ())
+
+                    return converter.get_page(output_format=output_format)
+
+    def get_interactive_transformation_list(self, **kwargs):
+        """
+        Return the transient interactive transformations created from the
+        arguments.
+        """
+        # Convert arguments into transformations
+        transformation_list = list(kwargs.get('transformations', []))
+
+        # Set sensible defaults if the argument is not specified or if the
+        # argument is None
+        width = kwargs.get('width', setting_display_width.value) or setting_display_width.value
+        height = kwargs.get('height', setting_display_height.value) or setting_display_height.value
+        rotation = kwargs.get('rotation', DEFAULT_ROTATION) or DEFAULT_ROTATION
+        zoom_level = kwargs.get('zoom', DEFAULT_ZOOM_LEVEL) or DEFAULT_ZOOM_LEVEL
 
-                converter.seek_page(page_number=0)
+        if zoom_level < setting_zoom_min_level.value:
+            zoom_level = setting_zoom_min_level.value
 
-                # This code is also repeated below to allow using a context
-                # manager with cache_file.open and close it automatically.
-                # Apply runtime transformations
-                for transformation in transformations or ():
-                    converter.transform(transformation=transformation)
+        if zoom_level > setting_zoom_max_level.value:
+            zoom_level = setting_zoom_max_level.value
 
-                return converter.get_page()
+        if rotation:
+            transformation_list.append(
+                TransformationRotate(degrees=rotation)
+            )
+
+        if width:
+            transformation_list.append(
+                TransformationResize(width=width, height=height)
+            )
+
+        if zoom_level:
+            transformation_list.append(TransformationZoom(percent=zoom_level))
+
+        return transformation_list
 
     def get_label(self):
         return _(
@@ -292,6 +403,65 @@ class DocumentFilePage(PagedModelMixin, models.Model):
             self.pk, combined_cache_filename
         )
 
+    def get_stored_image_cache_filename(
+        self, _transformation_list=None, maximum_layer_order=None, user=None
+    ):
+        if _transformation_list is None:
+            _transformation_list = self.get_stored_transformation_list(
+                maximum_layer_order=maximum_layer_order, user=user
+            )
+
+        if _transformation_list:
+            return DOCUMENT_FILE_PAGE_STORED_IMAGE_CACHE_FILENAME.format(
+                BaseTransformation.combine(
+                    transformations=_transformation_list
+                )
+            )
+        else:
+            return DOCUMENT_FILE_PAGE_BASE_IMAGE_CACHE_FILENAME
+
+    def get_stored_transformation_list(self, maximum_layer_order=None, user=None):
+        return LayerTransformation.objects.get_for_object(
+            obj=self, maximum_layer_order=maximum_layer_order,
+            as_classes=True, user=user
+        )
+
+    def get_tile_cache_filename(
+        self, column, level, row, source_cache_filename=None, user=None
+    ):
+        source_cache_filename = source_cache_filename or self.get_stored_image_cache_filename(
+            user=user
+        )
+
+        return DOCUMENT_FILE_PAGE_TILE_CACHE_FILENAME.format(
+            column=column, level=level, row=row,
+            source=source_cache_filename,
+            tile_size=setting_page_image_tile_size.value
+        )
+
+    def get_tile_hash(self, cache_filename):
+        """
+        Return the hash of a tile or tile source cache filename. Tile
+        source filenames change with the stored transformations of the
+        page.
+        """
+        return hashlib.sha256(force_bytes(s=cache_filename)).hexdigest()
+
+    def get_tile_pyramid(self, user=None):
+        cache_filename = self.generate_stored_image(user=user)
+
+        with self.cache_partition.open_file(filename=cache_filename) as file_object:
+            # Only the image header is read.
+            return self.get_tile_pyramid_for_image(
+                image=Image.open(fp=file_object)
+            )
+
+    def get_tile_pyramid_for_image(self, image):
+        return ImageTilePyramid(
+            height=image.height, tile_size=setting_page_image_tile_size.value,
+            width=image.width
+        )
+
     @property
     def is_in_trash(self):
         return self.document_file.document.is_in_trash
@@ -1,6 +1,7 @@
 import logging
 
 from django.apps import apps
+from django.core.validators import MinValueValidator
 from django.db import models
 from django.urls import reverse
 from django.utils.translation import ugettext_lazy as _
@@ -76,6 +77,20 @@ class DocumentType(ExtraDataModelMixin, models.Model):
         )
     )
 
+    page_image_prerender = models.BooleanField(
+        default=False, help_text=_(
+            'Generate the page images of the new document files of this '
+            'type in the background after they are uploaded.'
+        ), verbose_name=_('Pre-render page images')
+    )
+    page_image_prerender_page_count = models.PositiveIntegerField(
+        blank=True, help_text=_(
+            'Number of pages, from the first one, of which to pre-render '
+            'the images. Leave empty to pre-render all the pages.'
+        ), null=True, validators=[MinValueValidator(limit_value=1)],
+        verbose_name=_('Pre-render page count')
+    )
+
     objects = DocumentTypeManager()
 
     class Meta:
@@ -297,23 +297,24 @@ class DocumentVersionPage(
                 )
 
                 with content_object_cache_file.open() as file_object:
-                    converter = ConverterBase.get_converter_class()(
+                    with ConverterBase.get_converter_class()(
                         file_object=file_object
-                    )
-                    converter.seek_page(page_number=0)
+                    ) as converter:
+                        converter.seek_page(page_number=0)
 
-                    page_image = converter.get_page()
+                        page_image = converter.get_page()
 
-                    # Since open "wb+" doesn't create versions, create it
-                    # explicitly.
-                    with self.cache_partition.create_file(filename=cache_filename) as file_object:
-                        file_object.write(page_image.getvalue())
+                        # Since open "wb+" doesn't create versions, create it
+                        # explicitly.
+                        with self.cache_partition.create_file(filename=cache_filename) as file_object:
+                            file_object.write(page_image.getvalue())
 
-                    # Apply runtime transformations.
-                    for transformation in transformations or ():
-                        converter.transform(transformation=transformation)
+                        # Apply runtime transformations.
+                        converter.transform_many(
+                            transformations=transformations or ()
+                        )
 
-                    return converter.get_page()
+                        return converter.get_page()
             except Exception as exception:
                 # Cleanup in case of error.
                 logger.error(
@@ -326,19 +327,17 @@ class DocumentVersionPage(
             logger.debug('Page cache version "%s" found', cache_filename)
 
             with cache_file.open() as file_object:
-                converter = ConverterBase.get_converter_class()(
+                with ConverterBase.get_converter_class()(
                     file_object=file_object
-                )
-
-                converter.seek_page(page_number=0)
+                ) as converter:
+                    converter.seek_page(page_number=0)
 
-                # This code is also repeated below to allow using a context
-                # manager with cache_version.open and close it automatically.
-                # Apply runtime transformations.
-                for transformation in transformations or ():
-                    converter.transform(transformation=transformation)
+                    # This code is also repeated below to allow using a context
+                    # manager with cache_version.open and close it automatically.
+                    # Apply runtime transformations.
+                    converter.transform_many(transformations=transformations or ())
 
-                return converter.get_page()
+                    return converter.get_page()
 
     def get_label(self):
         return _(
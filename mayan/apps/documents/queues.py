@@ -4,7 +4,7 @@ from django.utils.translation import ugettext_lazy as _
 
 from mayan.apps.converter.queues import queue_converter
 from mayan.apps.task_manager.classes import CeleryQueue
-from mayan.apps.task_manager.workers import worker_b, worker_c
+from mayan.apps.task_manager.workers import worker_b, worker_c, worker_d
 
 from .literals import (
     CHECK_DELETE_PERIOD_INTERVAL, CHECK_TRASH_PERIOD_INTERVAL,
@@ -15,6 +15,10 @@ queue_documents_periodic = CeleryQueue(
     name='documents_periodic', label=_('Documents periodic'), transient=True,
     worker=worker_c
 )
+queue_documents_prerender = CeleryQueue(
+    name='documents_prerender', label=_('Documents pre-rendering'),
+    transient=True, worker=worker_d
+)
 queue_uploads = CeleryQueue(
     name='uploads', label=_('Uploads'), worker=worker_b
 )
@@ -26,6 +30,18 @@ queue_converter.add_task_type(
     dotted_path='mayan.apps.documents.tasks.task_document_file_page_image_generate',
     label=_('Generate document file page image')
 )
+queue_converter.add_task_type(
+    dotted_path='mayan.apps.documents.tasks.task_document_file_page_tile_generate',
+    label=_('Generate document file page image tile')
+)
+queue_converter.add_task_type(
+    dotted_path='mayan.apps.documents.tasks.task_document_file_page_tile_source_generate',
+    label=_('Generate document file page image tile source')
+)
+queue_converter.add_task_type(
+    dotted_path='mayan.apps.documents.tasks.task_document_file_pages_image_generate',
+    label=_('Generate the images of a range of document file pages')
+)
 queue_converter.add_task_type(
     dotted_path='mayan.apps.documents.tasks.task_document_version_page_image_generate',
     label=_('Generate document version page image')
@@ -69,6 +85,11 @@ queue_documents_periodic.add_task_type(
     ),
 )
 
+queue_documents_prerender.add_task_type(
+    dotted_path='mayan.apps.documents.tasks.task_document_file_pages_image_prerender',
+    label=_('Pre-render the page images of a document file')
+)
+
 queue_uploads.add_task_type(
     dotted_path='mayan.apps.documents.tasks.task_document_file_page_count_update',
     label=_('Update document page count')
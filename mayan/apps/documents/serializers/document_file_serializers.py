@@ -113,6 +113,23 @@ class DocumentFilePageSerializer(serializers.HyperlinkedModelSerializer):
         ),
         view_name='rest_api:documentfilepage-image'
     )
+    tile_pyramid_url = MultiKwargHyperlinkedIdentityField(
+        view_kwargs=(
+            {
+                'lookup_field': 'document_file.document.pk',
+                'lookup_url_kwarg': 'document_id',
+            },
+            {
+                'lookup_field': 'document_file_id',
+                'lookup_url_kwarg': 'document_file_id',
+            },
+            {
+                'lookup_field': 'pk',
+                'lookup_url_kwarg': 'document_file_page_id',
+            }
+        ),
+        view_name='rest_api:documentfilepage-tile-pyramid'
+    )
     url = MultiKwargHyperlinkedIdentityField(
         view_kwargs=(
             {
@@ -133,6 +150,7 @@ class DocumentFilePageSerializer(serializers.HyperlinkedModelSerializer):
 
     class Meta:
         fields = (
-            'document_file_url', 'id', 'image_url', 'page_number', 'url'
+            'document_file_url', 'id', 'image_url', 'page_number',
+            'tile_pyramid_url', 'url'
         )
         model = DocumentFilePage
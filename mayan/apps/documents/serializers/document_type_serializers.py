@@ -46,6 +46,7 @@ class DocumentTypeSerializer(serializers.HyperlinkedModelSerializer):
             'delete_time_period', 'delete_time_unit',
             'filename_generator_backend',
             'filename_generator_backend_arguments', 'id', 'label',
+            'page_image_prerender', 'page_image_prerender_page_count',
             'quick_label_list_url', 'trash_time_period', 'trash_time_unit',
             'url'
         )
@@ -12,6 +12,8 @@ from .literals import (
     DEFAULT_DOCUMENTS_FILE_STORAGE_BACKEND,
     DEFAULT_DOCUMENTS_FILE_STORAGE_BACKEND_ARGUMENTS,
     DEFAULT_DOCUMENTS_HASH_BLOCK_SIZE, DEFAULT_DOCUMENTS_LIST_THUMBNAIL_WIDTH,
+    DEFAULT_DOCUMENTS_PAGE_IMAGE_PRERENDER_CACHE_USAGE_LIMIT,
+    DEFAULT_DOCUMENTS_PAGE_IMAGE_TILE_SIZE,
     DEFAULT_DOCUMENTS_PREVIEW_HEIGHT, DEFAULT_DOCUMENTS_PREVIEW_WIDTH,
     DEFAULT_DOCUMENTS_PRINT_HEIGHT, DEFAULT_DOCUMENTS_PRINT_WIDTH,
     DEFAULT_DOCUMENTS_RECENTLY_ACCESSED_COUNT,
@@ -145,6 +147,23 @@ setting_document_version_page_image_cache_storage_backend_arguments = namespace.
         'Arguments to pass to the DOCUMENTS_VERSION_PAGE_IMAGE_CACHE_STORAGE_BACKEND.'
     ),
 )
+setting_page_image_prerender_cache_usage_limit = namespace.add_setting(
+    default=DEFAULT_DOCUMENTS_PAGE_IMAGE_PRERENDER_CACHE_USAGE_LIMIT,
+    global_name='DOCUMENTS_PAGE_IMAGE_PRERENDER_CACHE_USAGE_LIMIT',
+    help_text=_(
+        'Percentage of the maximum size of the page image caches above '
+        'which the page images of new document files are no longer '
+        'pre-rendered. Avoids evicting the images being used to store '
+        'images that might never be viewed.'
+    )
+)
+setting_page_image_tile_size = namespace.add_setting(
+    default=DEFAULT_DOCUMENTS_PAGE_IMAGE_TILE_SIZE,
+    global_name='DOCUMENTS_PAGE_IMAGE_TILE_SIZE', help_text=_(
+        'Width and height in pixels of the tiles used to display large '
+        'document file page images by parts.'
+    )
+)
 setting_preview_height = namespace.add_setting(
     default=DEFAULT_DOCUMENTS_PREVIEW_HEIGHT,
     global_name='DOCUMENTS_PREVIEW_HEIGHT'
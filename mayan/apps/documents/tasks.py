@@ -86,6 +86,121 @@ def task_document_file_page_image_generate(
         raise self.retry(exc=exception)
 
 
+@app.task(
+    bind=True,
+    default_retry_delay=setting_task_document_file_page_image_generate_retry_delay.value
+)
+def task_document_file_page_tile_generate(
+    self, column, document_file_page_id, level, row, user_id=None
+):
+    """
+    Return the cache filename of the tile or None if the tile is not part
+    of the page image tile pyramid.
+    """
+    DocumentFilePage = apps.get_model(
+        app_label='documents', model_name='DocumentFilePage'
+    )
+    User = get_user_model()
+
+    if user_id:
+        user = User.objects.get(pk=user_id)
+    else:
+        user = None
+
+    document_file_page = DocumentFilePage.objects.get(pk=document_file_page_id)
+
+    try:
+        return document_file_page.generate_tile(
+            column=column, level=level, row=row, user=user
+        )
+    except IndexError:
+        return None
+    except LockError as exception:
+        logger.warning(
+            'LockError during attempt to generate document page tile for '
+            'document file page id: %d. Retrying.', document_file_page.pk
+        )
+        raise self.retry(exc=exception)
+
+
+@app.task(
+    bind=True,
+    default_retry_delay=setting_task_document_file_page_image_generate_retry_delay.value
+)
+def task_document_file_page_tile_source_generate(
+    self, document_file_page_id, user_id=None
+):
+    DocumentFilePage = apps.get_model(
+        app_label='documents', model_name='DocumentFilePage'
+    )
+    User = get_user_model()
+
+    if user_id:
+        user = User.objects.get(pk=user_id)
+    else:
+        user = None
+
+    document_file_page = DocumentFilePage.objects.get(pk=document_file_page_id)
+
+    try:
+        return document_file_page.generate_stored_image(user=user)
+    except LockError as exception:
+        logger.warning(
+            'LockError during attempt to generate document page tile source '
+            'for document file page id: %d. Retrying.',
+            document_file_page.pk
+        )
+        raise self.retry(exc=exception)
+
+
+@app.task(
+    bind=True,
+    default_retry_delay=setting_task_document_file_page_image_generate_retry_delay.value,
+    ignore_result=True
+)
+def task_document_file_pages_image_generate(
+    self, document_file_id, first_page_number=None, last_page_number=None
+):
+    DocumentFile = apps.get_model(
+        app_label='documents', model_name='DocumentFile'
+    )
+
+    document_file = DocumentFile.objects.get(pk=document_file_id)
+    try:
+        document_file.pages_image_generate(
+            first_page_number=first_page_number,
+            last_page_number=last_page_number
+        )
+    except (LockError, OperationalError) as exception:
+        logger.warning(
+            'Error during attempt to generate the page images of document '
+            'file id: %d; %s. Retrying.', document_file.pk, exception
+        )
+        raise self.retry(exc=exception)
+
+
+@app.task(
+    bind=True,
+    default_retry_delay=setting_task_document_file_page_image_generate_retry_delay.value,
+    ignore_result=True
+)
+def task_document_file_pages_image_prerender(self, document_file_id):
+    DocumentFile = apps.get_model(
+        app_label='documents', model_name='DocumentFile'
+    )
+
+    document_file = DocumentFile.objects.get(pk=document_file_id)
+    try:
+        document_file.pages_image_prerender()
+    except (LockError, OperationalError) as exception:
+        logger.warning(
+            'Error during attempt to pre-render the page images of '
+            'document file id: %d; %s. Retrying.', document_file.pk,
+            exception
+        )
+        raise self.retry(exc=exception)
+
+
 @app.task(
     bind=True, default_retry_delay=UPLOAD_NEW_VERSION_RETRY_DELAY,
     ignore_result=True
@@ -166,8 +166,9 @@ class DocumentFilePageAPIViewTestMixin:
             }
         )
 
-    def _request_test_document_file_page_image_api_view(self):
+    def _request_test_document_file_page_image_api_view(self, headers=None):
         return self.get(
+            headers=headers,
             viewname='rest_api:documentfilepage-image', kwargs={
                 'document_id': self.test_document.pk,
                 'document_file_id': self.test_document_file.pk,
@@ -183,6 +184,29 @@ class DocumentFilePageAPIViewTestMixin:
             }
         )
 
+    def _request_test_document_file_page_tile_api_view(
+        self, column=0, headers=None, level=0, query=None, row=0
+    ):
+        return self.get(
+            headers=headers,
+            viewname='rest_api:documentfilepage-tile', kwargs={
+                'column': column,
+                'document_id': self.test_document.pk,
+                'document_file_id': self.test_document_file.pk,
+                'document_file_page_id': self.test_document_file_page.pk,
+                'level': level, 'row': row
+            }, query=query
+        )
+
+    def _request_test_document_file_page_tile_pyramid_api_view(self):
+        return self.get(
+            viewname='rest_api:documentfilepage-tile-pyramid', kwargs={
+                'document_id': self.test_document.pk,
+                'document_file_id': self.test_document_file.pk,
+                'document_file_page_id': self.test_document_file_page.pk
+            }
+        )
+
 
 class DocumentFilePageViewTestMixin:
     def _request_test_document_file_page_count_update_view(self):
@@ -112,6 +112,25 @@ class DocumentTypeFilenameGeneratorViewTestMixin:
         )
 
 
+class DocumentTypePageImagePrerenderViewTestMixin:
+    def _request_test_document_type_page_image_prerender_get_view(self):
+        return self.get(
+            viewname='documents:document_type_page_image_prerender', kwargs={
+                'document_type_id': self.test_document_type.pk
+            }
+        )
+
+    def _request_test_document_type_page_image_prerender_post_view(self):
+        return self.post(
+            viewname='documents:document_type_page_image_prerender', kwargs={
+                'document_type_id': self.test_document_type.pk
+            }, data={
+                'page_image_prerender': True,
+                'page_image_prerender_page_count': 1
+            }
+        )
+
+
 class DocumentTypeQuickLabelAPIViewTestMixin:
     def _request_test_document_type_quick_label_create_api_view(self):
         pk_list = list(DocumentTypeFilename.objects.values('pk'))
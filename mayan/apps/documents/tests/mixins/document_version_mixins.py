@@ -161,8 +161,9 @@ class DocumentVersionPageAPIViewTestMixin:
             }
         )
 
-    def _request_test_document_version_page_image_api_view(self):
+    def _request_test_document_version_page_image_api_view(self, headers=None):
         return self.get(
+            headers=headers,
             viewname='rest_api:documentversionpage-image', kwargs={
                 'document_id': self.test_document.pk,
                 'document_version_id': self.test_document_version.pk,
@@ -1,7 +1,27 @@
 from pathlib import Path
 
+from celery.exceptions import Retry
+import mock
+from PIL import Image
+
+from django.test import override_settings
+
+from mayan.apps.converter.classes import ConverterBase
+from mayan.apps.lock_manager.backends.base import LockingBackend
+from mayan.apps.lock_manager.exceptions import LockError
+
+from ..literals import (
+    DOCUMENT_FILE_PAGE_BASE_IMAGE_CACHE_FILENAME,
+    DOCUMENT_FILE_PAGE_STORED_IMAGE_FORMAT
+)
+from ..tasks import (
+    task_document_file_pages_image_generate,
+    task_document_file_pages_image_prerender
+)
+
 from .base import GenericDocumentTestCase
-from .literals import TEST_SMALL_DOCUMENT_CHECKSUM
+from .mixins.document_file_mixins import DocumentFileTransformationTestMixin
+from .literals import TEST_MULTI_PAGE_TIFF, TEST_SMALL_DOCUMENT_CHECKSUM
 
 
 class DocumentFileTestCase(GenericDocumentTestCase):
@@ -48,3 +68,244 @@ class DocumentFileTestCase(GenericDocumentTestCase):
 
     def test_method_get_absolute_url(self):
         self.assertTrue(self.test_document.file_latest.get_absolute_url())
+
+
+class DocumentFilePagesImageGenerateTestCase(GenericDocumentTestCase):
+    test_document_filename = TEST_MULTI_PAGE_TIFF
+
+    def _get_test_document_file_page_cached_count(self):
+        count = 0
+        for document_file_page in self.test_document_file.file_pages.all():
+            if document_file_page.cache_partition.files.filter(filename=DOCUMENT_FILE_PAGE_BASE_IMAGE_CACHE_FILENAME).exists():
+                count += 1
+
+        return count
+
+    def test_converter_get_pages(self):
+        with self.test_document_file.open() as file_object:
+            converter = ConverterBase.get_converter_class()(
+                file_object=file_object
+            )
+            pages = list(
+                converter.get_pages(first_page_number=0, last_page_number=1)
+            )
+
+        self.assertEqual([page[0] for page in pages], [0, 1])
+
+    def test_pages_image_generate(self):
+        page_count = self.test_document_file.file_pages.count()
+
+        self.assertEqual(
+            self.test_document_file.pages_image_generate(), page_count
+        )
+        self.assertEqual(
+            self._get_test_document_file_page_cached_count(), page_count
+        )
+
+        self.assertEqual(self.test_document_file.pages_image_generate(), 0)
+
+    def test_pages_image_generate_range(self):
+        self.assertEqual(
+            self.test_document_file.pages_image_generate(
+                first_page_number=2, last_page_number=2
+            ), 1
+        )
+        self.assertEqual(self._get_test_document_file_page_cached_count(), 1)
+
+        document_file_page = self.test_document_file.file_pages.get(
+            page_number=2
+        )
+        self.assertTrue(document_file_page.get_image().getvalue())
+
+    def test_pages_image_generate_lock_error(self):
+        page_count = self.test_document_file.file_pages.count()
+        document_file_page = self.test_document_file.file_pages.first()
+
+        lock = LockingBackend.get_backend().acquire_lock(
+            name=document_file_page.cache_partition.get_file_lock_name(
+                filename=DOCUMENT_FILE_PAGE_BASE_IMAGE_CACHE_FILENAME
+            )
+        )
+        try:
+            self.assertEqual(
+                self.test_document_file.pages_image_generate(),
+                page_count - 1
+            )
+        finally:
+            lock.release()
+
+        self.assertEqual(
+            self._get_test_document_file_page_cached_count(), page_count - 1
+        )
+
+    @mock.patch('mayan.apps.documents.models.document_file_models.DocumentFile.pages_image_generate')
+    def test_pages_image_generate_task_lock_error_retry(
+        self, mock_pages_image_generate
+    ):
+        mock_pages_image_generate.side_effect = LockError
+
+        # Eager tasks raise the retry exception instead of retrying.
+        with self.assertRaises(expected_exception=Retry):
+            task_document_file_pages_image_generate.apply_async(
+                kwargs={'document_file_id': self.test_document_file.pk}
+            )
+
+
+class DocumentFilePagesImagePrerenderTestCase(GenericDocumentTestCase):
+    auto_upload_test_document = False
+    test_document_filename = TEST_MULTI_PAGE_TIFF
+
+    def setUp(self):
+        super().setUp()
+        self.test_document_type.page_image_prerender = True
+        self.test_document_type.page_image_prerender_page_count = 1
+        self.test_document_type.save()
+
+    def _get_test_document_file_page_cached_list(self):
+        return [
+            document_file_page.page_number for document_file_page in self.test_document_file.file_pages.all()
+            if document_file_page.cache_partition.files.filter(filename=DOCUMENT_FILE_PAGE_BASE_IMAGE_CACHE_FILENAME).exists()
+        ]
+
+    def test_pages_image_prerender_on_upload(self):
+        self._upload_test_document()
+
+        self.assertEqual(self._get_test_document_file_page_cached_list(), [1])
+
+    def test_pages_image_prerender_disabled(self):
+        self.test_document_type.page_image_prerender = False
+        self.test_document_type.save()
+
+        self._upload_test_document()
+
+        self.assertEqual(self._get_test_document_file_page_cached_list(), [])
+
+    def test_pages_image_prerender_document_version_pages(self):
+        self._upload_test_document()
+
+        self.test_document_file.pages_image_prerender()
+
+        document_version_pages = self.test_document.version_active.pages.all()
+
+        self.assertTrue(
+            document_version_pages[0].cache_partition.files.count()
+        )
+        self.assertFalse(
+            document_version_pages[1].cache_partition.files.count()
+        )
+
+    @override_settings(DOCUMENTS_PAGE_IMAGE_PRERENDER_CACHE_USAGE_LIMIT=0)
+    def test_pages_image_prerender_cache_usage_limit(self):
+        self._upload_test_document()
+
+        self.assertEqual(self._get_test_document_file_page_cached_list(), [])
+
+    @mock.patch('mayan.apps.documents.models.document_file_models.DocumentFile.pages_image_prerender')
+    def test_pages_image_prerender_task_lock_error_retry(
+        self, mock_pages_image_prerender
+    ):
+        self._upload_test_document()
+
+        mock_pages_image_prerender.side_effect = LockError
+
+        # Eager tasks raise the retry exception instead of retrying.
+        with self.assertRaises(expected_exception=Retry):
+            task_document_file_pages_image_prerender.apply_async(
+                kwargs={'document_file_id': self.test_document_file.pk}
+            )
+
+
+class DocumentFilePageImageTestCase(
+    DocumentFileTransformationTestMixin, GenericDocumentTestCase
+):
+    def test_generate_image_stored_image_reuse(self):
+        self._create_document_file_transformation()
+
+        self.test_document_file_page.generate_image(zoom=100)
+
+        stored_cache_filename = self.test_document_file_page.get_stored_image_cache_filename()
+        cache_file = self.test_document_file_page.cache_partition.get_file(
+            filename=stored_cache_filename
+        )
+
+        self.test_document_file_page.generate_image(zoom=150)
+
+        self.assertEqual(
+            self.test_document_file_page.cache_partition.get_file(
+                filename=stored_cache_filename
+            ).pk, cache_file.pk
+        )
+
+    def test_generate_image_without_stored_transformations(self):
+        self.test_document_file_page.generate_image()
+
+        self.assertEqual(
+            self.test_document_file_page.get_stored_image_cache_filename(),
+            DOCUMENT_FILE_PAGE_BASE_IMAGE_CACHE_FILENAME
+        )
+        self.assertEqual(
+            self.test_document_file_page.cache_partition.files.count(), 2
+        )
+
+
+class DocumentFilePageTileTestCase(
+    DocumentFileTransformationTestMixin, GenericDocumentTestCase
+):
+    def test_generate_tile(self):
+        tile_pyramid = self.test_document_file_page.get_tile_pyramid()
+        level = tile_pyramid.get_level_count() - 1
+
+        cache_filename = self.test_document_file_page.generate_tile(
+            column=0, level=level, row=0
+        )
+
+        with self.test_document_file_page.cache_partition.open_file(filename=cache_filename) as file_object:
+            image = Image.open(fp=file_object)
+            self.assertEqual(
+                image.size, (
+                    min(tile_pyramid.tile_size, tile_pyramid.width),
+                    min(tile_pyramid.tile_size, tile_pyramid.height)
+                )
+            )
+
+    def test_generate_tile_cached(self):
+        cache_filename = self.test_document_file_page.generate_tile(
+            column=0, level=0, row=0
+        )
+        file_count = self.test_document_file_page.cache_partition.files.count()
+
+        self.assertEqual(
+            self.test_document_file_page.generate_tile(
+                column=0, level=0, row=0
+            ), cache_filename
+        )
+        self.assertEqual(
+            self.test_document_file_page.cache_partition.files.count(),
+            file_count
+        )
+
+    def test_generate_stored_image_with_transformation(self):
+        self._create_document_file_transformation()
+
+        cache_filename = self.test_document_file_page.generate_stored_image()
+
+        self.assertNotEqual(
+            cache_filename, DOCUMENT_FILE_PAGE_BASE_IMAGE_CACHE_FILENAME
+        )
+        self.assertTrue(
+            self.test_document_file_page.cache_partition.files.filter(
+                filename=cache_filename
+            ).exists()
+        )
+
+        with self.test_document_file_page.cache_partition.open_file(filename=cache_filename) as file_object:
+            self.assertEqual(
+                Image.open(fp=file_object).format,
+                DOCUMENT_FILE_PAGE_STORED_IMAGE_FORMAT
+            )
+
+    def test_generate_tile_invalid(self):
+        with self.assertRaises(IndexError):
+            self.test_document_file_page.generate_tile(
+                column=1, level=0, row=0
+            )
@@ -1,15 +1,25 @@
+from unittest import mock
+
+from django.test import override_settings
+
 from rest_framework import status
 
+from mayan.apps.file_caching.classes import CachePartitionFileMemoryTier
+from mayan.apps.file_caching.models import CachePartition, CachePartitionFile
 from mayan.apps.rest_api.tests.base import BaseAPITestCase
 
+from ..literals import DOCUMENT_IMAGE_API_RETRY_AFTER
 from ..permissions import permission_document_file_view
 
 from .mixins.document_mixins import DocumentTestMixin
-from .mixins.document_file_mixins import DocumentFilePageAPIViewTestMixin
+from .mixins.document_file_mixins import (
+    DocumentFilePageAPIViewTestMixin, DocumentFileTransformationTestMixin
+)
 
 
 class DocumentFilePageAPIViewTestCase(
-    DocumentFilePageAPIViewTestMixin, DocumentTestMixin, BaseAPITestCase
+    DocumentFilePageAPIViewTestMixin, DocumentFileTransformationTestMixin,
+    DocumentTestMixin, BaseAPITestCase
 ):
     def test_document_file_page_detail_api_view_no_permission(self):
         self._clear_events()
@@ -56,6 +66,110 @@ class DocumentFilePageAPIViewTestCase(
         events = self._get_test_events()
         self.assertEqual(events.count(), 0)
 
+    def test_document_file_page_image_api_view_async_with_access(self):
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_file_view
+        )
+
+        self._clear_events()
+
+        response = self._request_test_document_file_page_image_api_view(
+            headers={'HTTP_PREFER': 'respond-async'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(
+            response['Retry-After'], str(DOCUMENT_IMAGE_API_RETRY_AFTER)
+        )
+
+        # Tasks run eagerly during tests, the image is now cached.
+        response = self._request_test_document_file_page_image_api_view(
+            headers={'HTTP_PREFER': 'respond-async'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(b''.join(response.streaming_content))
+
+        events = self._get_test_events()
+        self.assertEqual(events.count(), 0)
+
+    def test_document_file_page_image_api_view_conditional_with_access(self):
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_file_view
+        )
+
+        response = self._request_test_document_file_page_image_api_view()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response.close()
+
+        self._clear_events()
+
+        response = self._request_test_document_file_page_image_api_view(
+            headers={'HTTP_IF_NONE_MATCH': response['ETag']}
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self._request_test_document_file_page_image_api_view(
+            headers={'HTTP_IF_MODIFIED_SINCE': response['Last-Modified']}
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        events = self._get_test_events()
+        self.assertEqual(events.count(), 0)
+
+    @override_settings(FILE_CACHING_MEMORY_TIER_MAXIMUM_SIZE=10485760)
+    def test_document_file_page_image_api_view_memory_tier_with_access(self):
+        CachePartitionFileMemoryTier.clear()
+
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_file_view
+        )
+
+        response = self._request_test_document_file_page_image_api_view()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        content = b''.join(response.streaming_content)
+        etag = response['ETag']
+
+        # Images in the memory tier are served without the storage.
+        cache_partition = self.test_document_file_page.cache_partition
+        for cache_partition_file in cache_partition.files.all():
+            cache_partition.cache.storage.delete(
+                name=cache_partition_file.full_filename
+            )
+
+        response = self._request_test_document_file_page_image_api_view()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b''.join(response.streaming_content), content)
+        self.assertEqual(response['ETag'], etag)
+
+        response = self._request_test_document_file_page_image_api_view(
+            headers={'HTTP_IF_NONE_MATCH': etag}
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        CachePartitionFileMemoryTier.clear()
+
+    def test_document_file_page_image_api_view_pruned_with_access(self):
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_file_view
+        )
+
+        self._clear_events()
+
+        # The image is deleted by a concurrent prune after the task
+        # created it.
+        with mock.patch.object(
+            attribute='open_file_entry', target=CachePartition,
+            side_effect=CachePartitionFile.DoesNotExist
+        ):
+            response = self._request_test_document_file_page_image_api_view()
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(
+            response['Retry-After'], str(DOCUMENT_IMAGE_API_RETRY_AFTER)
+        )
+
+        events = self._get_test_events()
+        self.assertEqual(events.count(), 0)
+
     def test_document_file_page_list_api_view_no_permission(self):
         self._clear_events()
 
@@ -83,3 +197,99 @@ class DocumentFilePageAPIViewTestCase(
 
         events = self._get_test_events()
         self.assertEqual(events.count(), 0)
+
+    def test_document_file_page_tile_api_view_no_permission(self):
+        self._clear_events()
+
+        response = self._request_test_document_file_page_tile_api_view()
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        events = self._get_test_events()
+        self.assertEqual(events.count(), 0)
+
+    def test_document_file_page_tile_api_view_with_access(self):
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_file_view
+        )
+
+        self._clear_events()
+
+        response = self._request_test_document_file_page_tile_api_view()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+
+        events = self._get_test_events()
+        self.assertEqual(events.count(), 0)
+
+    def test_document_file_page_tile_api_view_cache_control_with_access(self):
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_file_view
+        )
+
+        response = self._request_test_document_file_page_tile_pyramid_api_view()
+        tile_hash = response.data['hash']
+
+        response = self._request_test_document_file_page_tile_api_view()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['ETag'])
+        self.assertFalse('max-age' in response['Cache-Control'])
+
+        etag = response['ETag']
+
+        response = self._request_test_document_file_page_tile_api_view(
+            query={'_hash': tile_hash}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue('max-age' in response['Cache-Control'])
+
+        response = self._request_test_document_file_page_tile_api_view(
+            headers={'HTTP_IF_NONE_MATCH': etag}
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self._create_document_file_transformation()
+
+        response = self._request_test_document_file_page_tile_api_view(
+            headers={'HTTP_IF_NONE_MATCH': etag}, query={'_hash': tile_hash}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertFalse('max-age' in response['Cache-Control'])
+
+    def test_document_file_page_tile_api_view_invalid_tile_with_access(self):
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_file_view
+        )
+
+        self._clear_events()
+
+        response = self._request_test_document_file_page_tile_api_view(
+            column=1
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        events = self._get_test_events()
+        self.assertEqual(events.count(), 0)
+
+    def test_document_file_page_tile_pyramid_api_view_no_permission(self):
+        self._clear_events()
+
+        response = self._request_test_document_file_page_tile_pyramid_api_view()
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        events = self._get_test_events()
+        self.assertEqual(events.count(), 0)
+
+    def test_document_file_page_tile_pyramid_api_view_with_access(self):
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_file_view
+        )
+
+        self._clear_events()
+
+        response = self._request_test_document_file_page_tile_pyramid_api_view()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['level_count'] > 0)
+
+        events = self._get_test_events()
+        self.assertEqual(events.count(), 0)
@@ -16,6 +16,7 @@ from .mixins.document_type_mixins import (
     DocumentQuickLabelViewTestMixin,
     DocumentTypeDeletionPoliciesViewTestMixin,
     DocumentTypeFilenameGeneratorViewTestMixin,
+    DocumentTypePageImagePrerenderViewTestMixin,
     DocumentTypeQuickLabelTestMixin, DocumentTypeQuickLabelViewTestMixin,
     DocumentTypeViewTestMixin
 )
@@ -85,6 +86,47 @@ class DocumentTypeFilenameGeneratorViewTestCase(
         self.assertEqual(response.status_code, 302)
 
 
+class DocumentTypePageImagePrerenderViewTestCase(
+    DocumentTypePageImagePrerenderViewTestMixin, GenericDocumentViewTestCase
+):
+    auto_upload_test_document = False
+
+    def test_document_type_page_image_prerender_get_view_no_permission(self):
+        response = self._request_test_document_type_page_image_prerender_get_view()
+        self.assertEqual(response.status_code, 404)
+
+    def test_document_type_page_image_prerender_get_view_access(self):
+        self.grant_access(
+            obj=self.test_document_type,
+            permission=permission_document_type_edit
+        )
+
+        response = self._request_test_document_type_page_image_prerender_get_view()
+        self.assertEqual(response.status_code, 200)
+
+    def test_document_type_page_image_prerender_post_view_no_permission(self):
+        response = self._request_test_document_type_page_image_prerender_post_view()
+        self.assertEqual(response.status_code, 404)
+
+        self.test_document_type.refresh_from_db()
+        self.assertFalse(self.test_document_type.page_image_prerender)
+
+    def test_document_type_page_image_prerender_post_view_access(self):
+        self.grant_access(
+            obj=self.test_document_type,
+            permission=permission_document_type_edit
+        )
+
+        response = self._request_test_document_type_page_image_prerender_post_view()
+        self.assertEqual(response.status_code, 302)
+
+        self.test_document_type.refresh_from_db()
+        self.assertTrue(self.test_document_type.page_image_prerender)
+        self.assertEqual(
+            self.test_document_type.page_image_prerender_page_count, 1
+        )
+
+
 class DocumentTypeViewsTestCase(
     DocumentTypeViewTestMixin, GenericDocumentViewTestCase
 ):
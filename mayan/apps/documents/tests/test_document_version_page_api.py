@@ -6,6 +6,7 @@ from ..events import (
     event_document_version_page_created, event_document_version_page_deleted,
     event_document_version_page_edited
 )
+from ..literals import DOCUMENT_IMAGE_API_RETRY_AFTER
 from ..permissions import (
     permission_document_version_edit, permission_document_version_view
 )
@@ -210,6 +211,32 @@ class DocumentVersionPageAPIViewTestCase(
         self.assertEqual(events[0].target, self.test_document_version_page)
         self.assertEqual(events[0].verb, event_document_version_page_edited.id)
 
+    def test_document_version_page_image_api_view_async_with_access(self):
+        self.grant_access(
+            obj=self.test_document_version,
+            permission=permission_document_version_view
+        )
+
+        self._clear_events()
+
+        response = self._request_test_document_version_page_image_api_view(
+            headers={'HTTP_PREFER': 'respond-async'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(
+            response['Retry-After'], str(DOCUMENT_IMAGE_API_RETRY_AFTER)
+        )
+
+        # Tasks run eagerly during tests, the image is now cached.
+        response = self._request_test_document_version_page_image_api_view(
+            headers={'HTTP_PREFER': 'respond-async'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(b''.join(response.streaming_content))
+
+        events = self._get_test_events()
+        self.assertEqual(events.count(), 0)
+
     def test_document_version_page_image_api_view_no_permission(self):
         self._clear_events()
 
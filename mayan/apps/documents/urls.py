@@ -7,7 +7,8 @@ from .api_views.document_api_views import (
 from .api_views.document_file_api_views import (
     APIDocumentFileDetailView, APIDocumentFileDownloadView,
     APIDocumentFileListView, APIDocumentFilePageImageView,
-    APIDocumentFilePageDetailView, APIDocumentFilePageListView
+    APIDocumentFilePageDetailView, APIDocumentFilePageListView,
+    APIDocumentFilePageTilePyramidView, APIDocumentFilePageTileView
 )
 from .api_views.document_type_api_views import (
     APIDocumentTypeDetailView, APIDocumentTypeListView,
@@ -52,7 +53,7 @@ from .views.document_type_views import (
     DocumentTypeEditView, DocumentTypeFileGeneratorEditView,
     DocumentTypeFilenameCreateView, DocumentTypeFilenameDeleteView,
     DocumentTypeFilenameEditView, DocumentTypeFilenameListView,
-    DocumentTypeListView
+    DocumentTypeListView, DocumentTypePageImagePrerenderEditView
 )
 from .views.document_version_page_views import (
     DocumentVersionPageDeleteView, DocumentVersionPageListView,
@@ -250,6 +251,11 @@ urlpatterns_document_types = [
         name='document_type_filename_list',
         view=DocumentTypeFilenameListView.as_view()
     ),
+    url(
+        regex=r'^document_types/(?P<document_type_id>\d+)/page_image_prerender/$',
+        name='document_type_page_image_prerender',
+        view=DocumentTypePageImagePrerenderEditView.as_view()
+    ),
     url(
         regex=r'^document_types/(?P<document_type_id>\d+)/filenames/create/$',
         name='document_type_filename_create',
@@ -586,6 +592,16 @@ api_urls_document_files = [
         regex=r'^documents/(?P<document_id>[0-9]+)/files/(?P<document_file_id>[0-9]+)/pages/(?P<document_file_page_id>[0-9]+)/image/$',
         name='documentfilepage-image',
         view=APIDocumentFilePageImageView.as_view()
+    ),
+    url(
+        regex=r'^documents/(?P<document_id>[0-9]+)/files/(?P<document_file_id>[0-9]+)/pages/(?P<document_file_page_id>[0-9]+)/tiles/$',
+        name='documentfilepage-tile-pyramid',
+        view=APIDocumentFilePageTilePyramidView.as_view()
+    ),
+    url(
+        regex=r'^documents/(?P<document_id>[0-9]+)/files/(?P<document_file_id>[0-9]+)/pages/(?P<document_file_page_id>[0-9]+)/tiles/(?P<level>[0-9]+)/(?P<column>[0-9]+)/(?P<row>[0-9]+)/$',
+        name='documentfilepage-tile',
+        view=APIDocumentFilePageTileView.as_view()
     )
 ]
 
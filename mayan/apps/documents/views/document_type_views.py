@@ -296,3 +296,26 @@ class DocumentTypeFileGeneratorEditView(SingleObjectEditView):
         return {
             '_event_actor': self.request.user,
         }
+
+
+class DocumentTypePageImagePrerenderEditView(SingleObjectEditView):
+    fields = ('page_image_prerender', 'page_image_prerender_page_count')
+    model = DocumentType
+    object_permission = permission_document_type_edit
+    pk_url_kwarg = 'document_type_id'
+    post_action_redirect = reverse_lazy(
+        viewname='documents:document_type_list'
+    )
+
+    def get_extra_context(self):
+        return {
+            'object': self.object,
+            'title': _(
+                'Page image pre-rendering for document type: %s'
+            ) % self.object,
+        }
+
+    def get_instance_extra_data(self):
+        return {
+            '_event_actor': self.request.user,
+        }
@@ -1,11 +1,18 @@
 from django.utils.encoding import force_text
 
 from rest_framework.exceptions import ParseError
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 from mayan.apps.rest_api import generics
+from mayan.apps.rest_api.literals import DEFAULT_MAX_PAGE_SIZE
 
 from .api_view_mixins import SearchModelAPIViewMixin
 from .classes import SearchBackend, SearchModel
+from .literals import (
+    DEFAULT_SEARCH_PAGE_SIZE, QUERY_PARAMETER_CURSOR,
+    QUERY_PARAMETER_MATCH_ALL, QUERY_PARAMETER_PAGE_SIZE
+)
 from .serializers import SearchModelSerializer
 
 
@@ -79,6 +86,61 @@ class APIAdvancedSearchView(SearchModelAPIViewMixin, generics.ListAPIView):
             return None
 
 
+class APISearchPageView(SearchModelAPIViewMixin, generics.GenericAPIView):
+    """
+    get: Perform a search operation returning a page of results and the URL of the next page.
+    """
+    def get(self, request, *args, **kwargs):
+        search_model = self.get_search_model()
+        self.serializer_class = search_model.serializer
+
+        if self.request.GET.get(QUERY_PARAMETER_MATCH_ALL, 'off') == 'on':
+            global_and_search = True
+        else:
+            global_and_search = False
+
+        try:
+            page_size = min(
+                int(
+                    self.request.GET.get(
+                        QUERY_PARAMETER_PAGE_SIZE, DEFAULT_SEARCH_PAGE_SIZE
+                    )
+                ), DEFAULT_MAX_PAGE_SIZE
+            )
+        except ValueError as exception:
+            raise ParseError(force_text(s=exception))
+
+        try:
+            page = SearchBackend.get_instance().search_page(
+                cursor=self.request.GET.get(QUERY_PARAMETER_CURSOR),
+                global_and_search=global_and_search, page_size=page_size,
+                query_string=self.request.GET, search_model=search_model,
+                user=self.request.user
+            )
+        except Exception as exception:
+            raise ParseError(force_text(s=exception))
+
+        if page.has_next:
+            next_url = replace_query_param(
+                key=QUERY_PARAMETER_CURSOR,
+                url=self.request.build_absolute_uri(), val=page.next_cursor
+            )
+        else:
+            next_url = None
+
+        serializer = self.get_serializer(page.object_list, many=True)
+
+        return Response(
+            data={'next': next_url, 'results': serializer.data}
+        )
+
+    def get_serializer(self, *args, **kwargs):
+        if self.get_search_model_name():
+            return super().get_serializer(*args, **kwargs)
+        else:
+            return None
+
+
 class APISearchModelList(generics.ListAPIView):
     """
     get: Returns a list of all the available search models.
@@ -1,9 +1,14 @@
+from django.apps import apps
+from django.db.models.signals import m2m_changed, post_delete
 from django.utils.translation import ugettext_lazy as _
 
 from mayan.apps.common.apps import MayanAppConfig
 from mayan.apps.common.menus import menu_facet, menu_secondary, menu_tools
 
 from .classes import SearchModel
+from .handlers import (
+    handler_acl_deleted, handler_acl_permissions_changed
+)
 from .links import (
     link_search, link_search_advanced, link_search_again,
     link_search_backend_reindex
@@ -21,6 +26,10 @@ class DynamicSearchApp(MayanAppConfig):
     def ready(self):
         super().ready()
 
+        AccessControlList = apps.get_model(
+            app_label='acls', model_name='AccessControlList'
+        )
+
         SearchModel.load_modules()
         SearchModel.initialize()
 
@@ -36,3 +45,13 @@ class DynamicSearchApp(MayanAppConfig):
         menu_tools.bind_links(
             links=(link_search_backend_reindex,),
         )
+
+        m2m_changed.connect(
+            dispatch_uid='search_handler_acl_permissions_changed',
+            receiver=handler_acl_permissions_changed,
+            sender=AccessControlList.permissions.through
+        )
+        post_delete.connect(
+            dispatch_uid='search_handler_acl_deleted',
+            receiver=handler_acl_deleted, sender=AccessControlList
+        )
@@ -4,6 +4,7 @@ from django.db.models import Q
 from django.utils.encoding import force_text
 
 from ..classes import SearchBackend
+from ..literals import SCOPE_OPERATOR_AND, SCOPE_OPERATOR_OR
 
 from .literals import (
     QUERY_OPERATION_AND, QUERY_OPERATION_OR, TERM_NEGATION_CHARACTER,
@@ -14,16 +15,45 @@ logger = logging.getLogger(name=__name__)
 
 class DjangoSearchBackend(SearchBackend):
     def _search(self, query_string, search_model, user, global_and_search=False):
-        search_query = self.get_search_query(
-            search_model=search_model, query_string=query_string,
-            global_and_search=global_and_search
+        return self._search_query(
+            query=self.compile_scope(
+                global_and_search=global_and_search,
+                query_string=query_string, search_model=search_model
+            ), search_model=search_model, user=user
         )
 
-        queryset = search_model.get_queryset().filter(
-            search_query.query
-        ).distinct()
+    def _search_query(self, query, search_model, user):
+        return search_model.get_queryset().filter(query).distinct()
+
+    def compile_operation(self, search_model, operator, query_list):
+        """
+        Each operand is compiled as a primary key subquery to keep the
+        joins of each scope independent, matching the results of
+        searching the scopes separately.
+        """
+        manager = search_model.model._meta.default_manager
+
+        result = None
+
+        for query in query_list:
+            query = Q(pk__in=manager.filter(query).values('pk'))
 
-        return SearchBackend.limit_queryset(queryset=queryset)
+            if result is None:
+                result = query
+            elif operator == SCOPE_OPERATOR_AND:
+                result = result & query
+            elif operator == SCOPE_OPERATOR_OR:
+                result = result | query
+            else:
+                result = result & ~query
+
+        return result
+
+    def compile_scope(self, search_model, query_string, global_and_search=False):
+        return self.get_search_query(
+            global_and_search=global_and_search, query_string=query_string,
+            search_model=search_model
+        ).query
 
     def deindex_instance(self, instance):
         """This backend doesn't remove instances."""
@@ -34,6 +64,16 @@ class DjangoSearchBackend(SearchBackend):
         database directly.
         """
 
+    def index_search_model(self, search_model):
+        """This backend doesn't index search models."""
+
+    def get_query_text(self, query, search_model):
+        return force_text(
+            s=self._search_query(
+                query=query, search_model=search_model, user=None
+            ).query
+        )
+
     def get_search_query(self, search_model, query_string, global_and_search=False):
         return SearchQuery(
             query_string=query_string, search_model=search_model,
@@ -24,4 +24,20 @@ DJANGO_TO_WHOOSH_FIELD_MAP = {
     models.UUIDField: {'field': whoosh.fields.TEXT, 'transformation': str},
     RGBColorField: {'field': whoosh.fields.TEXT},
 }
+DEFAULT_POSTGRESQL_INDEX_BATCH_SIZE = 1000
+DEFAULT_POSTGRESQL_SEARCH_CONFIG = 'simple'
+
+DEFAULT_WHOOSH_INDEX_ACCESS = False
+DEFAULT_WHOOSH_WRITER_COMMIT_INTERVAL = 1000
+DEFAULT_WHOOSH_WRITER_LIMITMB = 128
+DEFAULT_WHOOSH_WRITER_LOCK_TIMEOUT = 300
+DEFAULT_WHOOSH_WRITER_MULTISEGMENT = False
+DEFAULT_WHOOSH_WRITER_PROCS = 1
+
+POSTGRESQL_SEARCH_VECTOR_MAXIMUM_LENGTH = 512 * 1024
+TSQUERY_OPERATION_AND = ' & '
+TSQUERY_OPERATION_OR = ' | '
+TSQUERY_OPERATION_PHRASE = ' <-> '
+
+WHOOSH_ACCESS_FIELD = 'acl_role_ids'
 WHOOSH_INDEX_DIRECTORY_NAME = 'whoosh'
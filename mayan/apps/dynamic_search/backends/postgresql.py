@@ -0,0 +1,409 @@
+import logging
+import re
+import time
+
+from django.apps import apps
+from django.contrib.postgres.search import (
+    SearchQuery, SearchRank, SearchVector
+)
+from django.db import connection, transaction
+from django.db.models import (
+    Case, F, FloatField, OuterRef, Q, Subquery, Sum, TextField, Value, When
+)
+from django.utils.encoding import force_text
+
+from mayan.apps.common.exceptions import ResolverPipelineError
+from mayan.apps.common.utils import ResolverPipelineModelAttribute
+
+from ..classes import SearchModel, SearchResultPage
+from ..exceptions import DynamicSearchException
+from ..literals import DEFAULT_SEARCH_PAGE_SIZE
+
+from .django import DjangoSearchBackend, SearchTermCollection
+from .literals import (
+    DEFAULT_POSTGRESQL_INDEX_BATCH_SIZE, DEFAULT_POSTGRESQL_SEARCH_CONFIG,
+    POSTGRESQL_SEARCH_VECTOR_MAXIMUM_LENGTH, TERM_OPERATION_OR,
+    TSQUERY_OPERATION_AND, TSQUERY_OPERATION_OR, TSQUERY_OPERATION_PHRASE
+)
+logger = logging.getLogger(name=__name__)
+
+
+class PostgreSQLSearchBackend(DjangoSearchBackend):
+    """
+    Full text search backend that stores a text search vector for each
+    search field of each instance. Falls back to the database query
+    backend when the database manager is not PostgreSQL.
+    """
+    @staticmethod
+    def get_term_tsquery(term_string):
+        """
+        Convert a search term into a prefix matching tsquery expression.
+        Terms with several words, like quoted phrases, must match the
+        words in sequence.
+        """
+        lexemes = [
+            '\'{}\':*'.format(word) for word in re.findall(
+                pattern=r'\w+', string=term_string
+            )
+        ]
+
+        if len(lexemes) > 1:
+            return '({})'.format(TSQUERY_OPERATION_PHRASE.join(lexemes))
+        elif lexemes:
+            return lexemes[0]
+
+    @staticmethod
+    def is_database_supported():
+        return connection.vendor == 'postgresql'
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.index_batch_size = self.kwargs.get(
+            'index_batch_size', DEFAULT_POSTGRESQL_INDEX_BATCH_SIZE
+        )
+        self.search_config = self.kwargs.get(
+            'search_config', DEFAULT_POSTGRESQL_SEARCH_CONFIG
+        )
+
+    def _index_instances(self, search_model, instances):
+        """
+        Replace the search index entries of several instances of the same
+        search model using a single bulk insert.
+        """
+        SearchIndexEntry = apps.get_model(
+            app_label='dynamic_search', model_name='SearchIndexEntry'
+        )
+
+        entries = []
+        for instance in instances:
+            for search_field in search_model.search_fields:
+                text = self.get_field_text(
+                    instance=instance, search_field=search_field
+                )
+                entries.append(
+                    SearchIndexEntry(
+                        field_name=search_field.get_full_name(),
+                        object_id=instance.pk,
+                        search_model_name=search_model.get_full_name(),
+                        vector=SearchVector(
+                            Value(text, output_field=TextField()),
+                            config=self.search_config
+                        )
+                    )
+                )
+
+        with transaction.atomic():
+            SearchIndexEntry.objects.filter(
+                object_id__in=[instance.pk for instance in instances],
+                search_model_name=search_model.get_full_name()
+            ).delete()
+            SearchIndexEntry.objects.bulk_create(
+                batch_size=self.index_batch_size, objs=entries
+            )
+
+    def _search(self, query_string, search_model, user, global_and_search=False):
+        if not self.is_database_supported():
+            return super()._search(
+                global_and_search=global_and_search,
+                query_string=query_string, search_model=search_model,
+                user=user
+            )
+
+        SearchIndexEntry = apps.get_model(
+            app_label='dynamic_search', model_name='SearchIndexEntry'
+        )
+
+        entries = SearchIndexEntry.objects.filter(
+            search_model_name=search_model.get_full_name()
+        )
+
+        query = None
+        rank_conditions = []
+
+        for search_field in search_model.search_fields:
+            tsquery = self.get_field_tsquery(
+                search_field=search_field, text=query_string.get(
+                    search_field.field, query_string.get('q', '')
+                ).strip()
+            )
+
+            if tsquery:
+                search_query = SearchQuery(
+                    config=self.search_config, search_type='raw',
+                    value=tsquery
+                )
+
+                q_object = Q(
+                    pk__in=entries.filter(
+                        field_name=search_field.get_full_name(),
+                        vector=search_query
+                    ).values('object_id')
+                )
+
+                if query is None:
+                    query = q_object
+                else:
+                    if global_and_search:
+                        query = query & q_object
+                    else:
+                        query = query | q_object
+
+                rank_conditions.append(
+                    When(
+                        field_name=search_field.get_full_name(),
+                        then=SearchRank(F('vector'), search_query)
+                    )
+                )
+
+        if query is None:
+            # None of the terms produced a tsquery, for example when they
+            # are only punctuation.
+            return search_model.get_queryset().none()
+
+        queryset = search_model.get_queryset().filter(query)
+
+        if rank_conditions:
+            rank_queryset = entries.filter(
+                object_id=OuterRef('pk')
+            ).values('object_id').annotate(
+                rank=Sum(
+                    Case(
+                        *rank_conditions, default=Value(0),
+                        output_field=FloatField()
+                    )
+                )
+            ).values('rank')
+
+            queryset = queryset.annotate(
+                search_rank=Subquery(
+                    output_field=FloatField(), queryset=rank_queryset
+                )
+            ).order_by('-search_rank', 'pk')
+
+        return queryset
+
+    def clear_search_model_index(self, search_model):
+        SearchIndexEntry = apps.get_model(
+            app_label='dynamic_search', model_name='SearchIndexEntry'
+        )
+
+        SearchIndexEntry.objects.filter(
+            search_model_name=search_model.get_full_name()
+        ).delete()
+
+    def compile_scope(self, search_model, query_string, global_and_search=False):
+        """
+        Scopes are searched separately to rank the results of each scope.
+        """
+        if self.is_database_supported():
+            raise NotImplementedError
+
+        return super().compile_scope(
+            global_and_search=global_and_search, query_string=query_string,
+            search_model=search_model
+        )
+
+    def deindex_instance(self, instance):
+        self.update_index(deindex_instance_list=(instance,))
+
+    def get_field_text(self, instance, search_field):
+        try:
+            value = ResolverPipelineModelAttribute.resolve(
+                attribute=search_field.get_full_name(), obj=instance
+            )
+        except ResolverPipelineError:
+            """Not fatal"""
+            return ''
+
+        try:
+            # Keep the values of related fields as separate words.
+            text = ' '.join(
+                force_text(s=item) for item in SearchModel.flatten_list(
+                    value=value
+                ) if item is not None
+            )
+        except TypeError:
+            """Value is not a list"""
+            text = force_text(s=value) if value is not None else ''
+
+        # PostgreSQL does not support NUL characters in text values and
+        # limits the size of text search vectors.
+        return text.replace('\x00', '')[:POSTGRESQL_SEARCH_VECTOR_MAXIMUM_LENGTH]
+
+    def get_field_tsquery(self, search_field, text):
+        """
+        Translate the search terms of a field into a tsquery expression
+        following the same term rules of the database query backend.
+        """
+        query_operation = TSQUERY_OPERATION_AND
+        result = None
+
+        for term in SearchTermCollection(text=text).terms:
+            if term.is_meta:
+                # It is a meta term, modifies the query operation
+                # and is not searched
+                if term.string == TERM_OPERATION_OR:
+                    query_operation = TSQUERY_OPERATION_OR
+            else:
+                if search_field.transformation_function:
+                    term_string = search_field.transformation_function(
+                        term_string=term.string
+                    )
+                else:
+                    term_string = term.string
+
+                term_tsquery = self.get_term_tsquery(term_string=term_string)
+
+                if term_tsquery:
+                    if term.negated:
+                        term_tsquery = '!{}'.format(term_tsquery)
+
+                    if result is None:
+                        result = term_tsquery
+                    else:
+                        result = '({}{}{})'.format(
+                            result, query_operation, term_tsquery
+                        )
+
+        return result
+
+    def index_instance(self, instance):
+        self.update_index(index_instance_list=(instance,))
+
+    def index_search_model(self, search_model):
+        """
+        Rebuild the search vectors of a search model in batches of
+        `index_batch_size` instances. Returns a dictionary with the
+        indexing statistics.
+        """
+        if not self.is_database_supported():
+            return
+
+        self.clear_search_model_index(search_model=search_model)
+
+        queryset = search_model.model._meta.default_manager.all()
+
+        count = 0
+        instances = []
+        time_start = time.time()
+
+        for instance in queryset.iterator(chunk_size=self.index_batch_size):
+            instances.append(instance)
+
+            if len(instances) == self.index_batch_size:
+                self._index_instances(
+                    instances=instances, search_model=search_model
+                )
+                count += len(instances)
+                instances = []
+
+        if instances:
+            self._index_instances(
+                instances=instances, search_model=search_model
+            )
+            count += len(instances)
+
+        elapsed = time.time() - time_start
+
+        result = {
+            'count': count, 'elapsed': elapsed,
+            'rate': count / elapsed if elapsed else 0
+        }
+
+        logger.info(
+            'Finished indexing search model: %s; %d instances in %.2f '
+            'seconds, %.2f instances/s', search_model.get_full_name(),
+            result['count'], result['elapsed'], result['rate']
+        )
+
+        return result
+
+    def search_page(
+        self, search_model, query_string, user, cursor=None,
+        global_and_search=False, page_size=None
+    ):
+        """
+        Return a page of results in relevance order. The cursor is the
+        offset of the first result of the next page. Results without a
+        rank, like those of other database managers, use the primary key
+        keyset pagination of the default implementation.
+        """
+        queryset = self.get_search_queryset(
+            global_and_search=global_and_search, query_string=query_string,
+            search_model=search_model, user=user
+        )
+
+        if 'search_rank' not in queryset.query.annotations:
+            return super().search_page(
+                cursor=cursor, global_and_search=global_and_search,
+                page_size=page_size, query_string=query_string,
+                search_model=search_model, user=user
+            )
+
+        page_size = page_size or DEFAULT_SEARCH_PAGE_SIZE
+
+        try:
+            offset = int(cursor or 0)
+        except ValueError:
+            raise DynamicSearchException(
+                'Invalid cursor `{}`.'.format(cursor)
+            )
+
+        object_list = list(queryset[offset:offset + page_size + 1])
+
+        if len(object_list) > page_size:
+            object_list = object_list[:page_size]
+            next_cursor = force_text(s=offset + page_size)
+        else:
+            next_cursor = None
+
+        return SearchResultPage(
+            cursor=cursor, next_cursor=next_cursor, object_list=object_list
+        )
+
+    def update_index(self, deindex_instance_list=(), index_instance_list=()):
+        if not self.is_database_supported():
+            return
+
+        SearchIndexEntry = apps.get_model(
+            app_label='dynamic_search', model_name='SearchIndexEntry'
+        )
+
+        for instance in deindex_instance_list:
+            try:
+                search_model = SearchModel.get_for_model(instance=instance)
+            except KeyError:
+                """Search is not configured for this instance."""
+            else:
+                SearchIndexEntry.objects.filter(
+                    object_id=instance.pk,
+                    search_model_name=search_model.get_full_name()
+                ).delete()
+
+        exclude_set = set()
+        updates = {}
+
+        for instance in index_instance_list:
+            for index_instance in self._get_index_instances(
+                instance=instance, exclude_set=exclude_set
+            ):
+                try:
+                    search_model = SearchModel.get_for_model(
+                        instance=index_instance
+                    )
+                except KeyError:
+                    """
+                    A KeyError is not fatal. It means search is not
+                    configured for this instance but we still need to
+                    check if one of its field's related models are
+                    configure for search and need to be updated.
+                    """
+                else:
+                    updates.setdefault(search_model, []).append(
+                        index_instance
+                    )
+
+        for search_model, instances in updates.items():
+            self._index_instances(
+                instances=instances, search_model=search_model
+            )
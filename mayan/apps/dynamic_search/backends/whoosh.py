@@ -1,87 +1,216 @@
 import logging
 from pathlib import Path
+import threading
+import time
 
 import whoosh
 from whoosh import qparser
 from whoosh.filedb.filestore import FileStorage
 from whoosh.index import EmptyIndexError
 
+from django.apps import apps
 from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.utils.encoding import force_text
 
+from mayan.apps.acls.classes import ModelPermission
 from mayan.apps.lock_manager.backends.base import LockingBackend
 from mayan.apps.lock_manager.exceptions import LockError
-
-from ..classes import SearchBackend, SearchField, SearchModel
+from mayan.apps.permissions import Permission
+
+from ..classes import (
+    SearchBackend, SearchField, SearchModel, SearchResultPage
+)
+from ..exceptions import DynamicSearchException
+from ..literals import (
+    DEFAULT_SEARCH_PAGE_SIZE, QUERY_PARAMETERS_RESERVED, SCOPE_OPERATOR_AND,
+    SCOPE_OPERATOR_OR
+)
 from ..settings import setting_results_limit
 
-from .literals import DJANGO_TO_WHOOSH_FIELD_MAP, WHOOSH_INDEX_DIRECTORY_NAME
+from .literals import (
+    DEFAULT_WHOOSH_INDEX_ACCESS, DEFAULT_WHOOSH_WRITER_COMMIT_INTERVAL,
+    DEFAULT_WHOOSH_WRITER_LIMITMB, DEFAULT_WHOOSH_WRITER_LOCK_TIMEOUT,
+    DEFAULT_WHOOSH_WRITER_MULTISEGMENT, DEFAULT_WHOOSH_WRITER_PROCS,
+    DJANGO_TO_WHOOSH_FIELD_MAP, WHOOSH_ACCESS_FIELD,
+    WHOOSH_INDEX_DIRECTORY_NAME
+)
 logger = logging.getLogger(name=__name__)
 
 
 class WhooshSearchBackend(SearchBackend):
+    _index_cache = {}
+    _index_cache_lock = threading.Lock()
+    _index_cache_statistics = {'hits': 0, 'misses': 0}
     _resolved_field_maps = {}
+    _search_model_schemas = {}
+    _searchers = threading.local()
+
+    @classmethod
+    def get_index_cache_statistics(cls):
+        return cls._index_cache_statistics.copy()
+
+    @staticmethod
+    def get_index_generation(index):
+        """
+        Return a token that changes every time the index is committed or
+        recreated. The TOC modification time is included because
+        recreating an index resets its generation number.
+        """
+        return (index.latest_generation(), index.last_modified())
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        self.index_access = self.kwargs.get(
+            'index_access', DEFAULT_WHOOSH_INDEX_ACCESS
+        )
         self.index_path = Path(
             self.kwargs.get(
                 'index_path', Path(settings.MEDIA_ROOT, WHOOSH_INDEX_DIRECTORY_NAME)
             )
         )
         self.index_path.mkdir(exist_ok=True)
+        self.writer_commit_interval = self.kwargs.get(
+            'writer_commit_interval', DEFAULT_WHOOSH_WRITER_COMMIT_INTERVAL
+        )
+        self.writer_limitmb = self.kwargs.get(
+            'writer_limitmb', DEFAULT_WHOOSH_WRITER_LIMITMB
+        )
+        self.writer_lock_timeout = self.kwargs.get(
+            'writer_lock_timeout', DEFAULT_WHOOSH_WRITER_LOCK_TIMEOUT
+        )
+        self.writer_multisegment = self.kwargs.get(
+            'writer_multisegment', DEFAULT_WHOOSH_WRITER_MULTISEGMENT
+        )
+        self.writer_procs = self.kwargs.get(
+            'writer_procs', DEFAULT_WHOOSH_WRITER_PROCS
+        )
 
     def _search(self, query_string, search_model, user, global_and_search=False):
-        index = self.get_index(search_model=search_model)
+        return self._search_query(
+            query=self.compile_scope(
+                global_and_search=global_and_search,
+                query_string=query_string, search_model=search_model
+            ), search_model=search_model, user=user
+        )
 
+    def _search_query(self, query, search_model, user):
         id_list = []
-        with index.searcher() as searcher:
-            search_string = []
+        searcher = self.get_searcher(search_model=search_model)
 
-            if 'q' in query_string:
-                # Emulate full field set search
-                for search_field in self.get_search_model_fields(search_model=search_model):
-                    search_string.append(
-                        '{}:({})'.format(search_field.get_full_name(), query_string['q'])
-                    )
-            else:
-                for key, value in query_string.items():
-                    if value:
-                        search_string.append(
-                            '{}:({})'.format(key, value)
-                        )
-
-            global_logic_string = ' AND ' if global_and_search else ' OR '
-            search_string = global_logic_string.join(search_string)
+        access_query = self.get_access_query(
+            search_model=search_model, user=user
+        )
 
-            logger.debug('search_string: %s', search_string)
+        if access_query:
+            query = whoosh.query.And([query, access_query])
 
-            parser = qparser.QueryParser(
-                fieldname='_', schema=index.schema
-            )
-            parser.remove_plugin_class(cls=qparser.WildcardPlugin)
-            parser.add_plugin(pin=qparser.PrefixPlugin())
-            query = parser.parse(text=search_string)
-            results = searcher.search(
-                q=query, limit=setting_results_limit.value
-            )
+        results = searcher.search(q=query, limit=setting_results_limit.value)
 
-            logger.debug('results: %s', results)
+        logger.debug('results: %s', results)
 
-            for result in results:
-                id_list.append(result['id'])
+        for result in results:
+            id_list.append(result['id'])
 
         queryset = search_model.get_queryset().filter(
             id__in=id_list
         ).distinct()
 
-        return SearchBackend.limit_queryset(queryset=queryset)
+        return queryset
 
-    def clear_search_model_index(self, search_model):
-        index = self.get_index(search_model=search_model)
+    def _update_index(self, deindex_instance_list=(), index_instance_list=()):
+        """
+        Group the updates by search model and apply them using a single
+        writer per search model.
+        """
+        exclude_set = set()
+        updates = {}
+
+        for instance in deindex_instance_list:
+            try:
+                search_model = SearchModel.get_for_model(instance=instance)
+            except KeyError:
+                """Search is not configured for this instance."""
+            else:
+                updates.setdefault(
+                    search_model, {'deindex': set(), 'index': {}}
+                )['deindex'].add(str(instance.pk))
+
+        for instance in index_instance_list:
+            for index_instance in self._get_index_instances(
+                instance=instance, exclude_set=exclude_set
+            ):
+                try:
+                    search_model = SearchModel.get_for_model(
+                        instance=index_instance
+                    )
+                except KeyError:
+                    """
+                    A KeyError is not fatal. It means search is not
+                    configured for this instance but we still need to
+                    check if one of its field's related models are
+                    configure for search and need to be updated.
+                    """
+                else:
+                    updates.setdefault(
+                        search_model, {'deindex': set(), 'index': {}}
+                    )['index'][str(index_instance.pk)] = index_instance
 
+        for search_model, update in updates.items():
+            field_map = self.get_resolved_field_map(search_model=search_model)
+            index = self.get_index(search_model=search_model)
+
+            writer = index.writer()
+            try:
+                for object_id in update['deindex'].union(update['index']):
+                    writer.delete_by_term('id', object_id)
+
+                for instance in update['index'].values():
+                    kwargs = self.get_index_document(
+                        field_map=field_map, instance=instance,
+                        search_model=search_model
+                    )
+                    try:
+                        writer.add_document(**kwargs)
+                    except Exception as exception:
+                        logger.error(
+                            'Unexpected exception while indexing object '
+                            'id: %s, search model: %s, index data: %s, raw '
+                            'data: %s, field map: %s; %s', instance.pk,
+                            search_model.get_full_name(), kwargs,
+                            instance.__dict__, field_map, exception,
+                            exc_info=True
+                        )
+                        raise
+            except Exception:
+                writer.cancel()
+                raise
+            else:
+                writer.commit()
+
+    def clear_search_model_index(self, search_model):
         # Clear the model index
         self.get_storage().create_index(
-            index.schema, indexname=search_model.get_full_name()
+            schema=self.get_search_model_schema(search_model=search_model),
+            indexname=search_model.get_full_name()
+        )
+
+    def compile_operation(self, search_model, operator, query_list):
+        if operator == SCOPE_OPERATOR_AND:
+            return whoosh.query.And(query_list)
+        elif operator == SCOPE_OPERATOR_OR:
+            return whoosh.query.Or(query_list)
+        else:
+            result = query_list[0]
+            for query in query_list[1:]:
+                result = whoosh.query.AndNot(result, query)
+
+            return result
+
+    def compile_scope(self, search_model, query_string, global_and_search=False):
+        return self.get_search_query(
+            global_and_search=global_and_search, query_string=query_string,
+            search_model=search_model
         )
 
     def deindex_instance(self, instance):
@@ -93,30 +222,107 @@ class WhooshSearchBackend(SearchBackend):
             raise
         else:
             try:
-                search_model = SearchModel.get_for_model(instance=instance)
-                index = self.get_index(search_model=search_model)
-
-                writer = index.writer()
-                writer.delete_by_term('id', str(instance.pk))
-                writer.commit()
+                self._update_index(deindex_instance_list=(instance,))
             finally:
                 lock.release()
 
-    def get_index(self, search_model):
-        storage = self.get_storage()
+    def get_access_query(self, search_model, user):
+        """
+        Return the query matching the documents the user can access via
+        the indexed ACL roles. Returns None when the results don't need to
+        be filtered.
+        """
+        Role = apps.get_model(app_label='permissions', model_name='Role')
 
-        schema = self.get_search_model_schema(search_model=search_model)
+        if not self.supports_access_filtering(search_model=search_model):
+            return None
+
+        if not user.is_authenticated:
+            return whoosh.query.NullQuery
 
         try:
-            index = storage.open_index(
-                indexname=search_model.get_full_name(), schema=schema
+            Permission.check_user_permissions(
+                permissions=(search_model.permission,), user=user
             )
-        except EmptyIndexError:
-            index = storage.create_index(
-                indexname=search_model.get_full_name(), schema=schema
+        except PermissionDenied:
+            # Roles are resolved at query time, changes to the role
+            # memberships don't require updating the index.
+            role_id_list = Role.objects.filter(
+                groups__user=user
+            ).values_list('pk', flat=True)
+
+            # Wrap the role terms to avoid altering the results ranking.
+            return whoosh.query.ConstantScoreQuery(
+                child=whoosh.query.Or(
+                    [
+                        whoosh.query.Term(
+                            fieldname=WHOOSH_ACCESS_FIELD,
+                            text=force_text(s=role_id)
+                        ) for role_id in role_id_list
+                    ]
+                )
             )
+        else:
+            # User has direct permission assignment via a role, is superuser
+            # or is staff.
+            return None
 
-        return index
+    def get_index(self, search_model):
+        return self.get_index_cache_entry(search_model=search_model)['index']
+
+    def get_index_cache_entry(self, search_model):
+        """
+        Return the cached index handle of the search model, reopening it
+        only if the index was modified since it was cached.
+        """
+        key = self.get_index_cache_key(search_model=search_model)
+
+        with self.__class__._index_cache_lock:
+            entry = self.__class__._index_cache.get(key)
+
+            if entry:
+                try:
+                    generation = self.get_index_generation(
+                        index=entry['index']
+                    )
+                except (EmptyIndexError, OSError):
+                    generation = None
+
+                if generation == entry['generation']:
+                    self.__class__._index_cache_statistics['hits'] += 1
+                    return entry
+
+            self.__class__._index_cache_statistics['misses'] += 1
+
+            index = self.open_index(search_model=search_model)
+            entry = {
+                'generation': self.get_index_generation(index=index),
+                'index': index
+            }
+            self.__class__._index_cache[key] = entry
+
+            return entry
+
+    def get_index_cache_key(self, search_model):
+        return (str(self.index_path), search_model.get_full_name())
+
+    def get_index_document(self, search_model, field_map, instance):
+        AccessControlList = apps.get_model(
+            app_label='acls', model_name='AccessControlList'
+        )
+
+        result = search_model.sieve(field_map=field_map, instance=instance)
+
+        if self.supports_access_filtering(search_model=search_model):
+            result[WHOOSH_ACCESS_FIELD] = ' '.join(
+                force_text(s=role_id) for role_id in sorted(
+                    AccessControlList.objects.get_access_role_ids(
+                        obj=instance, permission=search_model.permission
+                    )
+                )
+            )
+
+        return result
 
     def get_resolved_field_map(self, search_model):
         if search_model not in self._resolved_field_maps:
@@ -147,14 +353,93 @@ class WhooshSearchBackend(SearchBackend):
         return result
 
     def get_search_model_schema(self, search_model):
-        field_map = self.get_resolved_field_map(search_model=search_model)
-        schema_kwargs = {key: value['field'] for key, value in field_map.items()}
-        return whoosh.fields.Schema(**schema_kwargs)
+        key = (
+            search_model,
+            self.supports_access_filtering(search_model=search_model)
+        )
+
+        if key not in self._search_model_schemas:
+            field_map = self.get_resolved_field_map(search_model=search_model)
+            schema_kwargs = {
+                key: value['field'] for key, value in field_map.items()
+            }
+
+            if self.supports_access_filtering(search_model=search_model):
+                schema_kwargs[WHOOSH_ACCESS_FIELD] = whoosh.fields.KEYWORD
+
+            self._search_model_schemas[key] = whoosh.fields.Schema(
+                **schema_kwargs
+            )
+
+        return self._search_model_schemas[key]
+
+    def get_search_query(self, search_model, query_string, global_and_search=False):
+        search_string = []
+
+        if 'q' in query_string:
+            # Emulate full field set search
+            for search_field in self.get_search_model_fields(search_model=search_model):
+                search_string.append(
+                    '{}:({})'.format(search_field.get_full_name(), query_string['q'])
+                )
+        else:
+            for key, value in query_string.items():
+                if value:
+                    search_string.append(
+                        '{}:({})'.format(key, value)
+                    )
+
+        global_logic_string = ' AND ' if global_and_search else ' OR '
+        search_string = global_logic_string.join(search_string)
+
+        logger.debug('search_string: %s', search_string)
+
+        parser = qparser.QueryParser(
+            fieldname='_', schema=self.get_search_model_schema(
+                search_model=search_model
+            )
+        )
+        parser.remove_plugin_class(cls=qparser.WildcardPlugin)
+        parser.add_plugin(pin=qparser.PrefixPlugin())
+        return parser.parse(text=search_string)
+
+    def get_searcher(self, search_model):
+        """
+        Return the searcher of the search model for the current thread.
+        Searchers are not shared between threads. A thread's searcher is
+        bound to the index handle of the cache entry it was opened from
+        and is closed when the entry is replaced after an index change.
+        """
+        entry = self.get_index_cache_entry(search_model=search_model)
+        key = self.get_index_cache_key(search_model=search_model)
+
+        try:
+            searchers = WhooshSearchBackend._searchers.searchers
+        except AttributeError:
+            searchers = WhooshSearchBackend._searchers.searchers = {}
+
+        index, searcher = searchers.get(key, (None, None))
+
+        if index is not entry['index']:
+            if searcher:
+                searcher.close()
+
+            searcher = entry['index'].searcher()
+            searchers[key] = (entry['index'], searcher)
+
+        return searcher
 
     def get_storage(self):
         return FileStorage(path=self.index_path)
 
-    def index_instance(self, instance, exclude_set=None):
+    def get_writer_kwargs(self):
+        return {
+            'limitmb': self.writer_limitmb,
+            'multisegment': self.writer_multisegment,
+            'procs': self.writer_procs
+        }
+
+    def index_instance(self, instance):
         try:
             lock = LockingBackend.get_backend().acquire_lock(
                 name='dynamic_search_whoosh_index_instance'
@@ -163,86 +448,231 @@ class WhooshSearchBackend(SearchBackend):
             raise
         else:
             try:
-                # Use a private method to allow using a single lock for
-                # all recursions.
-                self._index_instance(
-                    instance=instance, exclude_set=exclude_set
-                )
+                self._update_index(index_instance_list=(instance,))
             finally:
                 lock.release()
 
-    def _index_instance(self, instance, exclude_set=None):
-        if not exclude_set:
-            exclude_set = set()
+    def index_search_model(self, search_model):
+        """
+        Rebuild the index of a search model in a single streaming pass.
+        Instances are fetched from the database in chunks and fed to a
+        bulk writer that is committed every `writer_commit_interval`
+        instances. Returns a dictionary with the indexing statistics.
+        """
+        # Clear the model index
+        index = self.get_storage().create_index(
+            schema=self.get_search_model_schema(search_model=search_model),
+            indexname=search_model.get_full_name()
+        )
 
-        # Avoid infinite recursion.
-        if instance in exclude_set:
-            return
+        field_map = self.get_resolved_field_map(search_model=search_model)
+        queryset = search_model.model._meta.default_manager.all()
 
-        exclude_set.add(instance)
+        count = 0
+        lock = None
+        writer = None
+        time_start = time.time()
 
         try:
-            search_model = SearchModel.get_for_model(instance=instance)
-        except KeyError:
-            """
-            A KeyError is not fatal. It means search is not configured
-            for this instance but we still need to check if one of its
-            field's related models are configure for search and need
-            to be updated.
-            """
-        else:
-            index = self.get_index(search_model=search_model)
+            for instance in queryset.iterator(chunk_size=self.writer_commit_interval):
+                if not writer:
+                    lock = LockingBackend.get_backend().acquire_lock(
+                        name='dynamic_search_whoosh_index_instance',
+                        timeout=self.writer_lock_timeout
+                    )
+                    writer = index.writer(**self.get_writer_kwargs())
 
-            writer = index.writer()
-            kwargs = search_model.sieve(
-                field_map=self.get_resolved_field_map(search_model=search_model), instance=instance
-            )
-            writer.delete_by_term('id', str(instance.pk))
-            try:
+                kwargs = self.get_index_document(
+                    field_map=field_map, instance=instance,
+                    search_model=search_model
+                )
                 writer.add_document(**kwargs)
+                count += 1
+
+                if count % self.writer_commit_interval == 0:
+                    writer.commit()
+                    writer = None
+                    lock.release()
+                    lock = None
+
+                    logger.info(
+                        'Indexed %d instances of search model: %s; '
+                        '%.2f instances/s', count,
+                        search_model.get_full_name(),
+                        count / (time.time() - time_start)
+                    )
+
+            if writer:
                 writer.commit()
-            except Exception as exception:
-                logger.error(
-                    'Unexpected exception while indexing object id: %s, '
-                    'search model: %s, index data: %s, raw data: %s, '
-                    'field map: %s; %s', search_model.get_full_name(),
-                    instance.pk, kwargs, instance.__dict__,
-                    self.get_resolved_field_map(search_model=search_model),
-                    exception, exc_info=True
-                )
-                raise
+                writer = None
+        except Exception:
+            if writer:
+                writer.cancel()
+            raise
+        finally:
+            if lock:
+                lock.release()
 
-        for field_class in instance._meta.get_fields():
-            # Only to recursive indexing for related models that are
-            # known to have a search configuration.
-            if field_class.related_model and field_class.related_model in SearchModel._model_search_relationships.get(instance._meta.model, ()):
-                field_instance = getattr(instance, field_class.name, None)
+        elapsed = time.time() - time_start
 
-                if field_instance:
-                    try:
-                        # Try as a many field.
-                        results = field_instance.all()
-                    except AttributeError:
-                        # Try as a one to one field.
-                        try:
-                            results = [field_instance.get()]
-                        except AttributeError:
-                            # It is neither then it must be a
-                            # foreign key.
-                            results = [field_instance]
-
-                    for instance in results:
-                        self._index_instance(
-                            instance=instance, exclude_set=exclude_set
-                        )
+        result = {
+            'count': count, 'elapsed': elapsed,
+            'rate': count / elapsed if elapsed else 0
+        }
 
-    def index_search_model(self, search_model):
-        index = self.get_index(search_model=search_model)
+        logger.info(
+            'Finished indexing search model: %s; %d instances in %.2f '
+            'seconds, %.2f instances/s', search_model.get_full_name(),
+            result['count'], result['elapsed'], result['rate']
+        )
 
-        # Clear the model index
-        self.get_storage().create_index(
-            index.schema, indexname=search_model.get_full_name()
+        return result
+
+    def open_index(self, search_model):
+        storage = self.get_storage()
+
+        schema = self.get_search_model_schema(search_model=search_model)
+
+        try:
+            index = storage.open_index(
+                indexname=search_model.get_full_name(), schema=schema
+            )
+        except EmptyIndexError:
+            index = storage.create_index(
+                indexname=search_model.get_full_name(), schema=schema
+            )
+
+        return index
+
+    def search_page(
+        self, search_model, query_string, user, cursor=None,
+        global_and_search=False, page_size=None
+    ):
+        """
+        Return a page of results in rank order. The cursor is the offset
+        of the next hit to evaluate.
+        """
+        AccessControlList = apps.get_model(
+            app_label='acls', model_name='AccessControlList'
         )
 
-        for instance in search_model.model._meta.default_manager.all():
-            self.index_instance(instance=instance)
+        query_string = query_string.copy()
+        for key in QUERY_PARAMETERS_RESERVED:
+            query_string.pop(key, None)
+
+        page_size = page_size or DEFAULT_SEARCH_PAGE_SIZE
+
+        try:
+            offset = int(cursor or 0)
+        except ValueError:
+            raise DynamicSearchException(
+                'Invalid cursor `{}`.'.format(cursor)
+            )
+
+        queryset = search_model.get_queryset()
+
+        if search_model.permission and not self.supports_access_filtering(
+            search_model=search_model
+        ):
+            queryset = AccessControlList.objects.restrict_queryset(
+                permission=search_model.permission, queryset=queryset,
+                user=user
+            )
+
+        query = self.compile_plan(
+            global_and_search=global_and_search,
+            plan=self.get_search_plan(query_string=query_string),
+            search_model=search_model
+        )
+
+        access_query = self.get_access_query(
+            search_model=search_model, user=user
+        )
+
+        if access_query:
+            query = whoosh.query.And([query, access_query])
+
+        searcher = self.get_searcher(search_model=search_model)
+
+        next_cursor = None
+        object_list = []
+
+        # Request one extra hit to know if there are more results without
+        # scoring all of them.
+        limit = offset + page_size + 1
+        results = searcher.search(q=query, limit=limit)
+
+        while True:
+            remaining = page_size - len(object_list)
+
+            if limit and offset + remaining >= limit and results.scored_length() == limit:
+                # Hits were skipped and the window is exhausted. Score all
+                # the hits once and continue from the current position
+                # instead of searching again for every skipped hit.
+                limit = None
+                results = searcher.search(q=query, limit=None)
+
+            hits = results[offset:offset + remaining]
+
+            instances = {
+                force_text(s=key): value for key, value in queryset.in_bulk(
+                    id_list=[hit['id'] for hit in hits]
+                ).items()
+            }
+
+            for hit in hits:
+                offset += 1
+                instance = instances.get(hit['id'])
+                # Hits of deleted or inaccessible instances are skipped.
+                if instance is not None:
+                    object_list.append(instance)
+
+            if results.scored_length() <= offset:
+                break
+            elif len(object_list) == page_size:
+                next_cursor = force_text(s=offset)
+                break
+
+        return SearchResultPage(
+            cursor=cursor, next_cursor=next_cursor, object_list=object_list
+        )
+
+    def supports_access_filtering(self, search_model):
+        """
+        Access filtering requires the roles with access to each instance to
+        be derivable from ACL of related models. Models using a field query
+        function or generic foreign key inheritances are filtered using the
+        access control query.
+        """
+        if not self.index_access or not search_model.permission:
+            return False
+
+        try:
+            ModelPermission.get_field_query_function(model=search_model.model)
+        except KeyError:
+            """Does not use a field query function."""
+        else:
+            return False
+
+        for entry in ModelPermission.get_inheritance_lookups(model=search_model.model):
+            if not entry['model']:
+                return False
+
+        return True
+
+    def update_index(self, deindex_instance_list=(), index_instance_list=()):
+        try:
+            lock = LockingBackend.get_backend().acquire_lock(
+                name='dynamic_search_whoosh_index_instance',
+                timeout=self.writer_lock_timeout
+            )
+        except LockError:
+            raise
+        else:
+            try:
+                self._update_index(
+                    deindex_instance_list=deindex_instance_list,
+                    index_instance_list=index_instance_list
+                )
+            finally:
+                lock.release()
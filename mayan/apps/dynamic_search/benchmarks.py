@@ -0,0 +1,401 @@
+import logging
+from pathlib import Path
+import random
+import time
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.core.files.base import ContentFile
+from django.utils.module_loading import import_string
+
+from mayan.apps.storage.utils import fs_cleanup, mkdtemp
+
+from .classes import SearchModel
+from .literals import (
+    BENCHMARK_SYLLABLES, BENCHMARK_TAG_COLOR, DEFAULT_BENCHMARK_BACKENDS,
+    DEFAULT_BENCHMARK_DOCUMENT_COUNT, DEFAULT_BENCHMARK_METADATA_COUNT,
+    DEFAULT_BENCHMARK_PAGE_COUNT, DEFAULT_BENCHMARK_QUERY_COUNT,
+    DEFAULT_BENCHMARK_SEED, DEFAULT_BENCHMARK_TAG_COUNT,
+    DEFAULT_BENCHMARK_TEXT_SIZE, DEFAULT_BENCHMARK_VOCABULARY_SIZE
+)
+
+logger = logging.getLogger(name=__name__)
+
+
+class SearchBenchmarkCorpus:
+    """
+    Reproducible synthetic corpus of documents with metadata, tags and OCR
+    text. The same seed always produces the same corpus and queries.
+    """
+    label = 'search_benchmark'
+
+    def __init__(
+        self, document_count=DEFAULT_BENCHMARK_DOCUMENT_COUNT,
+        metadata_count=DEFAULT_BENCHMARK_METADATA_COUNT,
+        page_count=DEFAULT_BENCHMARK_PAGE_COUNT, seed=DEFAULT_BENCHMARK_SEED,
+        tag_count=DEFAULT_BENCHMARK_TAG_COUNT,
+        text_size=DEFAULT_BENCHMARK_TEXT_SIZE,
+        vocabulary_size=DEFAULT_BENCHMARK_VOCABULARY_SIZE
+    ):
+        self.document_count = document_count
+        self.metadata_count = metadata_count
+        self.page_count = page_count
+        self.seed = seed
+        self.tag_count = tag_count
+        self.text_size = text_size
+
+        self.random = random.Random(seed)
+        self.vocabulary = self.get_vocabulary(size=vocabulary_size)
+        self.tag_labels = [
+            '{}_{}'.format(self.get_word(), index) for index in range(tag_count)
+        ]
+
+    def create(self):
+        Document = apps.get_model(app_label='documents', model_name='Document')
+        DocumentFile = apps.get_model(
+            app_label='documents', model_name='DocumentFile'
+        )
+        DocumentFilePage = apps.get_model(
+            app_label='documents', model_name='DocumentFilePage'
+        )
+        DocumentMetadata = apps.get_model(
+            app_label='metadata', model_name='DocumentMetadata'
+        )
+        DocumentType = apps.get_model(
+            app_label='documents', model_name='DocumentType'
+        )
+        DocumentVersion = apps.get_model(
+            app_label='documents', model_name='DocumentVersion'
+        )
+        DocumentVersionPage = apps.get_model(
+            app_label='documents', model_name='DocumentVersionPage'
+        )
+        DocumentVersionPageOCRContent = apps.get_model(
+            app_label='ocr', model_name='DocumentVersionPageOCRContent'
+        )
+        MetadataType = apps.get_model(
+            app_label='metadata', model_name='MetadataType'
+        )
+        Tag = apps.get_model(app_label='tags', model_name='Tag')
+
+        self.delete()
+
+        document_type = DocumentType.objects.create(label=self.label)
+        metadata_types = []
+        for index in range(self.metadata_count):
+            metadata_type = MetadataType.objects.create(
+                label='{}_{}'.format(self.label, index),
+                name='{}_{}'.format(self.label, index)
+            )
+            document_type.metadata.create(metadata_type=metadata_type)
+            metadata_types.append(metadata_type)
+
+        tags = [
+            Tag.objects.create(color=BENCHMARK_TAG_COLOR, label=label)
+            for label in self.tag_labels
+        ]
+
+        documents = []
+        for index in range(self.document_count):
+            document = Document.objects.create(
+                description=self.get_text(size=self.text_size // 10),
+                document_type=document_type, label='{} {}'.format(
+                    self.get_text(size=20), index
+                )
+            )
+            documents.append(document)
+
+            for metadata_type in metadata_types:
+                DocumentMetadata.objects.create(
+                    document=document, metadata_type=metadata_type,
+                    value=self.get_text(size=20)
+                )
+
+            if tags:
+                self.random.choice(tags).documents.add(document)
+
+            DocumentVersion.objects.create(document=document)
+
+        # The files are empty and the pages are created in bulk without
+        # images. Only their OCR text is used by the searches. The rows are
+        # read back after each step because not every database returns the
+        # primary keys of the objects created in bulk.
+        document_files = []
+        for document in documents:
+            document_file = DocumentFile(
+                document=document, filename=document.label
+            )
+            document_file.file.save(
+                content=ContentFile(content=b''), name=document.label,
+                save=False
+            )
+            document_files.append(document_file)
+
+        DocumentFile.objects.bulk_create(objs=document_files)
+        document_files = DocumentFile.objects.filter(
+            document__document_type=document_type
+        )
+
+        DocumentFilePage.objects.bulk_create(
+            objs=[
+                DocumentFilePage(
+                    document_file=document_file, page_number=page_number
+                ) for document_file in document_files
+                for page_number in range(1, self.page_count + 1)
+            ]
+        )
+
+        document_versions = {
+            document_version.document_id: document_version
+            for document_version in DocumentVersion.objects.filter(
+                document__document_type=document_type
+            )
+        }
+        content_type = ContentType.objects.get_for_model(
+            model=DocumentFilePage
+        )
+
+        DocumentVersionPage.objects.bulk_create(
+            objs=[
+                DocumentVersionPage(
+                    content_type=content_type,
+                    document_version=document_versions[
+                        document_file_page.document_file.document_id
+                    ], object_id=document_file_page.pk,
+                    page_number=document_file_page.page_number
+                ) for document_file_page in DocumentFilePage.objects.filter(
+                    document_file__document__document_type=document_type
+                ).select_related('document_file').order_by('pk')
+            ]
+        )
+
+        DocumentVersionPageOCRContent.objects.bulk_create(
+            objs=[
+                DocumentVersionPageOCRContent(
+                    content=self.get_text(size=self.text_size),
+                    document_version_page=document_version_page
+                ) for document_version_page in DocumentVersionPage.objects.filter(
+                    document_version__document__document_type=document_type
+                ).order_by('pk')
+            ]
+        )
+
+    def delete(self):
+        DocumentType = apps.get_model(
+            app_label='documents', model_name='DocumentType'
+        )
+        MetadataType = apps.get_model(
+            app_label='metadata', model_name='MetadataType'
+        )
+        Tag = apps.get_model(app_label='tags', model_name='Tag')
+
+        # Delete each document type instance to remove the stored files of
+        # the documents.
+        for document_type in DocumentType.objects.filter(label=self.label):
+            document_type.delete()
+
+        MetadataType.objects.filter(
+            name__startswith='{}_'.format(self.label)
+        ).delete()
+        Tag.objects.filter(label__in=self.tag_labels).delete()
+
+    def get_external_document_count(self):
+        """
+        Return the number of documents that are not part of the corpus.
+        Indexing replaces the search index of the installation, the
+        benchmark must only run on a database holding just the corpus.
+        """
+        Document = apps.get_model(app_label='documents', model_name='Document')
+
+        return Document.objects.exclude(
+            document_type__label=self.label
+        ).count()
+
+    def get_queries(self, count):
+        """
+        Return a list of query types, query strings and global AND flags.
+        The queries are a mix of simple, advanced and scoped searches.
+        """
+        result = []
+
+        for index in range(count):
+            query_type = ('simple', 'advanced', 'scoped')[index % 3]
+
+            if query_type == 'simple':
+                query_string = {'q': self.get_word()}
+                global_and_search = False
+            elif query_type == 'advanced':
+                query_string = {
+                    'label': self.get_word(),
+                    'versions__version_pages__ocr_content__content': self.get_word()
+                }
+                global_and_search = self.random.choice((False, True))
+            else:
+                query_string = {
+                    '__0_metadata__value': self.get_word(),
+                    '__1_tags__label': self.random.choice(
+                        self.tag_labels or ('',)
+                    ),
+                    '__operator_0_1': self.random.choice(('AND', 'OR')) + '_2',
+                    '__result': '2'
+                }
+                global_and_search = False
+
+            result.append((query_type, query_string, global_and_search))
+
+        return result
+
+    def get_text(self, size):
+        words = []
+        length = 0
+
+        while length < size:
+            word = self.get_word()
+            words.append(word)
+            length += len(word) + 1
+
+        return ' '.join(words)
+
+    def get_vocabulary(self, size):
+        result = set()
+
+        while len(result) < size:
+            result.add(
+                ''.join(
+                    self.random.choice(BENCHMARK_SYLLABLES) for _ in range(
+                        self.random.randint(2, 4)
+                    )
+                )
+            )
+
+        return sorted(result)
+
+    def get_word(self):
+        # Skewed distribution to have frequent and rare terms.
+        return self.vocabulary[
+            int(len(self.vocabulary) * self.random.random() ** 2)
+        ]
+
+
+class SearchBenchmark:
+    """
+    Index the corpus with each backend and replay the corpus queries,
+    collecting the indexing throughput, index size and query latencies.
+    """
+    @staticmethod
+    def get_directory_size(path):
+        return sum(
+            entry.stat().st_size for entry in Path(path).glob('**/*')
+            if entry.is_file()
+        )
+
+    @staticmethod
+    def get_percentile(values, percentile):
+        """
+        Nearest rank percentile of a list of values.
+        """
+        if not values:
+            return None
+
+        values = sorted(values)
+        index = max(0, int(round(percentile / 100.0 * len(values))) - 1)
+        return values[min(index, len(values) - 1)]
+
+    def __init__(
+        self, corpus, user, backend_paths=DEFAULT_BENCHMARK_BACKENDS,
+        query_count=DEFAULT_BENCHMARK_QUERY_COUNT
+    ):
+        self.backend_paths = backend_paths
+        self.corpus = corpus
+        self.query_count = query_count
+        self.user = user
+
+    def run(self, create_corpus=True):
+        if create_corpus:
+            time_start = time.time()
+            self.corpus.create()
+            logger.info(
+                'Created benchmark corpus in %.2f seconds',
+                time.time() - time_start
+            )
+
+        result = {
+            'backends': {},
+            'corpus': {
+                'document_count': self.corpus.document_count,
+                'metadata_count': self.corpus.metadata_count,
+                'page_count': self.corpus.page_count,
+                'seed': self.corpus.seed,
+                'tag_count': self.corpus.tag_count,
+                'text_size': self.corpus.text_size
+            },
+            'query_count': self.query_count
+        }
+
+        for backend_path in self.backend_paths:
+            result['backends'][backend_path] = self.run_backend(
+                backend_path=backend_path
+            )
+
+        return result
+
+    def run_backend(self, backend_path):
+        search_model = SearchModel.get(name='documents.DocumentSearchResult')
+        index_path = mkdtemp()
+
+        try:
+            # Backends ignore the arguments they don't use. Index based
+            # backends use a temporary index to leave the installation
+            # index untouched.
+            search_backend = import_string(dotted_path=backend_path)(
+                index_path=index_path
+            )
+
+            time_start = time.time()
+            statistics = search_backend.index_search_model(
+                search_model=search_model
+            )
+            elapsed = time.time() - time_start
+
+            if hasattr(search_backend, 'index_path'):
+                index_size = self.get_directory_size(path=index_path)
+            else:
+                index_size = None
+
+            latencies = {}
+            # Use a fresh random state for each backend to replay the
+            # same queries.
+            self.corpus.random.seed(self.corpus.seed)
+
+            for query_type, query_string, global_and_search in self.corpus.get_queries(count=self.query_count):
+                time_start = time.perf_counter()
+                list(
+                    search_backend.search(
+                        global_and_search=global_and_search,
+                        query_string=query_string, search_model=search_model,
+                        user=self.user
+                    )
+                )
+                latencies.setdefault(query_type, []).append(
+                    (time.perf_counter() - time_start) * 1000
+                )
+        finally:
+            fs_cleanup(filename=index_path)
+
+        return {
+            'index_size': index_size,
+            # Backends that don't index return no statistics.
+            'indexing': {
+                'count': statistics['count'] if statistics else None,
+                'elapsed': elapsed,
+                'rate': statistics['rate'] if statistics else None
+            },
+            'queries': {
+                query_type: {
+                    'count': len(values),
+                    'p50': self.get_percentile(percentile=50, values=values),
+                    'p95': self.get_percentile(percentile=95, values=values),
+                    'p99': self.get_percentile(percentile=99, values=values)
+                } for query_type, values in latencies.items()
+            }
+        }
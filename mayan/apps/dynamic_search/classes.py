@@ -2,12 +2,14 @@ from collections import Iterable
 import logging
 
 from django.apps import apps
+from django.db.models import Q
 from django.db.models.signals import post_save, pre_delete
 from django.utils.encoding import force_text
 from django.utils.functional import cached_property
 from django.utils.module_loading import import_string
 from django.utils.translation import ugettext as _
 
+from mayan.apps.acls.classes import ModelPermission
 from mayan.apps.common.class_mixins import AppsModuleLoaderMixin
 from mayan.apps.common.exceptions import ResolverPipelineError
 from mayan.apps.common.utils import (
@@ -17,8 +19,9 @@ from mayan.apps.views.literals import LIST_MODE_CHOICE_LIST
 
 from .exceptions import DynamicSearchException
 from .literals import (
-    DEFAULT_SCOPE_OPERATOR, DELIMITER, SCOPE_DELIMITER,
-    SCOPE_OPERATOR_CHOICES
+    DEFAULT_SCOPE_OPERATOR, DEFAULT_SEARCH_PAGE_SIZE, DELIMITER,
+    QUERY_PARAMETERS_RESERVED, SCOPE_DELIMITER, SCOPE_OPERATOR_CHOICES,
+    SCOPE_OPERATOR_NOT
 )
 from .settings import (
     setting_backend, setting_backend_arguments,
@@ -28,11 +31,24 @@ logger = logging.getLogger(name=__name__)
 
 
 class SearchBackend:
+    _instances = {}
+
     @staticmethod
     def get_instance():
-        return import_string(dotted_path=setting_backend.value)(
-            **setting_backend_arguments.value
-        )
+        """
+        Return the configured backend. Instances are cached per process
+        and recreated only when the backend settings change.
+        """
+        key = (setting_backend.value, repr(setting_backend_arguments.value))
+
+        try:
+            return SearchBackend._instances[key]
+        except KeyError:
+            instance = import_string(dotted_path=setting_backend.value)(
+                **setting_backend_arguments.value
+            )
+            SearchBackend._instances[key] = instance
+            return instance
 
     @staticmethod
     def limit_queryset(queryset):
@@ -42,31 +58,123 @@ class SearchBackend:
     def __init__(self, **kwargs):
         self.kwargs = kwargs
 
+    def _get_index_instances(self, instance, exclude_set):
+        """
+        Yield the instance and the instances of its related models that
+        are known to have a search configuration, recursively.
+        """
+        # Avoid infinite recursion.
+        if instance in exclude_set:
+            return
+
+        exclude_set.add(instance)
+
+        yield instance
+
+        for field_class in instance._meta.get_fields():
+            # Only to recursive indexing for related models that are
+            # known to have a search configuration.
+            if field_class.related_model and field_class.related_model in SearchModel._model_search_relationships.get(instance._meta.model, ()):
+                field_instance = getattr(instance, field_class.name, None)
+
+                if field_instance:
+                    try:
+                        # Try as a many field.
+                        results = field_instance.all()
+                    except AttributeError:
+                        # Try as a one to one field.
+                        try:
+                            results = [field_instance.get()]
+                        except AttributeError:
+                            # It is neither then it must be a
+                            # foreign key.
+                            results = [field_instance]
+
+                    for result in results:
+                        yield from self._get_index_instances(
+                            instance=result, exclude_set=exclude_set
+                        )
+
     def _search(self, global_and_search, search_model, query_string, user):
         raise NotImplementedError
 
+    def _search_query(self, query, search_model, user):
+        """
+        Return the queryset of the results of a compiled search plan.
+        """
+        raise NotImplementedError
+
+    def compile_operation(self, search_model, operator, query_list):
+        raise NotImplementedError
+
+    def compile_plan(self, plan, search_model, global_and_search=False):
+        """
+        Compile the whole search plan into a single backend query.
+        """
+        if isinstance(plan, SearchScope):
+            return self.compile_scope(
+                global_and_search=global_and_search,
+                query_string=plan.query_string, search_model=search_model
+            )
+        else:
+            return self.compile_operation(
+                operator=plan.operator, query_list=[
+                    self.compile_plan(
+                        global_and_search=global_and_search, plan=source,
+                        search_model=search_model
+                    ) for source in plan.sources
+                ], search_model=search_model
+            )
+
+    def compile_scope(self, search_model, query_string, global_and_search=False):
+        raise NotImplementedError
+
     def deindex_instance(self, instance):
         raise NotImplementedError
 
+    def explain(
+        self, search_model, query_string, global_and_search=False
+    ):
+        """
+        Return a text representation of the search plan and of the
+        compiled backend query.
+        """
+        query_string = query_string.copy()
+        for key in QUERY_PARAMETERS_RESERVED:
+            query_string.pop(key, None)
+
+        plan = self.get_search_plan(query_string=query_string)
+
+        try:
+            query = self.compile_plan(
+                global_and_search=global_and_search, plan=plan,
+                search_model=search_model
+            )
+        except NotImplementedError:
+            query_text = 'Scopes are searched separately and merged.'
+        else:
+            query_text = self.get_query_text(
+                query=query, search_model=search_model
+            )
+
+        return 'Plan:\n{}\nQuery:\n{}'.format(plan, query_text)
+
     def index_instance(self, instance):
         raise NotImplementedError
 
-    def search(
-        self, search_model, query_string, user, global_and_search=False
-    ):
-        AccessControlList = apps.get_model(
-            app_label='acls', model_name='AccessControlList'
-        )
+    def index_search_model(self, search_model):
+        raise NotImplementedError
 
-        # Clean up the query_string
-        # The original query_string is immutable, create a new
-        # mutable copy
-        query_string = query_string.copy()
-        query_string.pop('_match_all', None)
+    def get_query_text(self, query, search_model):
+        return force_text(s=query)
 
-        # Turn scoped query dictionary into a series of unscoped queries.
+    def get_search_plan(self, query_string):
+        """
+        Turn the scoped query dictionary into a tree of scopes and scope
+        operations.
+        """
         scopes = {}
-        operators = []
+        operations = {}
 
         operator_marker = '{}operator'.format(SCOPE_DELIMITER)
         result_marker = '{}result'.format(SCOPE_DELIMITER)
@@ -83,13 +191,12 @@ class SearchBackend:
 
                 operator, result = value.split(DELIMITER)
 
-                operators.append(
-                    {
-                        'scope_sources': scope_sources,
-                        'function': SCOPE_OPERATOR_CHOICES[operator],
-                        'result': result
-                    }
-                )
+                if operator not in SCOPE_OPERATOR_CHOICES:
+                    raise DynamicSearchException(
+                        'Scope operator `{}` not found.'.format(operator)
+                    )
+
+                operations.setdefault(result, (operator, scope_sources))
             elif key.startswith(result_marker):
                 result = value
             else:
@@ -103,29 +210,67 @@ class SearchBackend:
                     unscoped_key = key
                     unscoped_entry = True
 
-                scopes.setdefault(scope_index, {'query': {}})
-                scopes[scope_index]['query'][unscoped_key] = value
+                scopes.setdefault(scope_index, {})
+                scopes[scope_index][unscoped_key] = value
 
         if unscoped_entry:
-            operators.append(
-                {
-                    'scope_sources': ['0', '0'],
-                    'function': SCOPE_OPERATOR_CHOICES[DEFAULT_SCOPE_OPERATOR],
-                    'result': '0'
-                }
+            operations.setdefault(
+                '0', (DEFAULT_SCOPE_OPERATOR, ['0', '0'])
             )
 
-        # Recursive call to the backend's search using queries as unscoped
-        # and then merge then using the corresponding operator.
-        queryset = search_model.model._meta.default_manager.none()
+        def get_node(name, path):
+            if name in operations and name not in path:
+                operator, sources = operations[name]
+                nodes = [
+                    get_node(name=source, path=path + (name,))
+                    for source in sources
+                ]
+
+                # AND and OR of the same source is the source itself.
+                if operator != SCOPE_OPERATOR_NOT and len(set(sources)) == 1:
+                    return nodes[0]
+
+                return SearchScopeOperation(operator=operator, sources=nodes)
+            elif name in scopes:
+                return SearchScope(name=name, query_string=scopes[name])
+            elif path:
+                raise DynamicSearchException(
+                    'Scope `{}` not found.'.format(name)
+                )
+            else:
+                raise DynamicSearchException(
+                    'Result scope `{}` not found.'.format(name)
+                )
+
+        return get_node(name=result, path=())
+
+    def get_search_queryset(
+        self, search_model, query_string, user, global_and_search=False
+    ):
+        """
+        Return the access filtered queryset of all the search results,
+        without applying the results limit.
+        """
+        AccessControlList = apps.get_model(
+            app_label='acls', model_name='AccessControlList'
+        )
+
+        # Clean up the query_string
+        # The original query_string is immutable, create a new
+        # mutable copy
+        query_string = query_string.copy()
+        for key in QUERY_PARAMETERS_RESERVED:
+            query_string.pop(key, None)
 
-        queryset = self.solve_scope(
-            global_and_search=global_and_search, operators=operators,
-            result=result, search_model=search_model, scopes=scopes,
-            user=user
+        queryset = self.solve_plan(
+            global_and_search=global_and_search,
+            plan=self.get_search_plan(query_string=query_string),
+            search_model=search_model, user=user
         )
 
-        if search_model.permission:
+        if search_model.permission and not self.supports_access_filtering(
+            search_model=search_model
+        ):
             queryset = AccessControlList.objects.restrict_queryset(
                 permission=search_model.permission, queryset=queryset,
                 user=user
@@ -133,38 +278,167 @@ class SearchBackend:
 
         return queryset
 
-    def solve_scope(self, global_and_search, search_model, user, result, scopes, operators):
-        queryset = search_model.model._meta.default_manager.none()
+    def search(
+        self, search_model, query_string, user, global_and_search=False
+    ):
+        return SearchBackend.limit_queryset(
+            queryset=self.get_search_queryset(
+                global_and_search=global_and_search,
+                query_string=query_string, search_model=search_model,
+                user=user
+            )
+        )
 
-        for operator in operators:
-            if result == operator['result']:
+    def search_page(
+        self, search_model, query_string, user, cursor=None,
+        global_and_search=False, page_size=None
+    ):
+        """
+        Return a page of search results and the cursor of the next page.
+        The default implementation uses keyset pagination on the primary
+        key of the results.
+        """
+        page_size = page_size or DEFAULT_SEARCH_PAGE_SIZE
 
-                for scope_index in operator['scope_sources']:
-                    try:
-                        query_string = scopes[scope_index]['query']
-                    except KeyError:
-                        raise DynamicSearchException(
-                            'Scope `{}` not found.'.format(scope_index)
-                        )
+        queryset = self.get_search_queryset(
+            global_and_search=global_and_search, query_string=query_string,
+            search_model=search_model, user=user
+        ).order_by('pk')
 
-                    results = self._search(
-                        global_and_search=global_and_search,
-                        search_model=search_model, query_string=query_string,
-                        user=user
-                    )
+        if cursor:
+            try:
+                queryset = queryset.filter(pk__gt=int(cursor))
+            except ValueError:
+                raise DynamicSearchException(
+                    'Invalid cursor `{}`.'.format(cursor)
+                )
 
-                    if not queryset:
-                        queryset = results
-                    else:
-                        queryset = operator['function'](queryset, results)
+        object_list = list(queryset[:page_size + 1])
+
+        if len(object_list) > page_size:
+            object_list = object_list[:page_size]
+            next_cursor = force_text(s=object_list[-1].pk)
+        else:
+            next_cursor = None
+
+        return SearchResultPage(
+            cursor=cursor, next_cursor=next_cursor, object_list=object_list
+        )
+
+    def solve_plan(self, global_and_search, plan, search_model, user):
+        """
+        Solve the search plan using a single backend query. Backends that
+        can't compile search plans search each scope and merge the
+        results.
+        """
+        try:
+            query = self.compile_plan(
+                global_and_search=global_and_search, plan=plan,
+                search_model=search_model
+            )
+        except NotImplementedError:
+            return self.solve_plan_node(
+                global_and_search=global_and_search, node=plan,
+                search_model=search_model, user=user
+            )
+        else:
+            return self._search_query(
+                query=query, search_model=search_model, user=user
+            )
+
+    def solve_plan_node(self, global_and_search, node, search_model, user):
+        if isinstance(node, SearchScope):
+            return self._search(
+                global_and_search=global_and_search,
+                query_string=node.query_string, search_model=search_model,
+                user=user
+            )
+
+        querysets = [
+            self.solve_plan_node(
+                global_and_search=global_and_search, node=source,
+                search_model=search_model, user=user
+            ) for source in node.sources
+        ]
+
+        queryset = querysets[0]
+
+        for results in querysets[1:]:
+            if node.operator == SCOPE_OPERATOR_NOT:
+                queryset = queryset.exclude(pk__in=results.values('pk'))
+            else:
+                queryset = SCOPE_OPERATOR_CHOICES[node.operator](
+                    queryset, results
+                )
+
+        return queryset
+
+    def supports_access_filtering(self, search_model):
+        """
+        Return True if the backend filters the results of the search model
+        by access itself, avoiding the access control query.
+        """
+        return False
+
+    def update_index(self, deindex_instance_list=(), index_instance_list=()):
+        """
+        Apply several index updates at once. Backends that support bulk
+        updates should override this method.
+        """
+        for instance in deindex_instance_list:
+            self.deindex_instance(instance=instance)
+
+        for instance in index_instance_list:
+            self.index_instance(instance=instance)
 
-                return queryset
 
-        raise DynamicSearchException(
-            'Result scope `{}` not found.'.format(result)
+class SearchScope:
+    def __init__(self, name, query_string):
+        self.name = name
+        self.query_string = query_string
+
+    def __str__(self):
+        return 'Scope {}: {}'.format(
+            self.name, ', '.join(
+                '{}={}'.format(key, value) for key, value in sorted(
+                    self.query_string.items()
+                )
+            )
         )
 
 
+class SearchScopeOperation:
+    def __init__(self, operator, sources):
+        self.operator = operator
+        self.sources = sources
+
+    def __str__(self):
+        lines = [self.operator]
+        for source in self.sources:
+            lines.extend(
+                '  {}'.format(line) for line in force_text(s=source).splitlines()
+            )
+
+        return '\n'.join(lines)
+
+
+class SearchResultPage:
+    def __init__(self, object_list, cursor=None, next_cursor=None):
+        self.cursor = cursor
+        self.next_cursor = next_cursor
+        self.object_list = object_list
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+
 class SearchField:
     """
     Search for terms in fields that directly belong to the parent SearchModel
@@ -344,6 +618,28 @@ class SearchModel(AppsModuleLoaderMixin):
 
         self.__class__._registry['{}.{}'.format(app_label, model_name)] = self
 
+    def get_access_dependents(self, obj):
+        """
+        Return the queryset of the instances of the search model that are
+        the object or that inherit their access from the object's ACLs.
+        """
+        model = obj._meta.concrete_model
+        query = Q()
+
+        if self.model._meta.concrete_model == model:
+            query |= Q(pk=obj.pk)
+
+        for entry in ModelPermission.get_inheritance_lookups(model=self.model):
+            if entry['model'] and entry['model']._meta.concrete_model == model:
+                query |= Q(**{entry['field_lookup']: obj})
+
+        queryset = self.model._meta.default_manager.all()
+
+        if query:
+            return queryset.filter(query).distinct()
+        else:
+            return queryset.none()
+
     def get_fields_simple_list(self):
         """
         Returns a list of the fields for the SearchModel
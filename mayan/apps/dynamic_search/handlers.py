@@ -1,29 +1,95 @@
-from .tasks import task_deindex_instance, task_index_instance
+from django.apps import apps
 
+from .classes import SearchBackend, SearchModel
+from .literals import (
+    INDEXING_QUEUE_OPERATION_DEINDEX, INDEXING_QUEUE_OPERATION_INDEX
+)
+from .settings import setting_indexing_queue_enable
+from .tasks import (
+    task_deindex_instance, task_index_access_object, task_index_instance
+)
 
-def handler_factory_deindex_instance(search_model):
 
-    def handler_deindex_instance(sender, **kwargs):
-        instance = kwargs['instance']
+def _index_access_acl_list(acl_list):
+    search_backend = SearchBackend.get_instance()
+
+    for search_model in SearchModel.all():
+        if search_backend.supports_access_filtering(search_model=search_model):
+            break
+    else:
+        # Access is not indexed for any search model.
+        return
 
-        task_deindex_instance.apply_async(
+    for acl in acl_list:
+        task_index_access_object.apply_async(
             kwargs={
-                'app_label': instance._meta.app_label,
-                'model_name': instance._meta.model_name,
-                'object_id': instance.pk
+                'app_label': acl.content_type.app_label,
+                'model_name': acl.content_type.model,
+                'object_id': acl.object_id
             }
         )
 
+
+def handler_acl_deleted(sender, **kwargs):
+    _index_access_acl_list(acl_list=(kwargs['instance'],))
+
+
+def handler_acl_permissions_changed(sender, **kwargs):
+    AccessControlList = apps.get_model(
+        app_label='acls', model_name='AccessControlList'
+    )
+
+    if kwargs['action'] in ('post_add', 'post_clear', 'post_remove'):
+        if kwargs['reverse']:
+            # Changed from the permission side, pk_set holds the ACL ids.
+            acl_list = AccessControlList.objects.filter(
+                pk__in=kwargs['pk_set'] or ()
+            )
+        else:
+            acl_list = (kwargs['instance'],)
+
+        _index_access_acl_list(acl_list=acl_list)
+
+
+def handler_factory_deindex_instance(search_model):
+
+    def handler_deindex_instance(sender, **kwargs):
+        instance = kwargs['instance']
+
+        if setting_indexing_queue_enable.value:
+            IndexingQueueEntry = apps.get_model(
+                app_label='dynamic_search', model_name='IndexingQueueEntry'
+            )
+            IndexingQueueEntry.objects.enqueue(
+                instance=instance, operation=INDEXING_QUEUE_OPERATION_DEINDEX
+            )
+        else:
+            task_deindex_instance.apply_async(
+                kwargs={
+                    'app_label': instance._meta.app_label,
+                    'model_name': instance._meta.model_name,
+                    'object_id': instance.pk
+                }
+            )
+
     return handler_deindex_instance
 
 
 def handler_index_instance(sender, **kwargs):
     instance = kwargs['instance']
 
-    task_index_instance.apply_async(
-        kwargs={
-            'app_label': instance._meta.app_label,
-            'model_name': instance._meta.model_name,
-            'object_id': instance.pk
-        }
-    )
+    if setting_indexing_queue_enable.value:
+        IndexingQueueEntry = apps.get_model(
+            app_label='dynamic_search', model_name='IndexingQueueEntry'
+        )
+        IndexingQueueEntry.objects.enqueue(
+            instance=instance, operation=INDEXING_QUEUE_OPERATION_INDEX
+        )
+    else:
+        task_index_instance.apply_async(
+            kwargs={
+                'app_label': instance._meta.app_label,
+                'model_name': instance._meta.model_name,
+                'object_id': instance.pk
+            }
+        )
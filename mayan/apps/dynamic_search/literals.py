@@ -1,14 +1,54 @@
 import operator
 
+BENCHMARK_SYLLABLES = (
+    'ba', 'da', 'ka', 'la', 'ma', 'na', 'pa', 'ra', 'sa', 'ta', 'be', 'de',
+    'ke', 'le', 'me', 'ne', 'pe', 're', 'se', 'te', 'bi', 'di', 'ki', 'li',
+    'mi', 'ni', 'pi', 'ri', 'si', 'ti', 'bo', 'do', 'ko', 'lo', 'mo', 'no',
+    'po', 'ro', 'so', 'to', 'bu', 'du', 'ku', 'lu', 'mu', 'nu', 'pu', 'ru',
+    'su', 'tu'
+)
+BENCHMARK_TAG_COLOR = '#7e7e7e'
+
+DEFAULT_BENCHMARK_BACKENDS = (
+    'mayan.apps.dynamic_search.backends.django.DjangoSearchBackend',
+    'mayan.apps.dynamic_search.backends.whoosh.WhooshSearchBackend'
+)
+DEFAULT_BENCHMARK_DOCUMENT_COUNT = 1000
+DEFAULT_BENCHMARK_METADATA_COUNT = 2
+DEFAULT_BENCHMARK_PAGE_COUNT = 2
+DEFAULT_BENCHMARK_QUERY_COUNT = 300
+DEFAULT_BENCHMARK_SEED = 0
+DEFAULT_BENCHMARK_TAG_COUNT = 20
+DEFAULT_BENCHMARK_TEXT_SIZE = 2000
+DEFAULT_BENCHMARK_VOCABULARY_SIZE = 5000
 DEFAULT_RESULTS_LIMIT = 100
 DEFAULT_SEARCH_BACKEND = 'mayan.apps.dynamic_search.backends.django.DjangoSearchBackend'
 DEFAULT_SEARCH_BACKEND_ARGUMENTS = {}
 DEFAULT_SEARCH_DISABLE_SIMPLE_SEARCH = False
+DEFAULT_SEARCH_INDEXING_QUEUE_BATCH_SIZE = 1000
+DEFAULT_SEARCH_INDEXING_QUEUE_ENABLE = False
 DEFAULT_SEARCH_MATCH_ALL_DEFAULT_VALUE = 'false'
+DEFAULT_SEARCH_PAGE_SIZE = 10
 DEFAULT_SEARCH_RESULTS_LIMIT = 100
 
 DELIMITER = '_'
 
+INDEX_ACCESS_BATCH_SIZE = 1000
+
+INDEXING_QUEUE_FLUSH_BATCH_COUNT = 10
+INDEXING_QUEUE_FLUSH_INTERVAL = 10
+INDEXING_QUEUE_FLUSH_LOCK_EXPIRE = 300
+INDEXING_QUEUE_OPERATION_DEINDEX = 2
+INDEXING_QUEUE_OPERATION_INDEX = 1
+
+QUERY_PARAMETER_CURSOR = '_cursor'
+QUERY_PARAMETER_MATCH_ALL = '_match_all'
+QUERY_PARAMETER_PAGE_SIZE = '_page_size'
+QUERY_PARAMETERS_RESERVED = (
+    QUERY_PARAMETER_CURSOR, QUERY_PARAMETER_MATCH_ALL,
+    QUERY_PARAMETER_PAGE_SIZE
+)
+
 SEARCH_MODEL_NAME_KWARG = 'search_model_name'
 TASK_RETRY_DELAY = 5
 
@@ -0,0 +1,137 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core import management
+from django.db import transaction
+from django.utils.translation import ugettext_lazy as _
+
+from ...benchmarks import SearchBenchmark, SearchBenchmarkCorpus
+from ...literals import (
+    DEFAULT_BENCHMARK_BACKENDS, DEFAULT_BENCHMARK_DOCUMENT_COUNT,
+    DEFAULT_BENCHMARK_METADATA_COUNT, DEFAULT_BENCHMARK_PAGE_COUNT,
+    DEFAULT_BENCHMARK_QUERY_COUNT, DEFAULT_BENCHMARK_SEED,
+    DEFAULT_BENCHMARK_TAG_COUNT, DEFAULT_BENCHMARK_TEXT_SIZE
+)
+
+
+class Command(management.BaseCommand):
+    help = (
+        'Generate a synthetic document corpus, index it with the search '
+        'backends and report the indexing and query performance as JSON. '
+        'The corpus is created in the configured database and the changes '
+        'are rolled back afterwards. Use a disposable installation.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--backend', action='append', dest='backend_paths',
+            help=_(
+                'Dotted path of a search backend to benchmark. Can be '
+                'repeated. Defaults to the database and Whoosh backends.'
+            )
+        )
+        parser.add_argument(
+            '--documents', action='store', dest='document_count',
+            default=DEFAULT_BENCHMARK_DOCUMENT_COUNT, type=int,
+            help=_('Number of documents of the corpus.')
+        )
+        parser.add_argument(
+            '--force', action='store_true', dest='force',
+            help=_(
+                'Run even if the database has documents that are not part '
+                'of the corpus. Indexing the corpus replaces the search '
+                'index of the installation.'
+            )
+        )
+        parser.add_argument(
+            '--keep-corpus', action='store_true', dest='keep_corpus',
+            help=_('Do not delete the corpus after the benchmark.')
+        )
+        parser.add_argument(
+            '--metadata', action='store', dest='metadata_count',
+            default=DEFAULT_BENCHMARK_METADATA_COUNT, type=int,
+            help=_('Number of metadata entries of each document.')
+        )
+        parser.add_argument(
+            '--output', action='store', dest='output',
+            help=_('Path of the file where to save the JSON report.')
+        )
+        parser.add_argument(
+            '--pages', action='store', dest='page_count',
+            default=DEFAULT_BENCHMARK_PAGE_COUNT, type=int,
+            help=_('Number of OCR pages of each document.')
+        )
+        parser.add_argument(
+            '--queries', action='store', dest='query_count',
+            default=DEFAULT_BENCHMARK_QUERY_COUNT, type=int,
+            help=_('Number of queries to replay for each backend.')
+        )
+        parser.add_argument(
+            '--seed', action='store', dest='seed',
+            default=DEFAULT_BENCHMARK_SEED, type=int,
+            help=_('Seed of the corpus and queries generator.')
+        )
+        parser.add_argument(
+            '--tags', action='store', dest='tag_count',
+            default=DEFAULT_BENCHMARK_TAG_COUNT, type=int,
+            help=_('Number of tags of the corpus.')
+        )
+        parser.add_argument(
+            '--text-size', action='store', dest='text_size',
+            default=DEFAULT_BENCHMARK_TEXT_SIZE, type=int,
+            help=_('Size in characters of the OCR text of each page.')
+        )
+        parser.add_argument(
+            '--user', action='store', dest='username',
+            help=_(
+                'Username of the user performing the searches. Defaults to '
+                'the first superuser.'
+            )
+        )
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+
+        if options['username']:
+            user = User.objects.filter(username=options['username']).first()
+        else:
+            user = User.objects.filter(is_superuser=True).first()
+
+        if not user:
+            raise management.CommandError('No user found to perform the searches.')
+
+        corpus = SearchBenchmarkCorpus(
+            document_count=options['document_count'],
+            metadata_count=options['metadata_count'],
+            page_count=options['page_count'], seed=options['seed'],
+            tag_count=options['tag_count'], text_size=options['text_size']
+        )
+        benchmark = SearchBenchmark(
+            backend_paths=options['backend_paths'] or DEFAULT_BENCHMARK_BACKENDS,
+            corpus=corpus, query_count=options['query_count'], user=user
+        )
+
+        if not options['force'] and corpus.get_external_document_count():
+            raise management.CommandError(
+                'The database has documents that are not part of the '
+                'benchmark corpus. Use a disposable installation or pass '
+                '--force.'
+            )
+
+        with transaction.atomic():
+            try:
+                result = benchmark.run()
+            finally:
+                if not options['keep_corpus']:
+                    # Delete the stored files of the corpus and discard
+                    # every database change made while indexing it.
+                    corpus.delete()
+                    transaction.set_rollback(rollback=True)
+
+        report = json.dumps(obj=result, indent=4, sort_keys=True)
+
+        if options['output']:
+            with open(file=options['output'], mode='w') as file_object:
+                file_object.write(report)
+        else:
+            self.stdout.write(report)
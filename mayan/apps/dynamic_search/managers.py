@@ -0,0 +1,104 @@
+import logging
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError, models, transaction
+from django.utils.timezone import now
+
+from .classes import SearchBackend
+from .literals import (
+    INDEXING_QUEUE_OPERATION_DEINDEX, INDEXING_QUEUE_OPERATION_INDEX
+)
+from .settings import setting_indexing_queue_batch_size
+
+logger = logging.getLogger(name=__name__)
+
+
+class IndexingQueueEntryManager(models.Manager):
+    def enqueue(self, instance, operation):
+        content_type = ContentType.objects.get_for_model(
+            for_concrete_model=False, model=instance
+        )
+
+        try:
+            with transaction.atomic():
+                self.update_or_create(
+                    content_type=content_type, object_id=instance.pk,
+                    defaults={'operation': operation}
+                )
+        except IntegrityError:
+            # Another process queued the same instance concurrently.
+            self.filter(
+                content_type=content_type, object_id=instance.pk
+            ).update(datetime=now(), operation=operation)
+
+    def flush(self, batch_size=None):
+        """
+        Apply the oldest queued updates in a single search backend pass.
+        Returns the number of queue entries processed.
+        """
+        batch_size = batch_size or setting_indexing_queue_batch_size.value
+
+        timestamp = now()
+        entries = list(
+            self.select_related('content_type').order_by(
+                'datetime', 'pk'
+            )[:batch_size]
+        )
+
+        if not entries:
+            return 0
+
+        deindex_instance_list = []
+        index_instance_list = []
+        id_lists = {}
+
+        for entry in entries:
+            id_lists.setdefault(entry.content_type, {}).setdefault(
+                entry.operation, []
+            ).append(entry.object_id)
+
+        for content_type, operations in id_lists.items():
+            model = content_type.model_class()
+            if not model:
+                # The model does not exist anymore.
+                continue
+
+            deindex_id_list = operations.get(
+                INDEXING_QUEUE_OPERATION_DEINDEX, []
+            )
+            index_id_list = operations.get(
+                INDEXING_QUEUE_OPERATION_INDEX, []
+            )
+
+            instances = model._meta.default_manager.in_bulk(
+                id_list=index_id_list
+            )
+            index_instance_list.extend(instances.values())
+
+            # Instances that are no longer available are removed from
+            # the index too.
+            deindex_id_list.extend(
+                set(index_id_list).difference(instances)
+            )
+
+            # Deleted instances only need their primary key to be removed
+            # from the index.
+            for object_id in deindex_id_list:
+                deindex_instance_list.append(model(pk=object_id))
+
+        SearchBackend.get_instance().update_index(
+            deindex_instance_list=deindex_instance_list,
+            index_instance_list=index_instance_list
+        )
+
+        # Entries queued again during the flush are kept for the next pass.
+        self.filter(
+            datetime__lte=timestamp, pk__in=[entry.pk for entry in entries]
+        ).delete()
+
+        logger.debug(
+            'Flushed %d indexing queue entries; %d indexed, %d deindexed',
+            len(entries), len(index_instance_list), len(deindex_instance_list)
+        )
+
+        return len(entries)
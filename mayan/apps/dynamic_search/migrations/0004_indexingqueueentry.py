@@ -0,0 +1,28 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('dynamic_search', '0003_auto_20161028_0707'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IndexingQueueEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveIntegerField()),
+                ('operation', models.PositiveSmallIntegerField(choices=[(1, 'Index'), (2, 'Deindex')], verbose_name='Operation')),
+                ('datetime', models.DateTimeField(auto_now=True, db_index=True, verbose_name='Date time')),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.ContentType')),
+            ],
+            options={
+                'verbose_name': 'Indexing queue entry',
+                'verbose_name_plural': 'Indexing queue entries',
+                'ordering': ('datetime',),
+                'unique_together': {('content_type', 'object_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+from django.db import migrations, models
+import mayan.apps.dynamic_search.model_fields
+
+SEARCH_INDEX_ENTRY_VECTOR_INDEX_NAME = 'dynamic_search_searchindexentry_vector_gin'
+
+
+def operation_create_vector_gin_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX {} ON dynamic_search_searchindexentry USING '
+            'gin (vector);'.format(SEARCH_INDEX_ENTRY_VECTOR_INDEX_NAME)
+        )
+
+
+def operation_drop_vector_gin_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'DROP INDEX IF EXISTS {};'.format(
+                SEARCH_INDEX_ENTRY_VECTOR_INDEX_NAME
+            )
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('dynamic_search', '0004_indexingqueueentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchIndexEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('search_model_name', models.CharField(max_length=128, verbose_name='Search model name')),
+                ('object_id', models.PositiveIntegerField(verbose_name='Object ID')),
+                ('field_name', models.CharField(max_length=128, verbose_name='Field name')),
+                ('vector', mayan.apps.dynamic_search.model_fields.SearchVectorField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Search index entry',
+                'verbose_name_plural': 'Search index entries',
+                'unique_together': {('search_model_name', 'field_name', 'object_id')},
+            },
+        ),
+        migrations.RunPython(
+            code=operation_create_vector_gin_index,
+            reverse_code=operation_drop_vector_gin_index
+        ),
+    ]
@@ -0,0 +1,14 @@
+from django.contrib.postgres.search import SearchVectorField as DjangoSearchVectorField
+from django.db import models
+
+
+class SearchVectorField(DjangoSearchVectorField):
+    """
+    Search vector field that degrades to a text column for database
+    managers other than PostgreSQL to keep the schema portable.
+    """
+    def db_type(self, connection):
+        if connection.vendor == 'postgresql':
+            return super().db_type(connection=connection)
+        else:
+            return models.TextField().db_type(connection=connection)
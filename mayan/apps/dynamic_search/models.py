@@ -0,0 +1,72 @@
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.utils.translation import ugettext_lazy as _
+
+from .literals import (
+    INDEXING_QUEUE_OPERATION_DEINDEX, INDEXING_QUEUE_OPERATION_INDEX
+)
+from .managers import IndexingQueueEntryManager
+from .model_fields import SearchVectorField
+
+
+class IndexingQueueEntry(models.Model):
+    """
+    Pending search index update for a model instance. There is only one
+    entry per instance, the latest operation requested wins.
+    """
+    content_type = models.ForeignKey(
+        on_delete=models.CASCADE, to=ContentType
+    )
+    object_id = models.PositiveIntegerField()
+    content_object = GenericForeignKey(
+        ct_field='content_type', fk_field='object_id'
+    )
+    operation = models.PositiveSmallIntegerField(
+        choices=(
+            (INDEXING_QUEUE_OPERATION_INDEX, _('Index')),
+            (INDEXING_QUEUE_OPERATION_DEINDEX, _('Deindex'))
+        ), verbose_name=_('Operation')
+    )
+    datetime = models.DateTimeField(
+        auto_now=True, db_index=True, verbose_name=_('Date time')
+    )
+
+    objects = IndexingQueueEntryManager()
+
+    class Meta:
+        ordering = ('datetime',)
+        unique_together = ('content_type', 'object_id')
+        verbose_name = _('Indexing queue entry')
+        verbose_name_plural = _('Indexing queue entries')
+
+    def __str__(self):
+        return '{}: {}.{}'.format(
+            self.get_operation_display(), self.content_type, self.object_id
+        )
+
+
+class SearchIndexEntry(models.Model):
+    """
+    Full text search vector of a search field of an instance. Used by the
+    PostgreSQL search backend. The GIN index of the vector column is only
+    created when using PostgreSQL.
+    """
+    search_model_name = models.CharField(
+        max_length=128, verbose_name=_('Search model name')
+    )
+    object_id = models.PositiveIntegerField(verbose_name=_('Object ID'))
+    field_name = models.CharField(
+        max_length=128, verbose_name=_('Field name')
+    )
+    vector = SearchVectorField(blank=True, null=True)
+
+    class Meta:
+        unique_together = ('search_model_name', 'field_name', 'object_id')
+        verbose_name = _('Search index entry')
+        verbose_name_plural = _('Search index entries')
+
+    def __str__(self):
+        return '{}.{}: {}'.format(
+            self.search_model_name, self.field_name, self.object_id
+        )
@@ -1,24 +1,44 @@
+from datetime import timedelta
+
 from django.utils.translation import ugettext_lazy as _
 
 from mayan.apps.common.queues import queue_tools
 from mayan.apps.task_manager.classes import CeleryQueue
 from mayan.apps.task_manager.workers import worker_b
 
+from .literals import INDEXING_QUEUE_FLUSH_INTERVAL
+
 queue_search = CeleryQueue(
     label=_('Search'), name='search', worker=worker_b
 )
+queue_search_periodic = CeleryQueue(
+    label=_('Search periodic'), name='search_periodic', transient=True,
+    worker=worker_b
+)
 
 queue_search.add_task_type(
     dotted_path='mayan.apps.dynamic_search.tasks.task_deindex_instance',
     label=_('Remove a model instance from the search engine.'),
     name='task_deindex_instance',
 )
+queue_search.add_task_type(
+    dotted_path='mayan.apps.dynamic_search.tasks.task_index_access_object',
+    label=_('Update the indexed access of the instances of an object.'),
+    name='task_index_access_object',
+)
 queue_search.add_task_type(
     dotted_path='mayan.apps.dynamic_search.tasks.task_index_instance',
     label=_('Index a model instance to the search engine.'),
     name='task_index_instance',
 )
 
+queue_search_periodic.add_task_type(
+    dotted_path='mayan.apps.dynamic_search.tasks.task_indexing_queue_flush',
+    label=_('Apply the queued search index updates.'),
+    name='task_indexing_queue_flush',
+    schedule=timedelta(seconds=INDEXING_QUEUE_FLUSH_INTERVAL)
+)
+
 queue_tools.add_task_type(
     dotted_path='mayan.apps.dynamic_search.tasks.task_index_search_model',
     label=_('Index all instances of a search model to the search engine.'),
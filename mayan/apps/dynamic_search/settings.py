@@ -5,6 +5,8 @@ from mayan.apps.smart_settings.classes import SettingNamespace
 from .literals import (
     DEFAULT_SEARCH_BACKEND, DEFAULT_SEARCH_BACKEND_ARGUMENTS,
     DEFAULT_SEARCH_DISABLE_SIMPLE_SEARCH,
+    DEFAULT_SEARCH_INDEXING_QUEUE_BATCH_SIZE,
+    DEFAULT_SEARCH_INDEXING_QUEUE_ENABLE,
     DEFAULT_SEARCH_MATCH_ALL_DEFAULT_VALUE, DEFAULT_SEARCH_RESULTS_LIMIT
 )
 
@@ -27,6 +29,21 @@ setting_disable_simple_search = namespace.add_setting(
         'search button.'
     )
 )
+setting_indexing_queue_batch_size = namespace.add_setting(
+    default=DEFAULT_SEARCH_INDEXING_QUEUE_BATCH_SIZE,
+    global_name='SEARCH_INDEXING_QUEUE_BATCH_SIZE', help_text=_(
+        'Maximum number of queued index updates to apply in a single '
+        'search backend pass.'
+    )
+)
+setting_indexing_queue_enable = namespace.add_setting(
+    default=DEFAULT_SEARCH_INDEXING_QUEUE_ENABLE,
+    global_name='SEARCH_INDEXING_QUEUE_ENABLE', help_text=_(
+        'Record index updates in a database queue instead of dispatching '
+        'a task for each change. The queue is deduplicated and applied '
+        'periodically in batches.'
+    )
+)
 setting_match_all_default_value = namespace.add_setting(
     global_name='SEARCH_MATCH_ALL_DEFAULT_VALUE',
     default=DEFAULT_SEARCH_MATCH_ALL_DEFAULT_VALUE,
@@ -2,11 +2,15 @@ import logging
 
 from django.apps import apps
 
+from mayan.apps.lock_manager.backends.base import LockingBackend
 from mayan.apps.lock_manager.exceptions import LockError
 from mayan.celery import app
 
 from .classes import SearchBackend, SearchModel
-from .literals import TASK_RETRY_DELAY
+from .literals import (
+    INDEX_ACCESS_BATCH_SIZE, INDEXING_QUEUE_FLUSH_BATCH_COUNT,
+    INDEXING_QUEUE_FLUSH_LOCK_EXPIRE, TASK_RETRY_DELAY
+)
 
 logger = logging.getLogger(name=__name__)
 
@@ -29,21 +33,60 @@ def task_deindex_instance(self, app_label, model_name, object_id):
     logger.info('Finished')
 
 
+@app.task(ignore_result=True)
+def task_indexing_queue_flush():
+    """
+    Apply up to INDEXING_QUEUE_FLUSH_BATCH_COUNT batches of the queue.
+    Each batch is applied holding a new lock to avoid the lock expiring
+    during long flushes. The rest of the queue is left for the next run.
+    """
+    IndexingQueueEntry = apps.get_model(
+        app_label='dynamic_search', model_name='IndexingQueueEntry'
+    )
+
+    logger.debug(msg='executing...')
+    lock_id = 'task_indexing_queue_flush'
+
+    for batch in range(INDEXING_QUEUE_FLUSH_BATCH_COUNT):
+        try:
+            logger.debug('trying to acquire lock: %s', lock_id)
+            lock = LockingBackend.get_backend().acquire_lock(
+                name=lock_id, timeout=INDEXING_QUEUE_FLUSH_LOCK_EXPIRE
+            )
+            logger.debug('acquired lock: %s', lock_id)
+        except LockError:
+            logger.debug(msg='unable to obtain lock')
+            return
+
+        try:
+            if not IndexingQueueEntry.objects.flush():
+                return
+        except LockError:
+            # The search index is locked by another process. The entries
+            # stay queued for the next run.
+            logger.debug(msg='unable to obtain the search index lock')
+            return
+        finally:
+            lock.release()
+
+
 @app.task(
     bind=True, default_retry_delay=TASK_RETRY_DELAY, max_retries=None,
     ignore_result=True
 )
 def task_index_search_model(self, search_model_full_name):
+    logger.info('Executing')
+
     search_model = SearchModel.get(name=search_model_full_name)
 
-    for instance in search_model.model._meta.default_manager.all():
-        task_index_instance.apply_async(
-            kwargs={
-                'app_label': instance._meta.app_label,
-                'model_name': instance._meta.model_name,
-                'object_id': instance.pk
-            }
+    try:
+        SearchBackend.get_instance().index_search_model(
+            search_model=search_model
         )
+    except LockError as exception:
+        raise self.retry(exc=exception)
+
+    logger.info('Finished')
 
 
 @app.task(
@@ -75,3 +118,58 @@ def task_index_instance(self, app_label, model_name, object_id):
                 raise self.retry(exc=exception)
 
     logger.info('Finished')
+
+
+@app.task(
+    bind=True, default_retry_delay=TASK_RETRY_DELAY, max_retries=None,
+    ignore_result=True
+)
+def task_index_access_object(self, app_label, model_name, object_id):
+    """
+    Update the indexed access of the instances that are the object or that
+    inherit their access from the object's ACLs.
+    """
+    logger.info('Executing')
+
+    try:
+        Model = apps.get_model(app_label=app_label, model_name=model_name)
+    except LookupError:
+        """
+        The app or model does not exists anymore. Non fatal, just exit
+        the task.
+        """
+    else:
+        try:
+            instance = Model._meta.default_manager.get(pk=object_id)
+        except Model.DoesNotExist:
+            """
+            The object was deleted, the instances inheriting from it are
+            updated by their own signals.
+            """
+        else:
+            search_backend = SearchBackend.get_instance()
+
+            for search_model in SearchModel.all():
+                if search_backend.supports_access_filtering(search_model=search_model):
+                    index_instance_list = []
+
+                    queryset = search_model.get_access_dependents(obj=instance)
+
+                    try:
+                        for dependent in queryset.iterator(chunk_size=INDEX_ACCESS_BATCH_SIZE):
+                            index_instance_list.append(dependent)
+
+                            if len(index_instance_list) == INDEX_ACCESS_BATCH_SIZE:
+                                search_backend.update_index(
+                                    index_instance_list=index_instance_list
+                                )
+                                index_instance_list = []
+
+                        if index_instance_list:
+                            search_backend.update_index(
+                                index_instance_list=index_instance_list
+                            )
+                    except LockError as exception:
+                        raise self.retry(exc=exception)
+
+    logger.info('Finished')
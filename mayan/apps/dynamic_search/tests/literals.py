@@ -0,0 +1,2 @@
+TEST_SEARCH_BENCHMARK_DJANGO_BACKEND = 'mayan.apps.dynamic_search.backends.django.DjangoSearchBackend'
+TEST_SEARCH_BENCHMARK_WHOOSH_BACKEND = 'mayan.apps.dynamic_search.backends.whoosh.WhooshSearchBackend'
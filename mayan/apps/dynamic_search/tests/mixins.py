@@ -19,6 +19,16 @@ class SearchAPIViewTestMixin:
             }, query=query
         )
 
+    def _request_search_page_view(self, query=None):
+        query = query or {}
+        query.setdefault('q', self.test_document.label)
+
+        return self.get(
+            viewname='rest_api:search-page-view', kwargs={
+                'search_model_name': document_search.get_full_name()
+            }, query=query
+        )
+
 
 class SearchToolsViewTestMixin:
     def _request_search_backend_reindex_view(self):
@@ -58,3 +58,31 @@ class SearchAPIViewTestCase(
             response.data['results'][0]['label'], self.test_document.label
         )
         self.assertEqual(response.data['count'], 1)
+
+    def test_search_page_api_view_no_permission(self):
+        response = self._request_search_page_view()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [])
+        self.assertEqual(response.data['next'], None)
+
+    def test_search_page_api_view_with_access(self):
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_view
+        )
+
+        response = self._request_search_page_view()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data['results'][0]['label'], self.test_document.label
+        )
+        self.assertEqual(response.data['next'], None)
+
+    def test_search_page_api_view_invalid_cursor(self):
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_view
+        )
+
+        response = self._request_search_page_view(
+            query={'_cursor': 'invalid'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
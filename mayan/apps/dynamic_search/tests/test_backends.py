@@ -1,14 +1,24 @@
+import threading
+
+import mock
+
 from django.test import override_settings
 from django.utils.encoding import force_text
 
 from mayan.apps.documents.permissions import permission_document_view
 from mayan.apps.documents.search import document_search
 from mayan.apps.documents.tests.mixins.document_mixins import DocumentTestMixin
+from mayan.apps.lock_manager.exceptions import LockError
 from mayan.apps.storage.utils import fs_cleanup, mkdtemp
 from mayan.apps.testing.tests.base import BaseTestCase
 
 from ..classes import SearchBackend
+from ..literals import (
+    INDEXING_QUEUE_FLUSH_BATCH_COUNT, INDEXING_QUEUE_OPERATION_DEINDEX
+)
+from ..models import IndexingQueueEntry
 from ..settings import setting_backend_arguments
+from ..tasks import task_indexing_queue_flush
 
 
 @override_settings(SEARCH_BACKEND='mayan.apps.dynamic_search.backends.django.DjangoSearchBackend')
@@ -176,6 +186,32 @@ class DjangoSearchBackendDocumentSearchTestCase(
         )
         self.assertEqual(queryset.count(), 0)
 
+    def test_search_page(self):
+        for label in ('first_doc', 'second_doc', 'third_doc'):
+            self._upload_test_document(label=label)
+            self.grant_access(
+                obj=self.test_document, permission=permission_document_view
+            )
+
+        test_documents = sorted(
+            self.test_documents, key=lambda document: document.pk
+        )
+
+        page = self.search_backend.search_page(
+            page_size=2, search_model=document_search,
+            query_string={'q': 'doc'}, user=self._test_case_user
+        )
+        self.assertEqual(list(page), test_documents[0:2])
+        self.assertTrue(page.has_next)
+
+        page = self.search_backend.search_page(
+            cursor=page.next_cursor, page_size=2,
+            search_model=document_search, query_string={'q': 'doc'},
+            user=self._test_case_user
+        )
+        self.assertEqual(list(page), test_documents[2:3])
+        self.assertFalse(page.has_next)
+
     def test_search_with_dashed_content(self):
         self._upload_test_document(label='second-document')
 
@@ -212,6 +248,103 @@ class DjangoSearchBackendDocumentSearchTestCase(
         self.assertEqual(queryset.count(), 1)
 
 
+@override_settings(SEARCH_BACKEND='mayan.apps.dynamic_search.backends.postgresql.PostgreSQLSearchBackend')
+class PostgreSQLSearchBackendDocumentSearchTestCase(
+    DocumentTestMixin, BaseTestCase
+):
+    auto_upload_test_document = False
+
+    def setUp(self):
+        super().setUp()
+        self.search_backend = SearchBackend.get_instance()
+
+    def test_field_tsquery(self):
+        search_field = document_search.search_fields[1]
+
+        self.assertEqual(
+            self.search_backend.get_field_tsquery(
+                search_field=search_field,
+                text='a "b c" -d OR e-f'
+            ), '(((\'a\':* & (\'b\':* <-> \'c\':*)) & !\'d\':*) | '
+            '(\'e\':* <-> \'f\':*))'
+        )
+
+    def test_field_tsquery_special_characters(self):
+        search_field = document_search.search_fields[1]
+
+        self.assertEqual(
+            self.search_backend.get_field_tsquery(
+                search_field=search_field, text='& \'a\':* !'
+            ), '\'a\':*'
+        )
+
+    def test_search_without_tsquery(self):
+        self._upload_test_document(label='first_doc')
+
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_view
+        )
+
+        # Terms without words do not produce a tsquery and must not match
+        # every instance.
+        with mock.patch.object(target=self.search_backend, attribute='is_database_supported', return_value=True):
+            queryset = self.search_backend.search(
+                search_model=document_search,
+                query_string={'q': '& !'}, user=self._test_case_user
+            )
+
+            self.assertEqual(queryset.count(), 0)
+
+    def test_simple_search(self):
+        self._upload_test_document(label='first_doc')
+
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_view
+        )
+
+        queryset = self.search_backend.search(
+            search_model=document_search,
+            query_string={'q': 'first'}, user=self._test_case_user
+        )
+
+        self.assertEqual(queryset.count(), 1)
+        self.assertTrue(self.test_document in queryset)
+
+    def test_advanced_or_search(self):
+        self._upload_test_document(label='first_doc')
+        self.grant_access(
+            obj=self.test_documents[0], permission=permission_document_view
+        )
+
+        self._upload_test_document(label='second_doc')
+        self.grant_access(
+            obj=self.test_documents[1], permission=permission_document_view
+        )
+
+        queryset = self.search_backend.search(
+            search_model=document_search,
+            query_string={'label': 'first OR second'},
+            user=self._test_case_user
+        )
+        self.assertEqual(queryset.count(), 2)
+        self.assertTrue(self.test_documents[0] in queryset)
+        self.assertTrue(self.test_documents[1] in queryset)
+
+    def test_simple_negated_search(self):
+        self._upload_test_document(label='second_doc')
+
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_view
+        )
+
+        queryset = self.search_backend.search(
+            search_model=document_search,
+            query_string={'label': '-second'},
+            user=self._test_case_user
+        )
+        self.assertEqual(queryset.count(), 0)
+
+
 @override_settings(SEARCH_BACKEND='mayan.apps.dynamic_search.backends.whoosh.WhooshSearchBackend')
 class WhooshSearchBackendDocumentSearchTestCase(
     DocumentTestMixin, BaseTestCase
@@ -335,6 +468,41 @@ class WhooshSearchBackendDocumentSearchTestCase(
         )
         self.assertEqual(queryset.count(), 0)
 
+    def test_scoped_search(self):
+        self._upload_test_document(label='first_doc')
+        self._upload_test_document(label='second_doc')
+        for test_document in self.test_documents:
+            self.grant_access(
+                obj=test_document, permission=permission_document_view
+            )
+
+        query_string = {
+            '__0_label': 'first*', '__1_label': 'first* OR second*',
+            '__result': '901'
+        }
+
+        query_string['__operator_0_1'] = 'AND_901'
+        queryset = self.search_backend.search(
+            search_model=document_search, query_string=query_string,
+            user=self._test_case_user
+        )
+        self.assertEqual(list(queryset), [self.test_documents[0]])
+
+        query_string['__operator_0_1'] = 'NOT_901'
+        queryset = self.search_backend.search(
+            search_model=document_search, query_string=query_string,
+            user=self._test_case_user
+        )
+        self.assertEqual(queryset.count(), 0)
+
+        query_string['__operator_1_0'] = 'NOT_901'
+        del query_string['__operator_0_1']
+        queryset = self.search_backend.search(
+            search_model=document_search, query_string=query_string,
+            user=self._test_case_user
+        )
+        self.assertEqual(list(queryset), [self.test_documents[1]])
+
     def test_search_field_transformation_functions(self):
         self._upload_test_document()
 
@@ -348,3 +516,329 @@ class WhooshSearchBackendDocumentSearchTestCase(
             user=self._test_case_user
         )
         self.assertEqual(queryset.count(), 1)
+
+    def test_search_model_index(self):
+        self._upload_test_document(label='first_doc')
+        self.grant_access(
+            obj=self.test_documents[0], permission=permission_document_view
+        )
+        self._upload_test_document(label='second_doc')
+        self.grant_access(
+            obj=self.test_documents[1], permission=permission_document_view
+        )
+
+        self.search_backend.clear_search_model_index(
+            search_model=document_search
+        )
+
+        queryset = self.search_backend.search(
+            search_model=document_search,
+            query_string={'q': 'first* OR second*'}, user=self._test_case_user
+        )
+        self.assertEqual(queryset.count(), 0)
+
+        self.search_backend.writer_commit_interval = 1
+
+        result = self.search_backend.index_search_model(
+            search_model=document_search
+        )
+        self.assertEqual(result['count'], 2)
+
+        queryset = self.search_backend.search(
+            search_model=document_search,
+            query_string={'q': 'first* OR second*'}, user=self._test_case_user
+        )
+        self.assertEqual(queryset.count(), 2)
+
+    def test_search_page(self):
+        for label in ('first_doc', 'first_file', 'first_item'):
+            self._upload_test_document(label=label)
+        # Inaccessible results are skipped and the page is completed with
+        # the following hits.
+        for test_document in self.test_documents[1:]:
+            self.grant_access(
+                obj=test_document, permission=permission_document_view
+            )
+
+        page = self.search_backend.search_page(
+            page_size=1, search_model=document_search,
+            query_string={'q': 'first*'}, user=self._test_case_user
+        )
+        self.assertEqual(len(page), 1)
+        self.assertTrue(page.has_next)
+        object_list = list(page)
+
+        page = self.search_backend.search_page(
+            cursor=page.next_cursor, page_size=1,
+            search_model=document_search, query_string={'q': 'first*'},
+            user=self._test_case_user
+        )
+        self.assertEqual(len(page), 1)
+        self.assertFalse(page.has_next)
+        object_list.extend(page)
+
+        self.assertEqual(
+            set(object_list), set(self.test_documents[1:])
+        )
+
+    def test_search_page_skipped_hits_search_count(self):
+        for label in ('first_doc', 'first_file', 'first_item', 'first_page'):
+            self._upload_test_document(label=label)
+
+        self.grant_access(
+            obj=self.test_documents[-1], permission=permission_document_view
+        )
+
+        searcher = self.search_backend.get_searcher(
+            search_model=document_search
+        )
+
+        with mock.patch.object(target=searcher, attribute='search', wraps=searcher.search) as mock_search:
+            page = self.search_backend.search_page(
+                page_size=1, search_model=document_search,
+                query_string={'q': 'first*'}, user=self._test_case_user
+            )
+
+        self.assertEqual(list(page), [self.test_documents[-1]])
+        self.assertTrue(mock_search.call_count <= 2)
+
+    def test_index_cache(self):
+        self._upload_test_document(label='first_doc')
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_view
+        )
+
+        self.search_backend.search(
+            search_model=document_search,
+            query_string={'q': 'first*'}, user=self._test_case_user
+        )
+        statistics = self.search_backend.get_index_cache_statistics()
+
+        self.search_backend.search(
+            search_model=document_search,
+            query_string={'q': 'first*'}, user=self._test_case_user
+        )
+        self.assertTrue(
+            self.search_backend.get_index_cache_statistics()['hits'] > statistics['hits']
+        )
+        self.assertEqual(
+            self.search_backend.get_index_cache_statistics()['misses'],
+            statistics['misses']
+        )
+
+        self._upload_test_document(label='second_doc')
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_view
+        )
+
+        queryset = self.search_backend.search(
+            search_model=document_search,
+            query_string={'q': 'second*'}, user=self._test_case_user
+        )
+        self.assertEqual(queryset.count(), 1)
+        self.assertTrue(self.test_document in queryset)
+
+    def test_searcher_closed_on_index_change(self):
+        self._upload_test_document(label='first_doc')
+
+        searcher = self.search_backend.get_searcher(
+            search_model=document_search
+        )
+        self.assertEqual(
+            self.search_backend.get_searcher(search_model=document_search),
+            searcher
+        )
+
+        with mock.patch.object(target=searcher, attribute='close') as mock_close:
+            self._upload_test_document(label='second_doc')
+
+            searcher_new = self.search_backend.get_searcher(
+                search_model=document_search
+            )
+
+        self.assertNotEqual(searcher_new, searcher)
+        self.assertTrue(mock_close.called)
+
+    def test_searcher_per_thread(self):
+        self._upload_test_document(label='first_doc')
+
+        searcher = self.search_backend.get_searcher(
+            search_model=document_search
+        )
+        thread_searchers = []
+
+        thread = threading.Thread(
+            target=lambda: thread_searchers.append(
+                self.search_backend.get_searcher(search_model=document_search)
+            )
+        )
+        thread.start()
+        thread.join()
+
+        self.assertNotEqual(thread_searchers[0], searcher)
+
+
+@override_settings(
+    SEARCH_BACKEND='mayan.apps.dynamic_search.backends.whoosh.WhooshSearchBackend',
+    SEARCH_INDEXING_QUEUE_ENABLE=True
+)
+class WhooshSearchBackendIndexingQueueTestCase(
+    DocumentTestMixin, BaseTestCase
+):
+    auto_upload_test_document = False
+
+    def setUp(self):
+        self.old_value = setting_backend_arguments.value
+        super().setUp()
+        setting_backend_arguments.set(
+            value={'index_path': mkdtemp()}
+        )
+        self.search_backend = SearchBackend.get_instance()
+
+    def tearDown(self):
+        fs_cleanup(
+            filename=setting_backend_arguments.value['index_path']
+        )
+        setting_backend_arguments.set(value=self.old_value)
+        super().tearDown()
+
+    def test_indexing_queue(self):
+        self._upload_test_document(label='first_doc')
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_view
+        )
+
+        queryset = self.search_backend.search(
+            search_model=document_search,
+            query_string={'q': 'first*'}, user=self._test_case_user
+        )
+        self.assertEqual(queryset.count(), 0)
+
+        self.assertTrue(IndexingQueueEntry.objects.flush())
+        self.assertEqual(IndexingQueueEntry.objects.count(), 0)
+
+        queryset = self.search_backend.search(
+            search_model=document_search,
+            query_string={'q': 'first*'}, user=self._test_case_user
+        )
+        self.assertEqual(queryset.count(), 1)
+        self.assertTrue(self.test_document in queryset)
+
+        IndexingQueueEntry.objects.enqueue(
+            instance=self.test_document,
+            operation=INDEXING_QUEUE_OPERATION_DEINDEX
+        )
+        IndexingQueueEntry.objects.flush()
+
+        queryset = self.search_backend.search(
+            search_model=document_search,
+            query_string={'q': 'first*'}, user=self._test_case_user
+        )
+        self.assertEqual(queryset.count(), 0)
+
+    @mock.patch('mayan.apps.dynamic_search.backends.whoosh.WhooshSearchBackend.update_index')
+    def test_indexing_queue_flush_task_index_lock_error(
+        self, mock_update_index
+    ):
+        mock_update_index.side_effect = LockError
+
+        self._upload_test_document(label='first_doc')
+        entry_count = IndexingQueueEntry.objects.count()
+
+        task_indexing_queue_flush.apply_async()
+
+        self.assertEqual(mock_update_index.call_count, 1)
+        self.assertEqual(IndexingQueueEntry.objects.count(), entry_count)
+
+    @mock.patch('mayan.apps.dynamic_search.managers.IndexingQueueEntryManager.flush')
+    def test_indexing_queue_flush_task_batch_count(self, mock_flush):
+        mock_flush.return_value = 1
+
+        task_indexing_queue_flush.apply_async()
+
+        self.assertEqual(
+            mock_flush.call_count, INDEXING_QUEUE_FLUSH_BATCH_COUNT
+        )
+
+
+@override_settings(SEARCH_BACKEND='mayan.apps.dynamic_search.backends.whoosh.WhooshSearchBackend')
+class WhooshSearchBackendIndexAccessTestCase(
+    DocumentTestMixin, BaseTestCase
+):
+    auto_upload_test_document = False
+
+    def setUp(self):
+        self.old_value = setting_backend_arguments.value
+        super().setUp()
+        setting_backend_arguments.set(
+            value={'index_access': True, 'index_path': mkdtemp()}
+        )
+        self.search_backend = SearchBackend.get_instance()
+
+    def tearDown(self):
+        fs_cleanup(
+            filename=setting_backend_arguments.value['index_path']
+        )
+        setting_backend_arguments.set(value=self.old_value)
+        super().tearDown()
+
+    def _search_test_document(self):
+        return self.search_backend.search(
+            search_model=document_search,
+            query_string={'q': 'first*'}, user=self._test_case_user
+        )
+
+    def test_supports_access_filtering(self):
+        self.assertTrue(
+            self.search_backend.supports_access_filtering(
+                search_model=document_search
+            )
+        )
+
+    def test_search_no_permission(self):
+        self._upload_test_document(label='first_doc')
+
+        self.assertEqual(self._search_test_document().count(), 0)
+
+    def test_search_with_access(self):
+        self._upload_test_document(label='first_doc')
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_view
+        )
+
+        queryset = self._search_test_document()
+        self.assertEqual(queryset.count(), 1)
+        self.assertTrue(self.test_document in queryset)
+
+        self.revoke_access(
+            obj=self.test_document, permission=permission_document_view
+        )
+        self.assertEqual(self._search_test_document().count(), 0)
+
+    def test_search_with_inherited_access(self):
+        self._upload_test_document(label='first_doc')
+        self.grant_access(
+            obj=self.test_document_type, permission=permission_document_view
+        )
+
+        queryset = self._search_test_document()
+        self.assertEqual(queryset.count(), 1)
+        self.assertTrue(self.test_document in queryset)
+
+    def test_search_with_permission(self):
+        self._upload_test_document(label='first_doc')
+        self.grant_permission(permission=permission_document_view)
+
+        self.assertEqual(self._search_test_document().count(), 1)
+
+    def test_search_role_membership_change(self):
+        self._upload_test_document(label='first_doc')
+        self.grant_access(
+            obj=self.test_document, permission=permission_document_view
+        )
+
+        self._test_case_group.user_set.remove(self._test_case_user)
+        self.assertEqual(self._search_test_document().count(), 0)
+
+        self._test_case_group.user_set.add(self._test_case_user)
+        self.assertEqual(self._search_test_document().count(), 1)
@@ -4,7 +4,7 @@ from mayan.apps.documents.tests.mixins.document_mixins import DocumentTestMixin
 from mayan.apps.tags.tests.mixins import TagTestMixin
 from mayan.apps.testing.tests.base import BaseTestCase
 
-from ..classes import SearchBackend
+from ..classes import SearchBackend, SearchScope, SearchScopeOperation
 
 
 class ScopedSearchTestCase(DocumentTestMixin, TagTestMixin, BaseTestCase):
@@ -90,3 +90,72 @@ class ScopedSearchTestCase(DocumentTestMixin, TagTestMixin, BaseTestCase):
             user=self._test_case_user
         )
         self.assertEqual(queryset.count(), 1)
+
+    def test_NOT_scope(self):
+        query = {
+            '__0_tags__label': self.test_tags[0].label,
+            '__operator_0_1': 'NOT_901',
+            '__result': '901',
+            '__1_tags__label': self.test_tags[1].label
+        }
+        queryset = self.search_backend.search(
+            search_model=document_search, query_string=query,
+            user=self._test_case_user
+        )
+        self.assertEqual(queryset.count(), 0)
+
+        self.test_tags[1].documents.remove(self.test_document)
+
+        queryset = self.search_backend.search(
+            search_model=document_search, query_string=query,
+            user=self._test_case_user
+        )
+        self.assertEqual(queryset.count(), 1)
+
+    def test_nested_scopes(self):
+        query = {
+            '__0_tags__label': self.test_tags[0].label,
+            '__1_tags__label': self.test_tags[1].label,
+            '__2_label': 'non_valid',
+            '__operator_0_1': 'AND_a',
+            '__operator_a_2': 'OR_b',
+            '__result': 'b'
+        }
+        queryset = self.search_backend.search(
+            search_model=document_search, query_string=query,
+            user=self._test_case_user
+        )
+        self.assertEqual(queryset.count(), 1)
+
+    def test_search_plan(self):
+        plan = self.search_backend.get_search_plan(
+            query_string={
+                '__0_tags__label': self.test_tags[0].label,
+                '__operator_0_1': 'AND_901',
+                '__result': '901',
+                '__1_tags__label': self.test_tags[1].label
+            }
+        )
+        self.assertTrue(isinstance(plan, SearchScopeOperation))
+        self.assertEqual(plan.operator, 'AND')
+        self.assertEqual(
+            [source.name for source in plan.sources], ['0', '1']
+        )
+
+    def test_search_plan_unscoped(self):
+        plan = self.search_backend.get_search_plan(
+            query_string={'q': self.test_document.label}
+        )
+        self.assertTrue(isinstance(plan, SearchScope))
+
+    def test_explain(self):
+        text = self.search_backend.explain(
+            search_model=document_search, query_string={
+                '__0_tags__label': self.test_tags[0].label,
+                '__operator_0_1': 'AND_901',
+                '__result': '901',
+                '__1_tags__label': self.test_tags[1].label
+            }
+        )
+        self.assertTrue('Scope 0: tags__label=' in text)
+        self.assertTrue('SELECT' in text)
@@ -0,0 +1,119 @@
+from io import StringIO
+import json
+
+from django.core import management
+
+from mayan.apps.documents.models import (
+    Document, DocumentFilePage, DocumentVersionPage
+)
+from mayan.apps.documents.tests.mixins.document_mixins import (
+    DocumentTestMixin
+)
+from mayan.apps.testing.tests.base import BaseTestCase
+
+from ..benchmarks import SearchBenchmark, SearchBenchmarkCorpus
+
+from .literals import (
+    TEST_SEARCH_BENCHMARK_DJANGO_BACKEND,
+    TEST_SEARCH_BENCHMARK_WHOOSH_BACKEND
+)
+
+
+class SearchBenchmarkManagementCommandTestCase(
+    DocumentTestMixin, BaseTestCase
+):
+    auto_upload_test_document = False
+    create_test_case_superuser = True
+
+    def test_search_benchmark_command(self):
+        output = StringIO()
+        options = {
+            'document_count': 3, 'metadata_count': 1, 'page_count': 1,
+            'query_count': 6, 'stdout': output, 'tag_count': 2,
+            'text_size': 100
+        }
+        management.call_command('search_benchmark', **options)
+
+        result = json.loads(output.getvalue())
+
+        self.assertEqual(result['corpus']['document_count'], 3)
+        self.assertEqual(len(result['backends']), 2)
+
+        self.assertEqual(
+            result['backends'][TEST_SEARCH_BENCHMARK_DJANGO_BACKEND]['indexing']['count'],
+            None
+        )
+        self.assertEqual(
+            result['backends'][TEST_SEARCH_BENCHMARK_WHOOSH_BACKEND]['indexing']['count'],
+            3
+        )
+
+        for backend_result in result['backends'].values():
+            self.assertEqual(
+                sorted(backend_result['queries']),
+                ['advanced', 'scoped', 'simple']
+            )
+            self.assertTrue(
+                backend_result['queries']['simple']['p99'] >= backend_result['queries']['simple']['p50']
+            )
+
+        self.assertEqual(Document.objects.count(), 0)
+
+    def test_search_benchmark_command_external_documents(self):
+        self._create_test_document_stub()
+
+        with self.assertRaises(expected_exception=management.CommandError):
+            management.call_command(
+                'search_benchmark', document_count=1, stdout=StringIO()
+            )
+
+        management.call_command(
+            'search_benchmark', document_count=1, force=True,
+            metadata_count=0, page_count=1, query_count=3,
+            stdout=StringIO(), tag_count=0, text_size=10
+        )
+
+        self.assertEqual(Document.objects.count(), 1)
+
+    def test_corpus_document_version_pages(self):
+        corpus = SearchBenchmarkCorpus(
+            document_count=2, metadata_count=0, page_count=2, tag_count=0,
+            text_size=10
+        )
+        corpus.create()
+
+        queryset = DocumentVersionPage.objects.filter(
+            document_version__document__document_type__label=corpus.label
+        )
+        self.assertEqual(queryset.count(), 4)
+
+        for document_version_page in queryset:
+            self.assertTrue(
+                isinstance(
+                    document_version_page.content_object, DocumentFilePage
+                )
+            )
+            self.assertEqual(
+                document_version_page.content_object.document_file.document,
+                document_version_page.document_version.document
+            )
+            self.assertTrue(document_version_page.ocr_content.content)
+
+    def test_corpus_reproducible(self):
+        corpus = SearchBenchmarkCorpus(seed=1, tag_count=2)
+        queries = corpus.get_queries(count=6)
+
+        self.assertEqual(
+            SearchBenchmarkCorpus(seed=1, tag_count=2).get_queries(count=6),
+            queries
+        )
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+
+        self.assertEqual(
+            SearchBenchmark.get_percentile(percentile=50, values=values), 50
+        )
+        self.assertEqual(
+            SearchBenchmark.get_percentile(percentile=99, values=values), 99
+        )
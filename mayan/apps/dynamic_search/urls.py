@@ -1,7 +1,8 @@
 from django.conf.urls import url
 
 from .api_views import (
-    APIAdvancedSearchView, APISearchModelList, APISearchView
+    APIAdvancedSearchView, APISearchModelList, APISearchPageView,
+    APISearchView
 )
 from .views import (
     AdvancedSearchView, ResultsView, SearchAgainView,
@@ -54,6 +55,10 @@ api_urls = [
         regex=r'^search/advanced/(?P<search_model_name>[\.\w]+)/$',
         name='advanced-search-view', view=APIAdvancedSearchView.as_view()
     ),
+    url(
+        regex=r'^search/page/(?P<search_model_name>[\.\w]+)/$',
+        name='search-page-view', view=APISearchPageView.as_view()
+    ),
     url(
         regex=r'^search_models/$', name='searchmodel-list',
         view=APISearchModelList.as_view()
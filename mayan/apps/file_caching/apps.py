@@ -61,6 +61,14 @@ class FileCachingConfig(MayanAppConfig):
             attribute='get_total_size_display', include_label=True,
             source=Cache
         )
+        SourceColumn(
+            attribute='get_eviction_policy_display', include_label=True,
+            is_sortable=True, sort_field='eviction_policy', source=Cache
+        )
+        SourceColumn(
+            attribute='get_hit_rate_display', include_label=True,
+            source=Cache
+        )
 
         menu_list_facet.bind_links(
             links=(link_acl_list,), sources=(Cache,)
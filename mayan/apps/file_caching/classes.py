@@ -0,0 +1,220 @@
+from collections import OrderedDict
+import hashlib
+import logging
+import threading
+import time
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .literals import (
+    CACHE_FILE_CHECKSUM_DIGEST_SIZE, MEMORY_TIER_FILE_SIZE_DIVISOR
+)
+from .settings import (
+    setting_hit_buffer_interval, setting_hit_buffer_size,
+    setting_memory_tier_maximum_size, setting_memory_tier_timeout
+)
+
+logger = logging.getLogger(name=__name__)
+
+
+class CachePartitionFileHitBuffer:
+    """
+    Per process buffer of the cache file reads. Reads are counted in memory
+    and written to the database in batches to avoid a database write for
+    each read.
+    """
+    _entries = {}
+    _last_flush = time.monotonic()
+    _lock = threading.Lock()
+
+    @classmethod
+    def add(cls, cache_partition_file_id):
+        with cls._lock:
+            count = cls._entries.get(cache_partition_file_id, (0, None))[0]
+            cls._entries[cache_partition_file_id] = (count + 1, timezone.now())
+
+            flush = len(cls._entries) >= setting_hit_buffer_size.value or (
+                time.monotonic() - cls._last_flush >= setting_hit_buffer_interval.value
+            )
+
+        if flush:
+            try:
+                cls.flush()
+            except Exception as exception:
+                # Losing read statistics must not cause the read to fail.
+                logger.error(
+                    'Unable to flush the cache file hit buffer; %s',
+                    exception, exc_info=True
+                )
+
+    @classmethod
+    def flush(cls):
+        """
+        Write the buffered reads using a single bulk update and add them to
+        the hit counter of their caches. Reads of files deleted since are
+        discarded.
+        """
+        Cache = apps.get_model(app_label='file_caching', model_name='Cache')
+        CachePartitionFile = apps.get_model(
+            app_label='file_caching', model_name='CachePartitionFile'
+        )
+
+        with cls._lock:
+            entries = cls._entries
+            cls._entries = {}
+            cls._last_flush = time.monotonic()
+
+        if not entries:
+            return
+
+        cache_hit_counts = {}
+        cache_partition_files = []
+
+        queryset = CachePartitionFile.objects.filter(
+            pk__in=entries.keys()
+        ).select_related('partition__cache')
+
+        for cache_partition_file in queryset:
+            count, datetime = entries[cache_partition_file.pk]
+            cache_id = cache_partition_file.partition.cache_id
+            cache_hit_counts[cache_id] = cache_hit_counts.get(cache_id, 0) + count
+            eviction_policy = cache_partition_file.partition.cache.get_eviction_policy()
+
+            cache_partition_file.priority = eviction_policy.get_access_priority(
+                cache_partition_file=cache_partition_file, count=count,
+                datetime=datetime
+            )
+            cache_partition_file.hits = F('hits') + count
+            cache_partition_file.last_access = datetime
+            cache_partition_files.append(cache_partition_file)
+
+        with transaction.atomic():
+            CachePartitionFile.objects.bulk_update(
+                fields=('hits', 'last_access', 'priority'),
+                objs=cache_partition_files
+            )
+
+            for cache_id, count in cache_hit_counts.items():
+                Cache.objects.filter(pk=cache_id).update(
+                    hit_count=F('hit_count') + count
+                )
+
+
+class CachePartitionFileMemoryTier:
+    """
+    Per process in memory store of the content of the most recently read
+    cache files, keyed by partition and filename and limited to a total
+    size in bytes. Least recently used entries are discarded first.
+    Entries expire after a timeout to limit how long other processes can
+    serve files deleted or replaced elsewhere.
+    """
+    _entries = OrderedDict()
+    _lock = threading.Lock()
+    _size = 0
+
+    @classmethod
+    def _remove(cls, key):
+        entry = cls._entries.pop(key)
+        cls._size -= len(entry['content'])
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._entries.clear()
+            cls._size = 0
+
+    @classmethod
+    def get(cls, partition_id, filename):
+        """
+        Return a dictionary with the cache file id, checksum, creation date
+        time and content of a file or None if the file is not in memory.
+        """
+        key = (partition_id, filename)
+
+        with cls._lock:
+            entry = cls._entries.get(key)
+
+            if entry:
+                if time.monotonic() - entry['time'] > setting_memory_tier_timeout.value:
+                    cls._remove(key=key)
+                else:
+                    cls._entries.move_to_end(key=key)
+                    return {
+                        'cache_partition_file_id': entry['cache_partition_file_id'],
+                        'checksum': entry['checksum'],
+                        'content': entry['content'],
+                        'datetime': entry['datetime']
+                    }
+
+    @classmethod
+    def invalidate(cls, partition_id, filename=None):
+        """
+        Remove a file or all the files of a partition.
+        """
+        with cls._lock:
+            if filename is None:
+                keys = [key for key in cls._entries if key[0] == partition_id]
+            else:
+                keys = [(partition_id, filename)]
+
+            for key in keys:
+                if key in cls._entries:
+                    cls._remove(key=key)
+
+    @classmethod
+    def is_enabled(cls):
+        return setting_memory_tier_maximum_size.value > 0
+
+    @classmethod
+    def set(
+        cls, cache_partition_file_id, checksum, content, datetime, filename,
+        partition_id
+    ):
+        maximum_size = setting_memory_tier_maximum_size.value
+
+        if len(content) > maximum_size // MEMORY_TIER_FILE_SIZE_DIVISOR:
+            # Avoid a single big file evicting the rest of the entries.
+            return
+
+        key = (partition_id, filename)
+
+        with cls._lock:
+            if key in cls._entries:
+                cls._remove(key=key)
+
+            while cls._entries and cls._size + len(content) > maximum_size:
+                cls._remove(key=next(iter(cls._entries)))
+
+            cls._entries[key] = {
+                'cache_partition_file_id': cache_partition_file_id,
+                'checksum': checksum, 'content': content,
+                'datetime': datetime, 'time': time.monotonic()
+            }
+            cls._size += len(content)
+
+
+class HashingFile:
+    """
+    Write only file wrapper that calculates the checksum and size of the
+    data written.
+    """
+    def __init__(self, file_object):
+        self.file_object = file_object
+        self.hash_object = hashlib.blake2b(
+            digest_size=CACHE_FILE_CHECKSUM_DIGEST_SIZE
+        )
+        self.size = 0
+
+    def __getattr__(self, name):
+        return getattr(self.file_object, name)
+
+    def get_checksum(self):
+        return self.hash_object.hexdigest()
+
+    def write(self, data):
+        self.hash_object.update(data)
+        self.size += len(data)
+        return self.file_object.write(data)
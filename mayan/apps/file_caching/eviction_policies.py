@@ -0,0 +1,214 @@
+from datetime import timedelta
+import logging
+import math
+
+from django.apps import apps
+from django.utils import timezone
+from django.utils.encoding import force_text
+from django.utils.translation import ugettext_lazy as _
+
+from .settings import (
+    setting_eviction_policy_lfu_half_life, setting_eviction_policy_ttl
+)
+
+logger = logging.getLogger(name=__name__)
+
+
+class CacheEvictionPolicy:
+    """
+    Base class for the cache eviction policies. Policies decide the order
+    in which cache files are deleted when a cache is pruned and the
+    priority of each file when it is created and accessed.
+    """
+    _registry = {}
+
+    @classmethod
+    def all(cls):
+        return cls._registry.values()
+
+    @classmethod
+    def get(cls, name):
+        return cls._registry[name]
+
+    @classmethod
+    def get_choices(cls):
+        return [
+            (policy.name, policy.label) for policy in sorted(
+                cls.all(), key=lambda policy: policy.name
+            )
+        ]
+
+    @classmethod
+    def get_statistics(cls):
+        """
+        Return the hit and miss counts and the hit rate of the caches
+        using each policy.
+        """
+        Cache = apps.get_model(app_label='file_caching', model_name='Cache')
+
+        result = {}
+
+        for cache in Cache.objects.all():
+            statistics = cache.get_statistics()
+            policy_statistics = result.setdefault(
+                cache.eviction_policy, {'hits': 0, 'misses': 0}
+            )
+            policy_statistics['hits'] += statistics['hits']
+            policy_statistics['misses'] += statistics['misses']
+
+        for policy_statistics in result.values():
+            policy_statistics['hit_rate'] = cls.get_hit_rate(
+                hits=policy_statistics['hits'],
+                misses=policy_statistics['misses']
+            )
+
+        return result
+
+    @staticmethod
+    def get_hit_rate(hits, misses):
+        if hits + misses:
+            return hits / (hits + misses)
+        else:
+            return 0
+
+    @classmethod
+    def register(cls, policy):
+        cls._registry[policy.name] = policy
+
+    def __str__(self):
+        return force_text(s=self.label)
+
+    def get_access_priority(self, cache_partition_file, datetime, count=1):
+        """
+        Priority of a cache file after it is accessed `count` times, the
+        last time at `datetime`.
+        """
+        return cache_partition_file.priority
+
+    def get_creation_priority(self, cache_partition_file, datetime):
+        """
+        Priority of a cache file after it is created at `datetime` and
+        its size is known.
+        """
+        return cache_partition_file.priority
+
+    def get_expired_queryset(self, cache):
+        """
+        Files that must be deleted even if the cache is not full.
+        """
+        return cache.get_files().none()
+
+    def get_victim_queryset(self, cache):
+        """
+        All the files of the cache ordered from first to last evicted.
+        """
+        raise NotImplementedError
+
+    def on_evict(self, cache, cache_partition_files):
+        """
+        Optional method called after cache files are evicted.
+        """
+
+
+class CacheEvictionPolicyGreedyDualSize(CacheEvictionPolicy):
+    """
+    GreedyDual-Size with a uniform cost. The priority of a file is the
+    cache aging value plus the inverse of its size, so large files are
+    evicted first unless accessed recently. The aging value is raised to
+    the priority of each evicted file.
+    """
+    label = _('Size aware (GreedyDual-Size)')
+    name = 'gds'
+
+    def get_access_priority(self, cache_partition_file, datetime, count=1):
+        return self.get_priority(cache_partition_file=cache_partition_file)
+
+    def get_creation_priority(self, cache_partition_file, datetime):
+        return self.get_priority(cache_partition_file=cache_partition_file)
+
+    def get_priority(self, cache_partition_file):
+        return cache_partition_file.partition.cache.eviction_inflation + (
+            1.0 / max(cache_partition_file.file_size, 1)
+        )
+
+    def get_victim_queryset(self, cache):
+        return cache.get_files().order_by('priority', 'datetime')
+
+    def on_evict(self, cache, cache_partition_files):
+        inflation = max(
+            cache_partition_file.priority for cache_partition_file in cache_partition_files
+        )
+        cache.update_eviction_inflation(value=inflation)
+
+
+class CacheEvictionPolicyLFU(CacheEvictionPolicy):
+    """
+    Least frequently used with an exponential decay of the access count.
+    The decayed counts are stored as the base 2 logarithm of the count
+    scaled to a fixed epoch, this keeps the priorities of files accessed
+    at different times comparable without updating all the files.
+    """
+    label = _('Least frequently used, with decay')
+    name = 'lfu'
+
+    @staticmethod
+    def add_logarithms(value_a, value_b):
+        """
+        Return log2(2 ** value_a + 2 ** value_b) without overflowing.
+        """
+        maximum = max(value_a, value_b)
+        minimum = min(value_a, value_b)
+
+        return maximum + math.log2(1 + 2 ** (minimum - maximum))
+
+    def get_access_priority(self, cache_partition_file, datetime, count=1):
+        return self.add_logarithms(
+            value_a=cache_partition_file.priority,
+            value_b=self.get_time_value(datetime=datetime) + math.log2(count)
+        )
+
+    def get_creation_priority(self, cache_partition_file, datetime):
+        return self.get_time_value(datetime=datetime)
+
+    def get_time_value(self, datetime):
+        return datetime.timestamp() / setting_eviction_policy_lfu_half_life.value
+
+    def get_victim_queryset(self, cache):
+        return cache.get_files().order_by('priority', 'datetime')
+
+
+class CacheEvictionPolicyLRU(CacheEvictionPolicy):
+    """
+    Least recently used. Evicts the files with the oldest last access.
+    """
+    label = _('Least recently used')
+    name = 'lru'
+
+    def get_victim_queryset(self, cache):
+        return cache.get_files().order_by('last_access', 'datetime')
+
+
+class CacheEvictionPolicyTTL(CacheEvictionPolicy):
+    """
+    Time to live. Files are deleted once they are older than the policy
+    time to live even if the cache is not full. When the cache is full
+    the oldest files are evicted first.
+    """
+    label = _('Time to live')
+    name = 'ttl'
+
+    def get_expired_queryset(self, cache):
+        return cache.get_files().filter(
+            datetime__lt=timezone.now() - timedelta(
+                seconds=setting_eviction_policy_ttl.value
+            )
+        )
+
+    def get_victim_queryset(self, cache):
+        return cache.get_files().order_by('datetime')
+
+
+CacheEvictionPolicy.register(policy=CacheEvictionPolicyGreedyDualSize())
+CacheEvictionPolicy.register(policy=CacheEvictionPolicyLFU())
+CacheEvictionPolicy.register(policy=CacheEvictionPolicyLRU())
+CacheEvictionPolicy.register(policy=CacheEvictionPolicyTTL())
@@ -1,2 +1,17 @@
+DEFAULT_EVICTION_POLICY = 'lfu'
+DEFAULT_EVICTION_POLICY_LFU_HALF_LIFE = 24 * 60 * 60  # 1 day
+DEFAULT_EVICTION_POLICY_TTL = 7 * 24 * 60 * 60  # 7 days
+DEFAULT_HIT_BUFFER_INTERVAL = 10
+DEFAULT_HIT_BUFFER_SIZE = 100
 DEFAULT_MAXIMUM_FAILED_PRUNE_ATTEMPTS = 100
 DEFAULT_MAXIMUM_NORMAL_PRUNE_ATTEMPTS = 100
+DEFAULT_MEMORY_TIER_MAXIMUM_SIZE = 0
+DEFAULT_MEMORY_TIER_TIMEOUT = 60
+DEFAULT_PRUNE_BATCH_SIZE = 100
+
+CACHE_FILE_CHECKSUM_DIGEST_SIZE = 16
+CACHE_PRUNE_EXPIRED_INTERVAL = 60 * 60  # 1 hour
+CACHE_TOTAL_SIZE_UPDATE_INTERVAL = 60 * 60  # 1 hour
+
+# Files bigger than this fraction of the memory tier size are not stored.
+MEMORY_TIER_FILE_SIZE_DIVISOR = 10
@@ -0,0 +1,131 @@
+import math
+
+from django.db import migrations, models
+from django.db.models import F
+import django.utils.timezone
+
+from ..settings import setting_eviction_policy_lfu_half_life
+
+BATCH_SIZE = 1000
+
+
+def operation_cache_partition_file_last_access_copy(apps, schema_editor):
+    CachePartitionFile = apps.get_model(
+        app_label='file_caching', model_name='CachePartitionFile'
+    )
+
+    CachePartitionFile.objects.using(
+        schema_editor.connection.alias
+    ).update(last_access=F('datetime'))
+
+
+def operation_cache_partition_file_priority_seed(apps, schema_editor):
+    """
+    Calculate the priority of the existing files like the least frequently
+    used policy, the default of the existing caches. The time of each
+    access is not known, the accesses are counted at the creation time of
+    the files.
+    """
+    CachePartitionFile = apps.get_model(
+        app_label='file_caching', model_name='CachePartitionFile'
+    )
+
+    half_life = setting_eviction_policy_lfu_half_life.value
+
+    queryset = CachePartitionFile.objects.using(
+        schema_editor.connection.alias
+    ).only('datetime', 'hits')
+
+    cache_partition_files = []
+
+    for cache_partition_file in queryset.iterator(chunk_size=BATCH_SIZE):
+        cache_partition_file.priority = (
+            cache_partition_file.datetime.timestamp() / half_life
+        ) + math.log2(1 + cache_partition_file.hits)
+        cache_partition_files.append(cache_partition_file)
+
+        if len(cache_partition_files) == BATCH_SIZE:
+            CachePartitionFile.objects.using(
+                schema_editor.connection.alias
+            ).bulk_update(
+                fields=('priority',), objs=cache_partition_files
+            )
+            cache_partition_files = []
+
+    CachePartitionFile.objects.using(
+        schema_editor.connection.alias
+    ).bulk_update(fields=('priority',), objs=cache_partition_files)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('file_caching', '0009_cache_total_size'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cache',
+            name='eviction_inflation',
+            field=models.FloatField(
+                default=0, editable=False, help_text='Priority of the last '
+                'evicted file. Used as the aging value by the size aware '
+                'eviction policy.', verbose_name='Eviction inflation'
+            ),
+        ),
+        migrations.AddField(
+            model_name='cache',
+            name='eviction_policy',
+            field=models.CharField(
+                choices=[
+                    ('gds', 'Size aware (GreedyDual-Size)'),
+                    ('lfu', 'Least frequently used, with decay'),
+                    ('lru', 'Least recently used'),
+                    ('ttl', 'Time to live')
+                ], default='lfu', help_text='Policy used to select the '
+                'files to delete when the cache is full.', max_length=32,
+                verbose_name='Eviction policy'
+            ),
+        ),
+        migrations.AddField(
+            model_name='cache',
+            name='hit_count',
+            field=models.BigIntegerField(
+                default=0, editable=False, help_text='Number of reads of '
+                'the files no longer in the cache.', verbose_name='Hit count'
+            ),
+        ),
+        migrations.AddField(
+            model_name='cache',
+            name='miss_count',
+            field=models.BigIntegerField(
+                default=0, editable=False, help_text='Number of files '
+                'created in the cache.', verbose_name='Miss count'
+            ),
+        ),
+        migrations.AddField(
+            model_name='cachepartitionfile',
+            name='last_access',
+            field=models.DateTimeField(
+                db_index=True, default=django.utils.timezone.now,
+                verbose_name='Last access'
+            ),
+        ),
+        migrations.AddField(
+            model_name='cachepartitionfile',
+            name='priority',
+            field=models.FloatField(
+                db_index=True, default=0, help_text='Eviction priority '
+                'calculated by the eviction policy of the cache. Files with '
+                'the lowest priority are deleted first.',
+                verbose_name='Priority'
+            ),
+        ),
+        migrations.RunPython(
+            code=operation_cache_partition_file_last_access_copy,
+            reverse_code=migrations.RunPython.noop
+        ),
+        migrations.RunPython(
+            code=operation_cache_partition_file_priority_seed,
+            reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('file_caching', '0010_cache_eviction_policy'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cachepartitionfile',
+            name='checksum',
+            field=models.CharField(
+                blank=True, default='', editable=False, help_text='Checksum '
+                'of the content of the file. Part of the storage file name.',
+                max_length=64, verbose_name='Checksum'
+            ),
+        ),
+    ]
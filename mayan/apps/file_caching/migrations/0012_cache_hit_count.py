@@ -0,0 +1,44 @@
+from django.db import migrations, models
+from django.db.models import F, Sum
+
+
+def operation_cache_hit_count_update(apps, schema_editor):
+    """
+    The hit counter used to include only the reads of the deleted files.
+    Add the reads of the files still in the cache.
+    """
+    Cache = apps.get_model(app_label='file_caching', model_name='Cache')
+    CachePartitionFile = apps.get_model(
+        app_label='file_caching', model_name='CachePartitionFile'
+    )
+
+    queryset = CachePartitionFile.objects.using(
+        schema_editor.connection.alias
+    ).order_by().values('partition__cache').annotate(hits__sum=Sum('hits'))
+
+    for entry in queryset:
+        if entry['hits__sum']:
+            Cache.objects.using(schema_editor.connection.alias).filter(
+                pk=entry['partition__cache']
+            ).update(hit_count=F('hit_count') + entry['hits__sum'])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('file_caching', '0011_cachepartitionfile_checksum'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='cache',
+            name='hit_count',
+            field=models.BigIntegerField(
+                default=0, editable=False, help_text='Number of reads of '
+                'the cache files.', verbose_name='Hit count'
+            ),
+        ),
+        migrations.RunPython(
+            code=operation_cache_hit_count_update,
+            reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -1,12 +1,16 @@
 from contextlib import contextmanager
+from io import BytesIO
 import logging
+import os
+import uuid
 
 from django.core import validators
 from django.core.files.base import ContentFile
-from django.db import models
+from django.db import models, transaction
 from django.db.models import F, Sum
 from django.template.defaultfilters import filesizeformat
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.encoding import force_text
 from django.utils.functional import cached_property
 from django.utils.text import format_lazy
@@ -16,20 +20,23 @@ from mayan.apps.databases.model_mixins import ValueChangeModelMixin
 from mayan.apps.events.classes import EventManagerMethodAfter, EventManagerSave
 from mayan.apps.events.decorators import method_event
 from mayan.apps.lock_manager.backends.base import LockingBackend
-from mayan.apps.lock_manager.decorators import (
-    acquire_lock_class_method, release_lock_class_method, locked_class_method
-)
+from mayan.apps.lock_manager.decorators import locked_class_method
 from mayan.apps.lock_manager.exceptions import LockError
 from mayan.apps.storage.classes import DefinedStorage
 
+from .classes import (
+    CachePartitionFileHitBuffer, CachePartitionFileMemoryTier, HashingFile
+)
+from .eviction_policies import CacheEvictionPolicy
 from .events import (
     event_cache_created, event_cache_edited, event_cache_partition_purged,
     event_cache_purged
 )
 from .exceptions import FileCachingException
+from .literals import DEFAULT_EVICTION_POLICY
 from .settings import (
     setting_maximum_failed_prune_attempts,
-    setting_maximum_normal_prune_attempts
+    setting_maximum_normal_prune_attempts, setting_prune_batch_size
 )
 
 logger = logging.getLogger(name=__name__)
@@ -41,11 +48,44 @@ class Cache(ValueChangeModelMixin, models.Model):
             'Internal name of the defined storage for this cache.'
         ), max_length=96, unique=True, verbose_name=_('Defined storage name')
     )
+    eviction_policy = models.CharField(
+        choices=CacheEvictionPolicy.get_choices(),
+        default=DEFAULT_EVICTION_POLICY, help_text=_(
+            'Policy used to select the files to delete when the cache is '
+            'full.'
+        ), max_length=32, verbose_name=_('Eviction policy')
+    )
+    eviction_inflation = models.FloatField(
+        default=0, editable=False, help_text=_(
+            'Priority of the last evicted file. Used as the aging value by '
+            'the size aware eviction policy.'
+        ), verbose_name=_('Eviction inflation')
+    )
+    hit_count = models.BigIntegerField(
+        default=0, editable=False, help_text=_(
+            'Number of reads of the cache files.'
+        ), verbose_name=_('Hit count')
+    )
     maximum_size = models.BigIntegerField(
         help_text=_('Maximum size of the cache in bytes.'), validators=[
             validators.MinValueValidator(limit_value=1)
         ], verbose_name=_('Maximum size')
     )
+    miss_count = models.BigIntegerField(
+        default=0, editable=False, help_text=_(
+            'Number of files created in the cache.'
+        ), verbose_name=_('Miss count')
+    )
+    total_size = models.BigIntegerField(
+        default=0, editable=False, help_text=_(
+            'Running total of the size of the cache files in bytes.'
+        ), verbose_name=_('Total size')
+    )
+
+    # Fields updated atomically and never saved from an instance.
+    _counter_fields = (
+        'eviction_inflation', 'hit_count', 'miss_count', 'total_size'
+    )
 
     class Meta:
         verbose_name = _('Cache')
@@ -54,6 +94,53 @@ class Cache(ValueChangeModelMixin, models.Model):
     def __str__(self):
         return force_text(s=self.label)
 
+    def _delete_files(self, cache_partition_files, eviction_policy):
+        CachePartitionFile.delete_batch(
+            cache=self, cache_partition_files=cache_partition_files
+        )
+        eviction_policy.on_evict(
+            cache=self, cache_partition_files=cache_partition_files
+        )
+
+    def _lock_files(self, queryset):
+        """
+        Lock the files of a queryset, skipping the files already locked.
+        Returns the locks, the locked files and the skipped files.
+        """
+        locks = []
+        locked = []
+        skipped = []
+
+        for cache_partition_file in queryset:
+            lock_name = cache_partition_file._lock_manager_get_lock_name()
+            try:
+                lock = LockingBackend.get_backend().acquire_lock(
+                    name=lock_name
+                )
+            except LockError:
+                logger.debug(
+                    'Lock error trying to delete file "%s" for prune. '
+                    'Skipping and attempting next file.',
+                    cache_partition_file
+                )
+                skipped.append(cache_partition_file)
+            else:
+                locks.append(lock)
+                locked.append(cache_partition_file)
+
+        return locks, locked, skipped
+
+    def _update_counters(self, **kwargs):
+        """
+        Atomically add the keyword argument values to the counter fields.
+        """
+        updates = {
+            name: F(name) + value for name, value in kwargs.items() if value
+        }
+
+        if updates:
+            Cache.objects.filter(pk=self.pk).update(**updates)
+
     def get_absolute_url(self):
         return reverse(
             viewname='file_caching:cache_detail', kwargs={
@@ -61,6 +148,16 @@ class Cache(ValueChangeModelMixin, models.Model):
             }
         )
 
+    def get_eviction_policy(self):
+        try:
+            return CacheEvictionPolicy.get(name=self.eviction_policy)
+        except KeyError:
+            logger.warning(
+                'Unknown eviction policy "%s" for cache "%s", using the '
+                'default policy.', self.eviction_policy, self
+            )
+            return CacheEvictionPolicy.get(name=DEFAULT_EVICTION_POLICY)
+
     def get_files(self):
         return CachePartitionFile.objects.filter(partition__cache__id=self.pk)
 
@@ -80,75 +177,183 @@ class Cache(ValueChangeModelMixin, models.Model):
                 dotted_path='', label=_('Unknown'), name='unknown'
             )
 
-    def get_total_size(self):
+    def get_hit_rate_display(self):
+        # Use the counters of the instance to avoid queries in the list
+        # views. Reads still in the hit buffers are not included.
+        hit_rate = CacheEvictionPolicy.get_hit_rate(
+            hits=self.hit_count, misses=self.miss_count
+        )
+        return '{:0.1f}%'.format(hit_rate * 100)
+
+    get_hit_rate_display.help_text = _(
+        'Percentage of the cache accesses that found the requested file.'
+    )
+    get_hit_rate_display.short_description = _('Hit rate')
+
+    def get_files_size(self):
         """
-        Return the actual usage of the cache.
+        Return the actual usage of the cache by adding the size of all
+        the cache files.
         """
         return self.get_files().aggregate(
             file_size__sum=Sum('file_size')
         )['file_size__sum'] or 0
 
+    def get_statistics(self):
+        """
+        Return the hits, misses and hit rate of the cache. Hits are reads
+        of cache files and misses are creations of cache files.
+        """
+        CachePartitionFileHitBuffer.flush()
+        self.refresh_from_db(fields=('hit_count', 'miss_count'))
+
+        return {
+            'hit_rate': CacheEvictionPolicy.get_hit_rate(
+                hits=self.hit_count, misses=self.miss_count
+            ),
+            'hits': self.hit_count, 'misses': self.miss_count
+        }
+
+    def get_total_size(self):
+        """
+        Return the usage of the cache from the running total size.
+        """
+        self.refresh_from_db(fields=('total_size',))
+        return self.total_size
+
     def get_total_size_display(self):
         return format_lazy(
-            '{} ({:0.1f}%)', filesizeformat(bytes_=self.get_total_size()),
-            self.get_total_size() / self.maximum_size * 100
+            '{} ({:0.1f}%)', filesizeformat(bytes_=self.total_size),
+            self.total_size / self.maximum_size * 100
         )
 
     get_total_size_display.short_description = _('Current size')
     get_total_size_display.help_text = _('Current size of the cache.')
 
+    def get_usage(self):
+        """
+        Return the percentage of the maximum size in use.
+        """
+        return self.get_total_size() / self.maximum_size * 100
+
     @cached_property
     def label(self):
         return self.get_defined_storage().label
 
     def prune(self):
         """
-        Deletes files until the total size of the cache is below the allowed
-        maximum size of the cache.
+        Deletes the expired files and then deletes files until the total
+        size of the cache is below the allowed maximum size of the cache.
+        Files are selected in batches in the order of the eviction policy
+        and deleted using a single query per batch.
         """
+        eviction_policy = self.get_eviction_policy()
+
+        # Apply the reads of this process to use the current priorities.
+        CachePartitionFileHitBuffer.flush()
+
+        self.prune_expired(eviction_policy=eviction_policy)
+
         failed_attempts = 0
         normal_attempts = 0
-        file_index = 0
+        skipped_file_ids = set()
+
+        total_size = self.get_total_size()
+
+        while total_size >= self.maximum_size:
+            cache_partition_file_list = []
+            deleted_size = 0
+
+            queryset = eviction_policy.get_victim_queryset(
+                cache=self
+            ).exclude(pk__in=skipped_file_ids).select_related(
+                'partition__cache'
+            )[:setting_prune_batch_size.value]
+
+            # Select only the files needed to go below the maximum size.
+            for cache_partition_file in queryset:
+                if total_size - deleted_size < self.maximum_size:
+                    break
+
+                cache_partition_file_list.append(cache_partition_file)
+                deleted_size += cache_partition_file.file_size
 
-        while self.get_total_size() >= self.maximum_size:
-            cache_partition_file_queryset = self.get_files().order_by(
-                'hits', 'datetime'
+            if not cache_partition_file_list:
+                if skipped_file_ids:
+                    # All the remaining files are locked, retry them.
+                    skipped_file_ids.clear()
+                    continue
+                else:
+                    # Out of sync running total with no files left.
+                    self.update_total_size()
+                    return
+
+            locks, victims, skipped = self._lock_files(
+                queryset=cache_partition_file_list
             )
 
             try:
-                cache_partition_file = cache_partition_file_queryset[file_index]
-            except IndexError:
-                # Attempted to get a file beyond what the queryset provided.
-                file_index = 0
-            else:
-                try:
-                    cache_partition_file.delete()
-                except CachePartitionFile.DoesNotExist:
-                    # The file selected from deletion was deleted by another
-                    # process before the lock was acquired.
-                    file_index += 1
-                except LockError:
-                    logger.debug(
-                        'Lock error trying to delete file "%s" for prune. '
-                        'Skipping and attempting next file.',
-                        cache_partition_file
+                failed_attempts += len(skipped)
+                skipped_file_ids.update(
+                    cache_partition_file.pk for cache_partition_file in skipped
+                )
+
+                if failed_attempts > setting_maximum_failed_prune_attempts.value:
+                    raise FileCachingException(
+                        'Too many cache prune attempts failed.'
                     )
-                    failed_attempts += 1
-                    file_index += 1
 
-                    if failed_attempts > setting_maximum_failed_prune_attempts.value:
-                        raise FileCachingException(
-                            'Too many cache prune attempts failed.'
-                        )
-                else:
-                    file_index = 0
-                    normal_attempts += 1
+                normal_attempts += len(victims)
 
-                    if normal_attempts > setting_maximum_normal_prune_attempts.value:
-                        raise FileCachingException(
-                            'Too many cache prunes trying to create a '
-                            'single new file.'
-                        )
+                if normal_attempts > setting_maximum_normal_prune_attempts.value:
+                    raise FileCachingException(
+                        'Too many cache prunes trying to create a '
+                        'single new file.'
+                    )
+
+                if victims:
+                    self._delete_files(
+                        cache_partition_files=victims,
+                        eviction_policy=eviction_policy
+                    )
+            finally:
+                for lock in locks:
+                    lock.release()
+
+            total_size = self.get_total_size()
+
+    def prune_expired(self, eviction_policy=None):
+        """
+        Deletes the files expired according to the eviction policy.
+        """
+        eviction_policy = eviction_policy or self.get_eviction_policy()
+        skipped_file_ids = set()
+
+        while True:
+            queryset = eviction_policy.get_expired_queryset(
+                cache=self
+            ).exclude(pk__in=skipped_file_ids).select_related(
+                'partition__cache'
+            )[:setting_prune_batch_size.value]
+
+            locks, victims, skipped = self._lock_files(queryset=queryset)
+
+            try:
+                if victims:
+                    self._delete_files(
+                        cache_partition_files=victims,
+                        eviction_policy=eviction_policy
+                    )
+            finally:
+                for lock in locks:
+                    lock.release()
+
+            if not victims:
+                return
+
+            skipped_file_ids.update(
+                cache_partition_file.pk for cache_partition_file in skipped
+            )
 
     @method_event(
         event=event_cache_purged,
@@ -188,8 +393,32 @@ class Cache(ValueChangeModelMixin, models.Model):
             field='maximum_size'
         )
 
+        is_new = self._state.adding
+
+        if not is_new:
+            old_eviction_policy = Cache.objects.filter(
+                pk=self.pk
+            ).values_list('eviction_policy', flat=True).first()
+
+            if 'update_fields' not in kwargs:
+                # The counters are only updated atomically, never from a
+                # possibly stale instance.
+                kwargs['update_fields'] = [
+                    field.name for field in self._meta.concrete_fields
+                    if not field.primary_key and field.name not in self._counter_fields
+                ]
+
         result = super().save(*args, **kwargs)
 
+        if not is_new and self.eviction_policy != old_eviction_policy:
+            # The priorities and statistics of a policy are not valid for
+            # another policy.
+            CachePartitionFileHitBuffer.flush()
+            self.get_files().update(hits=0, priority=0)
+            Cache.objects.filter(pk=self.pk).update(
+                eviction_inflation=0, hit_count=0, miss_count=0
+            )
+
         if self.maximum_size < old_maximum_size:
             self.prune()
 
@@ -199,6 +428,36 @@ class Cache(ValueChangeModelMixin, models.Model):
     def storage(self):
         return self.get_defined_storage().get_storage_instance()
 
+    def update_eviction_inflation(self, value):
+        """
+        Raise the eviction inflation value, it never decreases.
+        """
+        Cache.objects.filter(
+            eviction_inflation__lt=value, pk=self.pk
+        ).update(eviction_inflation=value)
+        self.refresh_from_db(fields=('eviction_inflation',))
+
+    def update_total_size(self):
+        """
+        Reconcile the running total size with the actual size of the
+        cache files. Returns the difference found.
+        """
+        with transaction.atomic():
+            cache = Cache.objects.select_for_update().get(pk=self.pk)
+            files_size = cache.get_files_size()
+            difference = files_size - cache.total_size
+            Cache.objects.filter(pk=self.pk).update(total_size=files_size)
+
+        self.total_size = files_size
+
+        if difference:
+            logger.warning(
+                'Cache "%s" running total size was off by %d bytes.',
+                self, difference
+            )
+
+        return difference
+
 
 class CachePartition(models.Model):
     cache = models.ForeignKey(
@@ -221,8 +480,32 @@ class CachePartition(models.Model):
     def _lock_manager_get_lock_name(self, filename):
         return self.get_file_lock_name(filename=filename)
 
+    def _storage_move(self, source_name, destination_name):
+        """
+        Rename a storage file. Uses an atomic rename for storages with
+        local paths and a copy otherwise.
+        """
+        storage = self.cache.storage
+
+        try:
+            source_path = storage.path(name=source_name)
+            destination_path = storage.path(name=destination_name)
+        except NotImplementedError:
+            storage.delete(name=destination_name)
+            with storage.open(mode='rb', name=source_name) as file_object:
+                storage.save(content=file_object, name=destination_name)
+            storage.delete(name=source_name)
+        else:
+            os.replace(source_path, destination_path)
+
     @contextmanager
     def create_file(self, filename):
+        """
+        Create a new cache file. The content is written to a temporary
+        storage file that is renamed to a name derived from its checksum
+        once complete. The database entry is created afterwards, making
+        cache files immutable and readable without a lock.
+        """
         lock_name = self.get_file_lock_name(filename=filename)
         try:
             logger.debug('trying to acquire lock: %s', lock_name)
@@ -233,37 +516,63 @@ class CachePartition(models.Model):
 
                 # Since open "wb+" doesn't create files, force the creation
                 # of an empty file.
-                self.cache.storage.delete(
-                    name=self.get_full_filename(filename=filename)
-                )
-                self.cache.storage.save(
-                    name=self.get_full_filename(filename=filename),
-                    content=ContentFile(content='')
+                temporary_name = self.cache.storage.save(
+                    name=self.get_full_filename(
+                        filename='{}-{}.tmp'.format(filename, uuid.uuid4().hex)
+                    ), content=ContentFile(content='')
                 )
 
-                partition_file = None
+                storage_name = None
 
                 try:
-                    partition_file = self.files.create(filename=filename)
-                    yield partition_file._open_for_writing(_acquire_lock=False)
+                    storage_file = self.cache.storage.open(
+                        mode='wb', name=temporary_name
+                    )
+                    try:
+                        hashing_file = HashingFile(file_object=storage_file)
+                        yield hashing_file
+                    finally:
+                        storage_file.close()
+
+                    if hashing_file.size > self.cache.maximum_size:
+                        raise FileCachingException(
+                            'Cache partition file %s is bigger than the '
+                            'maximum cache size.' % filename
+                        )
+
+                    for partition_file in self.files.filter(filename=filename):
+                        # Replace a previous version of the file.
+                        partition_file.delete(_acquire_lock=False)
+
+                    partition_file = CachePartitionFile(
+                        checksum=hashing_file.get_checksum(),
+                        file_size=hashing_file.size, filename=filename,
+                        partition=self
+                    )
+                    storage_name = partition_file.full_filename
+                    self._storage_move(
+                        destination_name=storage_name,
+                        source_name=temporary_name
+                    )
+                    partition_file.priority = self.cache.get_eviction_policy().get_creation_priority(
+                        cache_partition_file=partition_file,
+                        datetime=timezone.now()
+                    )
+
+                    with transaction.atomic():
+                        partition_file.save()
+                        self.cache._update_counters(
+                            miss_count=1, total_size=partition_file.file_size
+                        )
                 except Exception as exception:
                     logger.error(
                         'Unexpected exception while trying to save new '
                         'cache file; %s', exception, exc_info=True
                     )
-                    if partition_file:
-                        partition_file.delete(_acquire_lock=False)
-                    else:
-                        # If the CachePartitionFile entry was not created
-                        # do manual clean up of the empty storage file
-                        # created with the previous`self.cache.storage.save`.
-                        self.cache.storage.delete(
-                            name=self.get_full_filename(filename=filename)
-                        )
+                    self.cache.storage.delete(name=temporary_name)
+                    if storage_name:
+                        self.cache.storage.delete(name=storage_name)
                     raise
-                else:
-                    partition_file.close(_acquire_lock=False)
-                    partition_file._update_size(_acquire_lock=False)
             finally:
                 lock.release()
         except LockError:
@@ -287,6 +596,64 @@ class CachePartition(models.Model):
             parent=self.name, filename=filename
         )
 
+    @contextmanager
+    def open_file(self, filename):
+        """
+        Open a cache file for reading by its filename. When the memory tier
+        is enabled, recently read files are served from memory without
+        accessing the database or the storage. Raises
+        CachePartitionFile.DoesNotExist if the file is not in the cache.
+        """
+        file_entry = self.open_file_entry(filename=filename)
+
+        try:
+            yield file_entry['file_object']
+        finally:
+            file_entry['file_object'].close()
+
+    def open_file_entry(self, filename):
+        """
+        Same as open_file() but returns a dictionary with the checksum,
+        the creation date time and the open file object of the cache file.
+        The caller must close the file object. Used by the streaming
+        responses that need the file details for the conditional request
+        headers.
+        """
+        entry = CachePartitionFileMemoryTier.get(
+            filename=filename, partition_id=self.pk
+        )
+
+        if entry:
+            CachePartitionFileHitBuffer.add(
+                cache_partition_file_id=entry['cache_partition_file_id']
+            )
+            return {
+                'checksum': entry['checksum'], 'datetime': entry['datetime'],
+                'file_object': BytesIO(entry['content'])
+            }
+
+        partition_file = self.get_file(filename=filename)
+        file_object = partition_file.open_storage_object()
+
+        if CachePartitionFileMemoryTier.is_enabled():
+            try:
+                content = file_object.read()
+            finally:
+                file_object.close()
+
+            CachePartitionFileMemoryTier.set(
+                cache_partition_file_id=partition_file.pk,
+                checksum=partition_file.checksum, content=content,
+                datetime=partition_file.datetime, filename=filename,
+                partition_id=self.pk
+            )
+            file_object = BytesIO(content)
+
+        return {
+            'checksum': partition_file.checksum,
+            'datetime': partition_file.datetime, 'file_object': file_object
+        }
+
     @method_event(
         event=event_cache_partition_purged,
         event_manager_class=EventManagerMethodAfter,
@@ -296,14 +663,20 @@ class CachePartition(models.Model):
         for parition_file in self.files.all():
             parition_file.delete()
 
+        CachePartitionFileMemoryTier.invalidate(partition_id=self.pk)
 
-class CachePartitionFile(models.Model):
-    _storage_object = None
 
+class CachePartitionFile(models.Model):
     partition = models.ForeignKey(
         on_delete=models.CASCADE, related_name='files',
         to=CachePartition, verbose_name=_('Cache partition')
     )
+    checksum = models.CharField(
+        blank=True, default='', editable=False, help_text=_(
+            'Checksum of the content of the file. Part of the storage '
+            'file name.'
+        ), max_length=64, verbose_name=_('Checksum')
+    )
     datetime = models.DateTimeField(
         auto_now_add=True, db_index=True, verbose_name=_('Date time')
     )
@@ -316,6 +689,15 @@ class CachePartitionFile(models.Model):
             'Times this cache partition file has been accessed.'
         ), verbose_name='Hits'
     )
+    last_access = models.DateTimeField(
+        db_index=True, default=timezone.now, verbose_name=_('Last access')
+    )
+    priority = models.FloatField(
+        db_index=True, default=0, help_text=_(
+            'Eviction priority calculated by the eviction policy of the '
+            'cache. Files with the lowest priority are deleted first.'
+        ), verbose_name=_('Priority')
+    )
 
     class Meta:
         get_latest_by = 'datetime'
@@ -323,87 +705,104 @@ class CachePartitionFile(models.Model):
         verbose_name = _('Cache partition file')
         verbose_name_plural = _('Cache partition files')
 
-    def _lock_manager_get_lock_name(self, *args, **kwargs):
-        return self.partition.get_file_lock_name(filename=self.filename)
-
-    @acquire_lock_class_method
-    def _open_for_writing(self):
+    @staticmethod
+    def delete_batch(cache, cache_partition_files):
         """
-        Open the file for writing only. If the file is written to, the
-        .update_size() must be called.
+        Delete several cache files of the same cache. The caller must hold
+        the lock of each file.
         """
-        try:
-            self._storage_object = self.partition.cache.storage.open(
-                mode='wb', name=self.full_filename
-            )
-            return self._storage_object
-        except Exception as exception:
-            logger.error(
-                'Unexpected exception opening the cache file; %s', exception,
-                exc_info=True
+        for cache_partition_file in cache_partition_files:
+            cache.storage.delete(name=cache_partition_file.full_filename)
+            CachePartitionFileMemoryTier.invalidate(
+                filename=cache_partition_file.filename,
+                partition_id=cache_partition_file.partition_id
             )
-            raise
 
-    @locked_class_method
-    def _update_size(self):
-        """
-        Called after creation and initial write only.
-        """
-        self.file_size = self.partition.cache.storage.size(
-            name=self.full_filename
+        queryset = CachePartitionFile.objects.filter(
+            pk__in=[
+                cache_partition_file.pk for cache_partition_file in cache_partition_files
+            ]
         )
-        self.save()
-        if self.file_size > self.partition.cache.maximum_size:
-            raise FileCachingException(
-                'Cache partition file %s is bigger than the maximum cache '
-                'size.'
+
+        with transaction.atomic():
+            # Use the values stored in the database to ignore the files
+            # already deleted by another process.
+            aggregate = queryset.aggregate(file_size__sum=Sum('file_size'))
+            queryset.delete()
+            cache._update_counters(
+                total_size=-(aggregate['file_size__sum'] or 0)
             )
 
-    @release_lock_class_method
-    def close(self):
-        if self._storage_object is not None:
-            self._storage_object.close()
-        self._storage_object = None
+    def _lock_manager_get_lock_name(self, *args, **kwargs):
+        return self.partition.get_file_lock_name(filename=self.filename)
 
     @locked_class_method
     def delete(self, *args, **kwargs):
         self.partition.cache.storage.delete(name=self.full_filename)
-        return super().delete(*args, **kwargs)
+        CachePartitionFileMemoryTier.invalidate(
+            filename=self.filename, partition_id=self.partition_id
+        )
+        with transaction.atomic():
+            # Use the values stored in the database in case this instance
+            # is stale.
+            file_size = CachePartitionFile.objects.filter(
+                pk=self.pk
+            ).values_list('file_size', flat=True).first() or 0
+            result = super().delete(*args, **kwargs)
+            self.partition.cache._update_counters(total_size=-file_size)
+
+        return result
 
     @cached_property
     def full_filename(self):
+        if self.checksum:
+            filename = '{}-{}'.format(self.filename, self.checksum)
+        else:
+            # Files created before the storage names included the checksum.
+            filename = self.filename
+
         return CachePartition.get_combined_filename(
-            parent=self.partition.name, filename=self.filename
+            parent=self.partition.name, filename=filename
         )
 
     @contextmanager
     def open(self):
         """
-        Open the file for reading only.
+        Open the file for reading only. Cache files are never modified
+        after creation, reading them does not require a lock.
         """
-        lock_name = self._lock_manager_get_lock_name()
+        storage_object = self.open_storage_object()
+
         try:
-            logger.debug('trying to acquire lock: %s', lock_name)
-            self._lock = LockingBackend.get_backend().acquire_lock(name=lock_name)
-            CachePartitionFile.objects.filter(pk=self.pk).update(hits=F('hits') + 1)
-            logger.debug('acquired lock: %s', lock_name)
-            self._storage_object = None
-            try:
-                self._storage_object = self.partition.cache.storage.open(
-                    mode='rb', name=self.full_filename
-                )
-            except Exception as exception:
-                logger.error(
-                    'Unexpected exception opening the cache file; %s', exception,
-                    exc_info=True
-                )
-                raise
-            else:
-                yield self._storage_object
-                self.close(_acquire_lock=False)
-            finally:
-                self.close(_acquire_lock=False)
-                self._lock.release()
-        except LockError:
-            logger.debug('unable to obtain lock: %s' % lock_name)
+            yield storage_object
+        finally:
+            storage_object.close()
+
+    def open_storage_object(self):
+        """
+        Open the file for reading only and return the storage file object.
+        The caller must close it. Used by streaming responses that close
+        the file when finished. Raises CachePartitionFile.DoesNotExist if
+        the file was deleted by a concurrent prune after the row was read.
+        """
+        try:
+            storage_object = self.partition.cache.storage.open(
+                mode='rb', name=self.full_filename
+            )
+        except FileNotFoundError:
+            logger.debug(
+                'Cache file "%s" was deleted before it could be opened.',
+                self.full_filename
+            )
+            raise CachePartitionFile.DoesNotExist(
+                'Cache file "{}" does not exist.'.format(self.full_filename)
+            )
+        except Exception as exception:
+            logger.error(
+                'Unexpected exception opening the cache file; %s', exception,
+                exc_info=True
+            )
             raise
+        else:
+            CachePartitionFileHitBuffer.add(cache_partition_file_id=self.pk)
+            return storage_object
@@ -1,18 +1,41 @@
+from datetime import timedelta
+
 from django.utils.translation import ugettext_lazy as _
 
 from mayan.apps.common.queues import queue_tools
 from mayan.apps.task_manager.classes import CeleryQueue
 from mayan.apps.task_manager.workers import worker_b
 
+from .literals import (
+    CACHE_PRUNE_EXPIRED_INTERVAL, CACHE_TOTAL_SIZE_UPDATE_INTERVAL
+)
+
 queue_file_caching = CeleryQueue(
     name='file_caching', label=_('File caching'), worker=worker_b
 )
+queue_file_caching_periodic = CeleryQueue(
+    label=_('File caching periodic'), name='file_caching_periodic',
+    transient=True, worker=worker_b
+)
 
 queue_file_caching.add_task_type(
     dotted_path='mayan.apps.file_caching.tasks.task_cache_partition_purge',
     label=_('Purge a file cache partition')
 )
 
+queue_file_caching_periodic.add_task_type(
+    dotted_path='mayan.apps.file_caching.tasks.task_cache_prune_expired',
+    label=_('Delete the expired files of the file caches'),
+    name='task_cache_prune_expired',
+    schedule=timedelta(seconds=CACHE_PRUNE_EXPIRED_INTERVAL)
+)
+queue_file_caching_periodic.add_task_type(
+    dotted_path='mayan.apps.file_caching.tasks.task_cache_total_size_update',
+    label=_('Reconcile the total size of the file caches'),
+    name='task_cache_total_size_update',
+    schedule=timedelta(seconds=CACHE_TOTAL_SIZE_UPDATE_INTERVAL)
+)
+
 queue_tools.add_task_type(
     dotted_path='mayan.apps.file_caching.tasks.task_cache_purge',
     label=_('Purge a file cache')
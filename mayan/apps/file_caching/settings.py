@@ -3,12 +3,43 @@ from django.utils.translation import ugettext_lazy as _
 from mayan.apps.smart_settings.classes import SettingNamespace
 
 from .literals import (
+    DEFAULT_EVICTION_POLICY_LFU_HALF_LIFE, DEFAULT_EVICTION_POLICY_TTL,
+    DEFAULT_HIT_BUFFER_INTERVAL, DEFAULT_HIT_BUFFER_SIZE,
     DEFAULT_MAXIMUM_FAILED_PRUNE_ATTEMPTS,
-    DEFAULT_MAXIMUM_NORMAL_PRUNE_ATTEMPTS
+    DEFAULT_MAXIMUM_NORMAL_PRUNE_ATTEMPTS, DEFAULT_MEMORY_TIER_MAXIMUM_SIZE,
+    DEFAULT_MEMORY_TIER_TIMEOUT, DEFAULT_PRUNE_BATCH_SIZE
 )
 
 namespace = SettingNamespace(label=_('File caching'), name='file_caching')
 
+setting_eviction_policy_lfu_half_life = namespace.add_setting(
+    default=DEFAULT_EVICTION_POLICY_LFU_HALF_LIFE,
+    global_name='FILE_CACHING_EVICTION_POLICY_LFU_HALF_LIFE', help_text=_(
+        'Time in seconds after which the accesses to a cache file count '
+        'half for the least frequently used eviction policy.'
+    )
+)
+setting_eviction_policy_ttl = namespace.add_setting(
+    default=DEFAULT_EVICTION_POLICY_TTL,
+    global_name='FILE_CACHING_EVICTION_POLICY_TTL', help_text=_(
+        'Time in seconds after which cache files are deleted for the '
+        'time to live eviction policy.'
+    )
+)
+setting_hit_buffer_interval = namespace.add_setting(
+    default=DEFAULT_HIT_BUFFER_INTERVAL,
+    global_name='FILE_CACHING_HIT_BUFFER_INTERVAL', help_text=_(
+        'Maximum time in seconds the reads of cache files are kept in '
+        'memory before being saved to the database.'
+    )
+)
+setting_hit_buffer_size = namespace.add_setting(
+    default=DEFAULT_HIT_BUFFER_SIZE,
+    global_name='FILE_CACHING_HIT_BUFFER_SIZE', help_text=_(
+        'Number of different cache files read after which the reads are '
+        'saved to the database.'
+    )
+)
 setting_maximum_failed_prune_attempts = namespace.add_setting(
     default=DEFAULT_MAXIMUM_FAILED_PRUNE_ATTEMPTS,
     global_name='FILE_CACHING_MAXIMUM_FAILED_PRUNE_ATTEMPTS', help_text=_(
@@ -24,3 +55,26 @@ setting_maximum_normal_prune_attempts = namespace.add_setting(
         'space for new a file being requested, before giving up.'
     )
 )
+setting_memory_tier_maximum_size = namespace.add_setting(
+    default=DEFAULT_MEMORY_TIER_MAXIMUM_SIZE,
+    global_name='FILE_CACHING_MEMORY_TIER_MAXIMUM_SIZE', help_text=_(
+        'Size in bytes of the memory of each process used to keep the most '
+        'recently read cache files. Cache files found in memory are served '
+        'without accessing the database or the storage. '
+        'A value of 0 disables the memory tier.'
+    )
+)
+setting_memory_tier_timeout = namespace.add_setting(
+    default=DEFAULT_MEMORY_TIER_TIMEOUT,
+    global_name='FILE_CACHING_MEMORY_TIER_TIMEOUT', help_text=_(
+        'Time in seconds a cache file is kept in the memory tier. Limits '
+        'the time other processes keep serving a file after it is deleted.'
+    )
+)
+setting_prune_batch_size = namespace.add_setting(
+    default=DEFAULT_PRUNE_BATCH_SIZE,
+    global_name='FILE_CACHING_PRUNE_BATCH_SIZE', help_text=_(
+        'Number of files selected for deletion at a time when a cache '
+        'is pruned.'
+    )
+)
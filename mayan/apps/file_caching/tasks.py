@@ -47,6 +47,16 @@ def task_cache_partition_purge(
         logger.info('Finished cache partition id %s purge', cache_partition)
 
 
+@app.task(ignore_result=True)
+def task_cache_prune_expired():
+    Cache = apps.get_model(
+        app_label='file_caching', model_name='Cache'
+    )
+
+    for cache in Cache.objects.all():
+        cache.prune_expired()
+
+
 @app.task(bind=True, ignore_result=True)
 def task_cache_purge(self, cache_id, user_id=None):
     Cache = apps.get_model(
@@ -69,3 +79,13 @@ def task_cache_purge(self, cache_id, user_id=None):
         raise self.retry(exc=exception)
     else:
         logger.info('Finished cache id %s purge', cache)
+
+
+@app.task(ignore_result=True)
+def task_cache_total_size_update():
+    Cache = apps.get_model(
+        app_label='file_caching', model_name='Cache'
+    )
+
+    for cache in Cache.objects.all():
+        cache.update_total_size()
@@ -3,6 +3,7 @@ from django.utils.encoding import force_bytes
 from mayan.apps.storage.classes import DefinedStorage
 from mayan.apps.storage.utils import fs_cleanup, mkdtemp
 
+from ..classes import CachePartitionFileMemoryTier
 from ..models import Cache
 from ..tasks import task_cache_partition_purge, task_cache_purge
 
@@ -34,6 +35,7 @@ class CacheTestMixin:
         self.test_cache_partition_files = []
 
     def tearDown(self):
+        CachePartitionFileMemoryTier.clear()
         fs_cleanup(filename=self.temporary_directory)
         super().tearDown()
 
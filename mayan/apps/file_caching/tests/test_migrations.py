@@ -0,0 +1,107 @@
+import math
+
+from django.test import tag
+
+from django_test_migrations.contrib.unittest_case import MigratorTestCase
+
+from ..eviction_policies import CacheEvictionPolicyLFU
+
+
+@tag('exclude', 'migration')
+class Migration0010CacheEvictionPolicyTestCase(MigratorTestCase):
+    migrate_from = ('file_caching', '0009_cache_total_size')
+    migrate_to = ('file_caching', '0010_cache_eviction_policy')
+
+    def prepare(self):
+        Cache = self.old_state.apps.get_model(
+            'file_caching', 'Cache'
+        )
+        CachePartition = self.old_state.apps.get_model(
+            'file_caching', 'CachePartition'
+        )
+        CachePartitionFile = self.old_state.apps.get_model(
+            'file_caching', 'CachePartitionFile'
+        )
+
+        cache = Cache.objects.create(
+            defined_storage_name='test_storage', maximum_size=100
+        )
+        cache_partition = CachePartition.objects.create(
+            cache=cache, name='test_partition'
+        )
+        CachePartitionFile.objects.create(
+            file_size=1, filename='test_file_cold', hits=0,
+            partition=cache_partition
+        )
+        CachePartitionFile.objects.create(
+            file_size=1, filename='test_file_hot', hits=7,
+            partition=cache_partition
+        )
+
+    def test_migration_0010_priority_seed(self):
+        CachePartitionFile = self.new_state.apps.get_model(
+            'file_caching', 'CachePartitionFile'
+        )
+
+        policy = CacheEvictionPolicyLFU()
+
+        cache_partition_file_cold = CachePartitionFile.objects.get(
+            filename='test_file_cold'
+        )
+        cache_partition_file_hot = CachePartitionFile.objects.get(
+            filename='test_file_hot'
+        )
+
+        self.assertAlmostEqual(
+            cache_partition_file_cold.priority, policy.get_time_value(
+                datetime=cache_partition_file_cold.datetime
+            )
+        )
+        self.assertAlmostEqual(
+            cache_partition_file_hot.priority, policy.get_time_value(
+                datetime=cache_partition_file_hot.datetime
+            ) + math.log2(8)
+        )
+
+
+@tag('exclude', 'migration')
+class Migration0012CacheHitCountTestCase(MigratorTestCase):
+    migrate_from = ('file_caching', '0011_cachepartitionfile_checksum')
+    migrate_to = ('file_caching', '0012_cache_hit_count')
+
+    def prepare(self):
+        Cache = self.old_state.apps.get_model(
+            'file_caching', 'Cache'
+        )
+        CachePartition = self.old_state.apps.get_model(
+            'file_caching', 'CachePartition'
+        )
+        CachePartitionFile = self.old_state.apps.get_model(
+            'file_caching', 'CachePartitionFile'
+        )
+
+        cache = Cache.objects.create(
+            defined_storage_name='test_storage', hit_count=3,
+            maximum_size=100
+        )
+        cache_partition = CachePartition.objects.create(
+            cache=cache, name='test_partition'
+        )
+        CachePartitionFile.objects.create(
+            file_size=1, filename='test_file_0', hits=2,
+            partition=cache_partition
+        )
+        CachePartitionFile.objects.create(
+            file_size=1, filename='test_file_1', hits=5,
+            partition=cache_partition
+        )
+
+    def test_migration_0012_hit_count_update(self):
+        Cache = self.new_state.apps.get_model(
+            'file_caching', 'Cache'
+        )
+
+        self.assertEqual(
+            Cache.objects.get(defined_storage_name='test_storage').hit_count,
+            10
+        )
@@ -1,9 +1,19 @@
+from datetime import timedelta
+
 import mock
 
+from django.test import override_settings
+from django.utils import timezone
+
+from mayan.apps.lock_manager.backends.base import LockingBackend
 from mayan.apps.testing.tests.base import BaseTestCase
 
+from ..classes import (
+    CachePartitionFileHitBuffer, CachePartitionFileMemoryTier
+)
+from ..eviction_policies import CacheEvictionPolicy
 from ..exceptions import FileCachingException
-from ..models import CachePartitionFile
+from ..models import Cache, CachePartitionFile
 
 from .literals import TEST_CACHE_PARTITION_FILE_FILENAME
 from .mixins import CacheTestMixin
@@ -101,6 +111,8 @@ class CacheModelTestCase(CacheTestMixin, BaseTestCase):
         with self.test_cache_partition_file.open():
             """Do nothing"""
 
+        CachePartitionFileHitBuffer.flush()
+
         self.test_cache_partition_file.refresh_from_db()
 
         self.assertEqual(
@@ -175,8 +187,15 @@ class CacheModelTestCase(CacheTestMixin, BaseTestCase):
             """Increase hits of file #1"""
 
         with self.test_cache_partition_files[0].open():
-            """Lock and increase hits of file #0"""
+            """Increase hits of file #0"""
+
+        lock = LockingBackend.get_backend().acquire_lock(
+            name=self.test_cache_partition_files[0]._lock_manager_get_lock_name()
+        )
+        try:
             self._create_test_cache_partition_file(file_size=1)
+        finally:
+            lock.release()
 
         self.assertTrue(
             self.test_cache_partition_files[0] in CachePartitionFile.objects.all()
@@ -187,3 +206,409 @@ class CacheModelTestCase(CacheTestMixin, BaseTestCase):
         self.assertTrue(
             self.test_cache_partition_files[2] in CachePartitionFile.objects.all()
         )
+
+    def test_cache_total_size_counter(self):
+        self._create_test_cache()
+        self._create_test_cache_partition()
+        self._create_test_cache_partition_file(file_size=1)
+        self._create_test_cache_partition_file(file_size=2)
+
+        self.assertEqual(self.test_cache.get_total_size(), 3)
+        self.assertEqual(self.test_cache.get_files_size(), 3)
+
+        self.test_cache_partition_files[0].delete()
+
+        self.assertEqual(self.test_cache.get_total_size(), 2)
+
+        self.test_cache_partition.purge()
+
+        self.assertEqual(self.test_cache.get_total_size(), 0)
+
+    def test_cache_total_size_not_overwritten_by_save(self):
+        self._create_test_cache()
+        self._create_test_cache_partition()
+
+        cache = Cache.objects.get(pk=self.test_cache.pk)
+
+        self._create_test_cache_partition_file(file_size=1)
+
+        cache.save()
+
+        self.assertEqual(self.test_cache.get_total_size(), 1)
+
+    def test_cache_update_total_size(self):
+        self._silence_logger(name='mayan.apps.file_caching.models')
+
+        self._create_test_cache()
+        self._create_test_cache_partition()
+        self._create_test_cache_partition_file(file_size=1)
+
+        Cache.objects.filter(pk=self.test_cache.pk).update(total_size=100)
+
+        self.assertEqual(self.test_cache.update_total_size(), -99)
+        self.assertEqual(self.test_cache.get_total_size(), 1)
+
+    @override_settings(FILE_CACHING_PRUNE_BATCH_SIZE=2)
+    def test_cache_prune_batch(self):
+        self._create_test_cache(
+            extra_data={
+                'maximum_size': 5
+            }
+        )
+        self._create_test_cache_partition()
+
+        for index in range(5):
+            self._create_test_cache_partition_file(file_size=1)
+
+        self.test_cache.maximum_size = 2
+        self.test_cache.save()
+
+        self.assertEqual(self.test_cache.get_total_size(), 1)
+        self.assertEqual(
+            list(
+                CachePartitionFile.objects.values_list('pk', flat=True)
+            ), [self.test_cache_partition_files[4].pk]
+        )
+
+    def test_cache_eviction_policy_change(self):
+        self._create_test_cache()
+        self._create_test_cache_partition()
+        self._create_test_cache_partition_file()
+
+        with self.test_cache_partition_file.open():
+            """Do nothing"""
+
+        self.test_cache.eviction_policy = 'lru'
+        self.test_cache.save()
+
+        self.assertEqual(
+            self.test_cache.get_statistics(), {
+                'hit_rate': 0, 'hits': 0, 'misses': 0
+            }
+        )
+
+    def test_cache_statistics(self):
+        self._create_test_cache()
+        self._create_test_cache_partition()
+        self._create_test_cache_partition_file()
+
+        with self.test_cache_partition_file.open():
+            """Do nothing"""
+
+        with self.test_cache_partition_file.open():
+            """Do nothing"""
+
+        self.assertEqual(
+            self.test_cache.get_statistics(), {
+                'hit_rate': 2 / 3, 'hits': 2, 'misses': 1
+            }
+        )
+
+        self.test_cache_partition_file.delete()
+
+        self.assertEqual(self.test_cache.get_statistics()['hits'], 2)
+        self.assertEqual(
+            CacheEvictionPolicy.get_statistics()[
+                self.test_cache.eviction_policy
+            ], {'hit_rate': 2 / 3, 'hits': 2, 'misses': 1}
+        )
+
+    def test_cache_hit_rate_display(self):
+        self._create_test_cache()
+        self._create_test_cache_partition()
+        self._create_test_cache_partition_file()
+
+        with self.test_cache_partition_file.open():
+            """Do nothing"""
+
+        CachePartitionFileHitBuffer.flush()
+        self.test_cache.refresh_from_db()
+
+        with self.assertNumQueries(num=0):
+            self.assertEqual(
+                self.test_cache.get_hit_rate_display(), '50.0%'
+            )
+
+    def test_cache_partition_file_checksum_storage_name(self):
+        self._create_test_cache()
+        self._create_test_cache_partition()
+        self._create_test_cache_partition_file()
+
+        self.assertTrue(self.test_cache_partition_file.checksum)
+        self.assertTrue(
+            self.test_cache_partition_file.full_filename.endswith(
+                self.test_cache_partition_file.checksum
+            )
+        )
+        # No temporary files are left.
+        self.assertEqual(
+            self.test_cache.storage.listdir(path='')[1],
+            [self.test_cache_partition_file.full_filename]
+        )
+
+    def test_cache_partition_file_open_without_lock(self):
+        self._create_test_cache()
+        self._create_test_cache_partition()
+        self._create_test_cache_partition_file(file_size=1)
+
+        lock = LockingBackend.get_backend().acquire_lock(
+            name=self.test_cache_partition_file._lock_manager_get_lock_name()
+        )
+        try:
+            with self.test_cache_partition_file.open() as file_object:
+                self.assertEqual(file_object.read(), b' ')
+        finally:
+            lock.release()
+
+    def test_cache_partition_file_open_missing_storage_file(self):
+        self._create_test_cache()
+        self._create_test_cache_partition()
+        self._create_test_cache_partition_file(file_size=1)
+
+        # Simulate a concurrent prune deleting the file after the row was
+        # read.
+        self.test_cache.storage.delete(
+            name=self.test_cache_partition_file.full_filename
+        )
+
+        with self.assertRaises(expected_exception=CachePartitionFile.DoesNotExist):
+            self.test_cache_partition_file.open_storage_object()
+
+    def test_cache_partition_file_replace(self):
+        self._create_test_cache()
+        self._create_test_cache_partition()
+        self._create_test_cache_partition_file(filename='test', file_size=1)
+        self._create_test_cache_partition_file(filename='test', file_size=2)
+
+        self.assertEqual(self.test_cache_partition.files.count(), 1)
+        self.assertEqual(self.test_cache.get_total_size(), 2)
+        self.assertEqual(
+            self.test_cache.storage.listdir(path='')[1],
+            [self.test_cache_partition_file.full_filename]
+        )
+
+    @override_settings(FILE_CACHING_HIT_BUFFER_SIZE=2)
+    def test_cache_partition_file_hit_buffer(self):
+        self._create_test_cache()
+        self._create_test_cache_partition()
+        self._create_test_cache_partition_file(file_size=1)
+        self._create_test_cache_partition_file(file_size=1)
+
+        CachePartitionFileHitBuffer.flush()
+
+        with self.test_cache_partition_files[0].open():
+            """Do nothing"""
+
+        with self.test_cache_partition_files[0].open():
+            """Do nothing"""
+
+        self.assertEqual(
+            list(
+                CachePartitionFile.objects.order_by('pk').values_list(
+                    'hits', flat=True
+                )
+            ), [0, 0]
+        )
+
+        with self.test_cache_partition_files[1].open():
+            """Do nothing, second file flushes the buffer"""
+
+        self.assertEqual(
+            CachePartitionFile.objects.get(
+                pk=self.test_cache_partition_files[0].pk
+            ).hits, 2
+        )
+        self.assertEqual(
+            CachePartitionFile.objects.get(
+                pk=self.test_cache_partition_files[1].pk
+            ).hits, 1
+        )
+
+
+class CacheEvictionPolicyTestCase(CacheTestMixin, BaseTestCase):
+    def _create_test_cache_files(self, eviction_policy, maximum_size=2):
+        self._create_test_cache(
+            extra_data={
+                'eviction_policy': eviction_policy,
+                'maximum_size': maximum_size
+            }
+        )
+        self._create_test_cache_partition()
+
+    def _test_access_order_eviction(self):
+        self._create_test_cache_partition_file(file_size=1)
+        self._create_test_cache_partition_file(file_size=1)
+
+        # File #1 is accessed more times, file #0 more recently.
+        with self.test_cache_partition_files[1].open():
+            """Do nothing"""
+
+        with self.test_cache_partition_files[1].open():
+            """Do nothing"""
+
+        self.test_cache_partition_files[0].refresh_from_db()
+
+        with self.test_cache_partition_files[0].open():
+            """Do nothing"""
+
+        self._create_test_cache_partition_file(file_size=1)
+
+        return CachePartitionFile.objects.all()
+
+    def test_greedy_dual_size_policy(self):
+        self._create_test_cache_files(eviction_policy='gds', maximum_size=3)
+
+        self._create_test_cache_partition_file(file_size=1)
+        self._create_test_cache_partition_file(file_size=2)
+        self._create_test_cache_partition_file(file_size=1)
+
+        queryset = CachePartitionFile.objects.all()
+
+        # The oldest small file is kept and the bigger file is evicted.
+        self.assertTrue(self.test_cache_partition_files[0] in queryset)
+        self.assertTrue(self.test_cache_partition_files[1] not in queryset)
+
+        self.test_cache.refresh_from_db()
+        self.assertEqual(self.test_cache.eviction_inflation, 0.5)
+
+    def test_lfu_policy(self):
+        self._create_test_cache_files(eviction_policy='lfu')
+
+        queryset = self._test_access_order_eviction()
+
+        self.assertTrue(self.test_cache_partition_files[0] not in queryset)
+        self.assertTrue(self.test_cache_partition_files[1] in queryset)
+
+    def test_lru_policy(self):
+        self._create_test_cache_files(eviction_policy='lru')
+
+        queryset = self._test_access_order_eviction()
+
+        self.assertTrue(self.test_cache_partition_files[0] in queryset)
+        self.assertTrue(self.test_cache_partition_files[1] not in queryset)
+
+    @override_settings(FILE_CACHING_EVICTION_POLICY_TTL=60)
+    def test_ttl_policy(self):
+        self._create_test_cache_files(eviction_policy='ttl', maximum_size=10)
+
+        self._create_test_cache_partition_file(file_size=1)
+        self._create_test_cache_partition_file(file_size=1)
+
+        CachePartitionFile.objects.filter(
+            pk=self.test_cache_partition_files[0].pk
+        ).update(datetime=timezone.now() - timedelta(seconds=120))
+
+        self.test_cache.prune_expired()
+
+        self.assertEqual(
+            list(CachePartitionFile.objects.values_list('pk', flat=True)),
+            [self.test_cache_partition_files[1].pk]
+        )
+        self.assertEqual(self.test_cache.get_total_size(), 1)
+
+
+@override_settings(FILE_CACHING_MEMORY_TIER_MAXIMUM_SIZE=100)
+class CachePartitionFileMemoryTierTestCase(CacheTestMixin, BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self._create_test_cache()
+        self._create_test_cache_partition()
+        self._create_test_cache_partition_file(file_size=5)
+
+    def _read_test_cache_partition_file(self):
+        with self.test_cache_partition.open_file(filename=self.test_cache_partition_file.filename) as file_object:
+            return file_object.read()
+
+    def test_open_file_from_memory(self):
+        self._read_test_cache_partition_file()
+
+        self.test_cache.storage.delete(
+            name=self.test_cache_partition_file.full_filename
+        )
+
+        with self.assertNumQueries(num=0):
+            content = self._read_test_cache_partition_file()
+
+        self.assertEqual(content, b'     ')
+
+        CachePartitionFileHitBuffer.flush()
+        self.test_cache_partition_file.refresh_from_db()
+        self.assertEqual(self.test_cache_partition_file.hits, 2)
+
+    def test_open_file_entry_from_memory(self):
+        self._read_test_cache_partition_file()
+
+        with self.assertNumQueries(num=0):
+            file_entry = self.test_cache_partition.open_file_entry(
+                filename=self.test_cache_partition_file.filename
+            )
+
+        with file_entry['file_object'] as file_object:
+            self.assertEqual(file_object.read(), b'     ')
+
+        self.assertEqual(
+            file_entry['checksum'], self.test_cache_partition_file.checksum
+        )
+        self.assertEqual(
+            file_entry['datetime'], self.test_cache_partition_file.datetime
+        )
+
+    def test_open_file_missing(self):
+        with self.assertRaises(expected_exception=CachePartitionFile.DoesNotExist):
+            with self.test_cache_partition.open_file(filename='missing'):
+                """Do nothing"""
+
+    @override_settings(FILE_CACHING_MEMORY_TIER_MAXIMUM_SIZE=0)
+    def test_open_file_memory_tier_disabled(self):
+        self._read_test_cache_partition_file()
+
+        self.assertEqual(
+            CachePartitionFileMemoryTier.get(
+                filename=self.test_cache_partition_file.filename,
+                partition_id=self.test_cache_partition.pk
+            ), None
+        )
+
+    def test_memory_tier_lru_eviction(self):
+        for index in range(11):
+            CachePartitionFileMemoryTier.set(
+                cache_partition_file_id=index, checksum='',
+                content=b'0123456789', datetime=None, filename=str(index),
+                partition_id=0
+            )
+
+        CachePartitionFileMemoryTier.get(filename='1', partition_id=0)
+
+        CachePartitionFileMemoryTier.set(
+            cache_partition_file_id=11, checksum='', content=b'0123456789',
+            datetime=None, filename='11', partition_id=0
+        )
+
+        self.assertEqual(
+            CachePartitionFileMemoryTier.get(filename='0', partition_id=0),
+            None
+        )
+        self.assertEqual(
+            CachePartitionFileMemoryTier.get(filename='2', partition_id=0),
+            None
+        )
+        self.assertEqual(
+            CachePartitionFileMemoryTier.get(
+                filename='1', partition_id=0
+            )['content'], b'0123456789'
+        )
+
+    def test_memory_tier_partition_purge_invalidation(self):
+        self._read_test_cache_partition_file()
+
+        self.test_cache_partition.purge()
+
+        self.assertEqual(
+            CachePartitionFileMemoryTier.get(
+                filename=self.test_cache_partition_file.filename,
+                partition_id=self.test_cache_partition.pk
+            ), None
+        )
+
+        with self.assertRaises(expected_exception=CachePartitionFile.DoesNotExist):
+            self._read_test_cache_partition_file()
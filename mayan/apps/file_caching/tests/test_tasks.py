@@ -1,6 +1,8 @@
 from mayan.apps.testing.tests.base import BaseTestCase
 
 from ..events import event_cache_partition_purged, event_cache_purged
+from ..models import Cache
+from ..tasks import task_cache_total_size_update
 
 from .mixins import CacheTestMixin, FileCachingTaskTestMixin
 
@@ -48,3 +50,15 @@ class FileCachingTaskTestCase(
         self.assertEqual(events[1].actor, self.test_cache)
         self.assertEqual(events[1].target, self.test_cache)
         self.assertEqual(events[1].verb, event_cache_purged.id)
+
+    def test_task_cache_total_size_update(self):
+        self._silence_logger(name='mayan.apps.file_caching.models')
+
+        Cache.objects.filter(pk=self.test_cache.pk).update(total_size=0)
+
+        task_cache_total_size_update.apply_async().get()
+
+        self.assertEqual(
+            self.test_cache.get_total_size(),
+            self.test_cache.get_files_size()
+        )
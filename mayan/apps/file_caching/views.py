@@ -31,6 +31,13 @@ class CacheDetailView(SingleObjectDetailView):
             {
                 'field': 'get_total_size_display',
             },
+            {
+                'field': 'get_eviction_policy_display',
+                'label': _('Eviction policy')
+            },
+            {
+                'field': 'get_hit_rate_display',
+            },
         ]
     }
     model = Cache
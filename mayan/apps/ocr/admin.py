@@ -2,7 +2,7 @@ from django.contrib import admin
 
 from .models import (
     DocumentTypeOCRSettings, DocumentVersionOCRError,
-    DocumentVersionPageOCRContent
+    DocumentVersionPageOCRContent, OCRResult
 )
 
 
@@ -19,4 +19,10 @@ class DocumentVersionOCRErrorAdmin(admin.ModelAdmin):
 
 @admin.register(DocumentVersionPageOCRContent)
 class DocumentVersionPageOCRContentAdmin(admin.ModelAdmin):
-    list_display = ('document_version_page',)
+    list_display = ('document_version_page', 'source')
+
+
+@admin.register(OCRResult)
+class OCRResultAdmin(admin.ModelAdmin):
+    list_display = ('checksum', 'datetime_created', 'hits')
+    readonly_fields = ('checksum', 'content', 'datetime_created', 'hits')
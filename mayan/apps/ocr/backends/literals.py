@@ -1,8 +1,12 @@
 import platform
 
+TESSERACT_MODE_API = 'api'
+TESSERACT_MODE_COMMAND = 'command'
+
 if platform.system() in ('FreeBSD', 'OpenBSD', 'Darwin'):
     DEFAULT_TESSERACT_BINARY_PATH = '/usr/local/bin/tesseract'
 else:
     DEFAULT_TESSERACT_BINARY_PATH = '/usr/bin/tesseract'
 
+DEFAULT_TESSERACT_MODE = TESSERACT_MODE_COMMAND
 DEFAULT_TESSERACT_TIMEOUT = 600  # 600 seconds, 10 minutes
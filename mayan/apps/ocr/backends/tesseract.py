@@ -1,6 +1,8 @@
+from contextlib import contextmanager
 import logging
 import os
 import shutil
+import threading
 
 import sh
 
@@ -12,7 +14,10 @@ from mayan.apps.storage.utils import TemporaryFile
 from ..classes import OCRBackendBase
 from ..exceptions import OCRError
 
-from .literals import DEFAULT_TESSERACT_BINARY_PATH, DEFAULT_TESSERACT_TIMEOUT
+from .literals import (
+    DEFAULT_TESSERACT_BINARY_PATH, DEFAULT_TESSERACT_MODE,
+    DEFAULT_TESSERACT_TIMEOUT, TESSERACT_MODE_API
+)
 
 logger = logging.getLogger(name=__name__)
 
@@ -27,60 +32,124 @@ class Tesseract(OCRBackendBase):
 
     def execute(self, *args, **kwargs):
         """
-        Execute the command line binary of tesseract
+        Execute the command line binary of tesseract or the long running
+        API when using the API mode.
         """
         super().execute(*args, **kwargs)
 
-        if self.command_tesseract:
-            image = self.converter.get_page()
+        try:
+            if self.mode == TESSERACT_MODE_API:
+                return self.execute_api()
+            elif self.command_tesseract:
+                return self.execute_command()
+        finally:
+            self.converter.close()
 
-            try:
-                temporary_image_file = TemporaryFile()
-                shutil.copyfileobj(fsrc=image, fdst=temporary_image_file)
-                temporary_image_file.seek(0)
+    def execute_api(self):
+        if not self.converter.image:
+            self.converter.seek_page(page_number=0)
 
-                arguments = ['-', '-']
+        try:
+            with TesseractAPIPool.get_api(language=self.language) as api:
+                api.SetImage(self.converter.image)
+                return api.GetUTF8Text()
+        except Exception as exception:
+            error_message = (
+                'Exception calling the Tesseract API with language '
+                'option: {}; {}'
+            ).format(self.language, exception)
+
+            if self.language not in self.languages:
+                error_message = (
+                    '{}\nThe requested OCR language "{}" is not '
+                    'available and needs to be installed.\n'
+                ).format(
+                    error_message, self.language
+                )
+
+            logger.error(error_message, exc_info=True)
+            raise OCRError(error_message)
+
+    def execute_command(self):
+        image = self.converter.get_page()
 
-                keyword_arguments = {
-                    '_in': temporary_image_file,
-                    '_timeout': self.command_timeout
-                }
+        try:
+            temporary_image_file = TemporaryFile()
+            shutil.copyfileobj(fsrc=image, fdst=temporary_image_file)
+            temporary_image_file.seek(0)
 
-                if self.language:
-                    keyword_arguments['l'] = self.language
+            arguments = ['-', '-']
 
-                environment = os.environ.copy()
-                environment.update(self.environment)
-                keyword_arguments['_env'] = environment
+            keyword_arguments = {
+                '_in': temporary_image_file,
+                '_timeout': self.command_timeout
+            }
 
-                try:
-                    result = self.command_tesseract(
-                        *arguments, **keyword_arguments
-                    )
-                    return force_text(s=result.stdout)
-                except Exception as exception:
+            if self.language:
+                keyword_arguments['l'] = self.language
+
+            environment = os.environ.copy()
+            environment.update(self.environment)
+            keyword_arguments['_env'] = environment
+
+            try:
+                result = self.command_tesseract(
+                    *arguments, **keyword_arguments
+                )
+                return force_text(s=result.stdout)
+            except Exception as exception:
+                error_message = (
+                    'Exception calling Tesseract with language option: {}; {}'
+                ).format(self.language, exception)
+
+                if self.language not in self.languages:
                     error_message = (
-                        'Exception calling Tesseract with language option: {}; {}'
-                    ).format(self.language, exception)
-
-                    if self.language not in self.languages:
-                        error_message = (
-                            '{}\nThe requested OCR language "{}" is not '
-                            'available and needs to be installed.\n'
-                        ).format(
-                            error_message, self.language
-                        )
-
-                    logger.error(error_message, exc_info=True)
-                    raise OCRError(error_message)
-                else:
-                    return result
-            finally:
-                temporary_image_file.close()
+                        '{}\nThe requested OCR language "{}" is not '
+                        'available and needs to be installed.\n'
+                    ).format(
+                        error_message, self.language
+                    )
+
+                logger.error(error_message, exc_info=True)
+                raise OCRError(error_message)
+            else:
+                return result
+        finally:
+            temporary_image_file.close()
+
+    def get_version(self):
+        return self.version
 
     def initialize(self):
         self.languages = ()
+        self.version = ''
+
+        if self.mode == TESSERACT_MODE_API:
+            self.initialize_api()
+        else:
+            self.initialize_command()
+
+    def initialize_api(self):
+        self.command_tesseract = None
+
+        # The environment is read when the API loads its libraries.
+        os.environ.update(self.environment)
 
+        try:
+            import tesserocr
+        except ImportError:
+            raise OCRError(
+                _('The tesserocr package required by the API mode is not installed.')
+            )
+
+        self.version = tesserocr.tesseract_version().split('\n')[0]
+        logger.debug('Tesseract version: %s', self.version)
+
+        self.languages = tuple(tesserocr.get_languages()[1])
+
+        logger.debug('Available languages: %s', ', '.join(self.languages))
+
+    def initialize_command(self):
         try:
             self.command_tesseract = sh.Command(path=self.tesseract_binary_path)
         except sh.CommandNotFound:
@@ -91,7 +160,11 @@ class Tesseract(OCRBackendBase):
         else:
             # Get version
             result = self.command_tesseract(v=True)
-            logger.debug('Tesseract version: %s', result.stdout)
+            # Older versions print the version to the standard error.
+            self.version = force_text(
+                s=result.stdout or result.stderr
+            ).strip().split('\n')[0]
+            logger.debug('Tesseract version: %s', self.version)
 
             # Get languages
             result = self.command_tesseract(list_langs=True)
@@ -113,6 +186,60 @@ class Tesseract(OCRBackendBase):
             'timeout', DEFAULT_TESSERACT_TIMEOUT
         )
         self.environment = self.kwargs.get('environment', {})
+        self.mode = self.kwargs.get('mode', DEFAULT_TESSERACT_MODE)
         self.tesseract_binary_path = self.kwargs.get(
             'tesseract_path', DEFAULT_TESSERACT_BINARY_PATH
         )
+
+
+class TesseractAPIPool:
+    """
+    Per process pool of long running Tesseract API instances provided by
+    the tesserocr package. Each instance keeps the model data of its
+    language loaded between pages. Instances are created on demand, one
+    for each thread performing OCR of the same language at the same time.
+    """
+    _apis = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            for apis in cls._apis.values():
+                for api in apis:
+                    api.End()
+
+            cls._apis.clear()
+
+    @staticmethod
+    def create_api(language=None):
+        import tesserocr
+
+        if language:
+            return tesserocr.PyTessBaseAPI(lang=language)
+        else:
+            return tesserocr.PyTessBaseAPI()
+
+    @classmethod
+    @contextmanager
+    def get_api(cls, language=None):
+        with cls._lock:
+            try:
+                api = cls._apis.get(language, []).pop()
+            except IndexError:
+                api = None
+
+        if api is None:
+            api = cls.create_api(language=language)
+
+        try:
+            yield api
+        except Exception:
+            # Discard the instance in case the error left it in an
+            # invalid state.
+            api.End()
+            raise
+        else:
+            api.Clear()
+            with cls._lock:
+                cls._apis.setdefault(language, []).append(api)
@@ -1,3 +1,6 @@
+import json
+import threading
+
 from django.utils.module_loading import import_string
 
 from mayan.apps.converter.classes import ConverterBase
@@ -6,11 +9,41 @@ from .settings import setting_ocr_backend, setting_ocr_backend_arguments
 
 
 class OCRBackendBase:
+    _instances = threading.local()
+
     @staticmethod
     def get_instance():
-        return import_string(
-            dotted_path=setting_ocr_backend.value
-        )(**setting_ocr_backend_arguments.value)
+        """
+        Return the configured backend. Instances are created once per
+        thread of each worker process and reused for every page as long
+        as the backend settings do not change.
+        """
+        key = (
+            setting_ocr_backend.value, json.dumps(
+                obj=setting_ocr_backend_arguments.value, sort_keys=True
+            )
+        )
+
+        try:
+            instances = OCRBackendBase._instances.instances
+        except AttributeError:
+            instances = OCRBackendBase._instances.instances = {}
+
+        instance = instances.get(key)
+
+        if instance is None:
+            instance = import_string(
+                dotted_path=setting_ocr_backend.value
+            )(**setting_ocr_backend_arguments.value)
+            # Keep only the instance of the current settings.
+            instances.clear()
+            instances[key] = instance
+
+        return instance
+
+    @staticmethod
+    def reset_instances():
+        OCRBackendBase._instances.instances = {}
 
     def __init__(self, *args, **kwargs):
         self.args = args
@@ -28,3 +61,10 @@ class OCRBackendBase:
 
         for transformation in transformations:
             self.converter.transform(transformation=transformation)
+
+    def get_version(self):
+        """
+        Return the version of the OCR engine. Stored OCR results are not
+        reused across versions.
+        """
+        return ''
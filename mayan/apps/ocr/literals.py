@@ -1,6 +1,22 @@
+from django.utils.translation import ugettext_lazy as _
+
 DEFAULT_OCR_AUTO_OCR = True
 DEFAULT_OCR_BACKEND = 'mayan.apps.ocr.backends.tesseract.Tesseract'
 DEFAULT_OCR_BACKEND_ARGUMENTS = {'environment': {'OMP_THREAD_LIMIT': '1'}}
+DEFAULT_OCR_PAGE_BATCH_SIZE = 1
+DEFAULT_OCR_RESULT_CACHE_ENABLED = True
+DEFAULT_OCR_TEXT_LAYER_MINIMUM_LENGTH = 0
+
+OCR_CONTENT_SOURCE_OCR = 'ocr'
+OCR_CONTENT_SOURCE_TEXT_LAYER = 'text_layer'
+OCR_CONTENT_SOURCE_CHOICES = (
+    (OCR_CONTENT_SOURCE_OCR, _('OCR')),
+    (OCR_CONTENT_SOURCE_TEXT_LAYER, _('Text layer')),
+)
 
 TASK_DOCUMENT_VERSION_PAGE_OCR_RETRY_DELAY = 10
 TASK_DOCUMENT_VERSION_PAGE_OCR_TIMEOUT = 10 * 60  # 10 Minutes per page
+
+# Minimum ratio of letters and digits to the non whitespace characters of
+# a text layer. Lower ratios are typical of broken text layers.
+TEXT_LAYER_MINIMUM_DENSITY = 0.5
@@ -0,0 +1,31 @@
+from django.apps import apps
+from django.core import management
+from django.utils.translation import ugettext_lazy as _
+
+
+class Command(management.BaseCommand):
+    help = (
+        'Report how many OCR results are stored and how often they were '
+        'reused instead of performing OCR.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--purge', action='store_true', dest='purge',
+            help=_('Delete all the stored OCR results after the report.')
+        )
+
+    def handle(self, *args, **options):
+        OCRResult = apps.get_model(app_label='ocr', model_name='OCRResult')
+
+        statistics = OCRResult.objects.get_statistics()
+
+        self.stdout.write(
+            'Stored results: {result_count}\n'
+            'Reused results: {hit_count}\n'
+            'Reuse rate: {reuse_rate:.1%}'.format(**statistics)
+        )
+
+        if options['purge']:
+            OCRResult.objects.all().delete()
+            self.stdout.write('Stored results deleted.')
@@ -1,13 +1,24 @@
+import hashlib
+import json
 import logging
 
 from django.apps import apps
 from django.db import models, transaction
+from django.db.models import F, Sum
 
 from mayan.apps.documents.literals import DOCUMENT_IMAGE_TASK_TIMEOUT
 from mayan.apps.lock_manager.backends.base import LockingBackend
 
 from .classes import OCRBackendBase
 from .events import event_ocr_document_version_content_deleted
+from .literals import (
+    OCR_CONTENT_SOURCE_OCR, OCR_CONTENT_SOURCE_TEXT_LAYER,
+    TEXT_LAYER_MINIMUM_DENSITY
+)
+from .settings import (
+    setting_ocr_backend, setting_ocr_backend_arguments,
+    setting_ocr_result_cache_enabled, setting_ocr_text_layer_minimum_length
+)
 
 logger = logging.getLogger(name=__name__)
 
@@ -25,19 +36,34 @@ class DocumentVersionPageOCRContentManager(models.Manager):
                 target=document_version
             )
 
-    def process_document_version_page(
-        self, document_version_page, user=None
-    ):
+    def execute_document_version_page(self, document_version_page, user=None):
+        """
+        Return the field values of the OCR content of a document version
+        page without saving them. Pages with a text layer use its content
+        instead of performing OCR.
+        """
         logger.info(
             'Processing page: %d of document version: %s',
             document_version_page.page_number,
             document_version_page.document_version
         )
 
-        DocumentVersionPageOCRContent = apps.get_model(
-            app_label='ocr', model_name='DocumentVersionPageOCRContent'
+        text_layer_content = self.get_text_layer_content(
+            document_version_page=document_version_page
         )
 
+        if text_layer_content is not None:
+            logger.info(
+                'Page: %d of document version: %s has a text layer, '
+                'skipping OCR',
+                document_version_page.page_number,
+                document_version_page.document_version
+            )
+            return {
+                'content': text_layer_content,
+                'source': OCR_CONTENT_SOURCE_TEXT_LAYER
+            }
+
         lock_name = document_version_page.get_lock_name(user=user)
 
         try:
@@ -52,16 +78,43 @@ class DocumentVersionPageOCRContentManager(models.Manager):
                 cache_filename = document_version_page.generate_image(
                     _acquire_lock=False, user=user
                 )
+                cache_file = document_version_page.cache_partition.get_file(
+                    filename=cache_filename
+                )
+                language = document_version_page.document_version.document.language
 
-                with document_version_page.cache_partition.get_file(filename=cache_filename).open() as file_object:
-                    ocr_content = OCRBackendBase.get_instance().execute(
-                        file_object=file_object,
-                        language=document_version_page.document_version.document.language
+                # Files cached before the checksums were stored cannot be
+                # matched with a stored result.
+                if setting_ocr_result_cache_enabled.value and cache_file.checksum:
+                    OCRResult = apps.get_model(
+                        app_label='ocr', model_name='OCRResult'
+                    )
+                    result_checksum = OCRResult.objects.get_checksum(
+                        image_checksum=cache_file.checksum, language=language
                     )
-                    DocumentVersionPageOCRContent.objects.update_or_create(
-                        document_version_page=document_version_page, defaults={
-                            'content': ocr_content
-                        }
+                    ocr_content = OCRResult.objects.get_content(
+                        checksum=result_checksum
+                    )
+                else:
+                    result_checksum = None
+                    ocr_content = None
+
+                if ocr_content is None:
+                    with cache_file.open() as file_object:
+                        ocr_content = OCRBackendBase.get_instance().execute(
+                            file_object=file_object, language=language
+                        )
+
+                    if result_checksum:
+                        OCRResult.objects.store(
+                            checksum=result_checksum, content=ocr_content
+                        )
+                else:
+                    logger.info(
+                        'Reusing the stored OCR result of an identical '
+                        'image for page: %d of document version: %s',
+                        document_version_page.page_number,
+                        document_version_page.document_version
                     )
             except Exception as exception:
                 logger.error(
@@ -75,9 +128,112 @@ class DocumentVersionPageOCRContentManager(models.Manager):
                     document_version_page.page_number,
                     document_version_page.document_version
                 )
+                return {
+                    'content': ocr_content, 'source': OCR_CONTENT_SOURCE_OCR
+                }
             finally:
                 document_version_page_lock.release()
 
+    def get_text_layer_content(self, document_version_page):
+        """
+        Return the parsed content of the document file page of a document
+        version page when it is long and dense enough to be a real text
+        layer. Returns None when the page needs OCR.
+        """
+        minimum_length = setting_ocr_text_layer_minimum_length.value
+
+        if not minimum_length:
+            return None
+
+        DocumentFilePage = apps.get_model(
+            app_label='documents', model_name='DocumentFilePage'
+        )
+
+        if document_version_page.content_type.model_class() != DocumentFilePage:
+            return None
+
+        try:
+            DocumentFilePageContent = apps.get_model(
+                app_label='document_parsing',
+                model_name='DocumentFilePageContent'
+            )
+        except LookupError:
+            return None
+
+        content = DocumentFilePageContent.objects.filter(
+            document_file_page_id=document_version_page.object_id
+        ).values_list('content', flat=True).first()
+
+        if not content:
+            return None
+
+        characters = ''.join(content.split())
+        alphanumeric_count = sum(
+            character.isalnum() for character in characters
+        )
+
+        if alphanumeric_count < minimum_length:
+            return None
+
+        if alphanumeric_count / len(characters) < TEXT_LAYER_MINIMUM_DENSITY:
+            return None
+
+        return content
+
+    def process_document_version_page(
+        self, document_version_page, user=None
+    ):
+        self.update_or_create(
+            document_version_page=document_version_page,
+            defaults=self.execute_document_version_page(
+                document_version_page=document_version_page, user=user
+            )
+        )
+
+    def process_document_version_pages(
+        self, document_version_pages, user=None
+    ):
+        """
+        OCR several document version pages and save the content of all
+        the pages with bulk queries. Pages that fail do not stop the
+        processing of the rest. Returns a dictionary of the exceptions
+        raised, keyed by the failed page.
+        """
+        exceptions = {}
+        ocr_contents = {}
+
+        for document_version_page in document_version_pages:
+            try:
+                ocr_contents[document_version_page.pk] = self.execute_document_version_page(
+                    document_version_page=document_version_page, user=user
+                )
+            except Exception as exception:
+                exceptions[document_version_page] = exception
+
+        if ocr_contents:
+            with transaction.atomic():
+                instances = list(
+                    self.select_for_update().filter(
+                        document_version_page_id__in=ocr_contents.keys()
+                    )
+                )
+
+                for instance in instances:
+                    for name, value in ocr_contents.pop(instance.document_version_page_id).items():
+                        setattr(instance, name, value)
+
+                self.bulk_update(fields=('content', 'source'), objs=instances)
+                self.bulk_create(
+                    objs=[
+                        self.model(
+                            document_version_page_id=document_version_page_id,
+                            **values
+                        ) for document_version_page_id, values in ocr_contents.items()
+                    ]
+                )
+
+        return exceptions
+
 
 class DocumentTypeSettingsManager(models.Manager):
     def get_by_natural_key(self, document_type_natural_key):
@@ -92,3 +248,53 @@ class DocumentTypeSettingsManager(models.Manager):
             raise self.model.DoesNotExist
 
         return self.get(document_type__pk=document_type.pk)
+
+
+class OCRResultManager(models.Manager):
+    def get_checksum(self, image_checksum, language):
+        """
+        Return the checksum of the result of the OCR of an image with the
+        current OCR backend configuration.
+        """
+        data = json.dumps(
+            obj=(
+                image_checksum, language, setting_ocr_backend.value,
+                setting_ocr_backend_arguments.value,
+                OCRBackendBase.get_instance().get_version()
+            ), sort_keys=True
+        )
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def get_content(self, checksum):
+        """
+        Return the stored content of a result and count the hit or None
+        if there is no result with the checksum.
+        """
+        content = self.filter(checksum=checksum).values_list(
+            'content', flat=True
+        ).first()
+
+        if content is not None:
+            self.filter(checksum=checksum).update(hits=F('hits') + 1)
+
+        return content
+
+    def get_statistics(self):
+        aggregate = self.aggregate(hits__sum=Sum('hits'))
+        hit_count = aggregate['hits__sum'] or 0
+        result_count = self.count()
+        # Each stored result is a page that had to be processed.
+        request_count = hit_count + result_count
+
+        if request_count:
+            reuse_rate = hit_count / request_count
+        else:
+            reuse_rate = 0
+
+        return {
+            'hit_count': hit_count, 'result_count': result_count,
+            'reuse_rate': reuse_rate
+        }
+
+    def store(self, checksum, content):
+        self.get_or_create(checksum=checksum, defaults={'content': content})
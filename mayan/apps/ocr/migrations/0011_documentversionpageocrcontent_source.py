@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('ocr', '0010_auto_20210304_1215'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='documentversionpageocrcontent',
+            name='source',
+            field=models.CharField(
+                choices=[('ocr', 'OCR'), ('text_layer', 'Text layer')],
+                default='ocr', help_text='Origin of the content. Either the '
+                'OCR backend or the text layer of the document file page.',
+                max_length=16, verbose_name='Source'
+            ),
+        ),
+    ]
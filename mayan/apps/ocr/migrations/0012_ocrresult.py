@@ -0,0 +1,51 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('ocr', '0011_documentversionpageocrcontent_source'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OCRResult',
+            fields=[
+                (
+                    'id', models.AutoField(
+                        auto_created=True, primary_key=True, serialize=False,
+                        verbose_name='ID'
+                    )
+                ),
+                (
+                    'checksum', models.CharField(
+                        editable=False, help_text='Hash of the page image, '
+                        'the language and the OCR backend configuration.',
+                        max_length=64, unique=True, verbose_name='Checksum'
+                    )
+                ),
+                (
+                    'content', models.TextField(
+                        blank=True, help_text='The text content extracted '
+                        'by the OCR backend.', verbose_name='Content'
+                    )
+                ),
+                (
+                    'datetime_created', models.DateTimeField(
+                        auto_now_add=True, db_index=True,
+                        verbose_name='Date time created'
+                    )
+                ),
+                (
+                    'hits', models.PositiveIntegerField(
+                        default=0, help_text='Number of times the result was '
+                        'reused instead of performing OCR.',
+                        verbose_name='Hits'
+                    )
+                ),
+            ],
+            options={
+                'verbose_name': 'OCR result',
+                'verbose_name_plural': 'OCR results',
+            },
+        ),
+    ]
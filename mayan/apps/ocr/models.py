@@ -6,8 +6,10 @@ from mayan.apps.documents.models.document_type_models import DocumentType
 from mayan.apps.documents.models.document_version_models import DocumentVersion
 from mayan.apps.documents.models.document_version_page_models import DocumentVersionPage
 
+from .literals import OCR_CONTENT_SOURCE_CHOICES, OCR_CONTENT_SOURCE_OCR
 from .managers import (
-    DocumentVersionPageOCRContentManager, DocumentTypeSettingsManager
+    DocumentVersionPageOCRContentManager, DocumentTypeSettingsManager,
+    OCRResultManager
 )
 
 
@@ -71,6 +73,13 @@ class DocumentVersionPageOCRContent(models.Model):
             'The actual text content extracted by the OCR backend.'
         ), verbose_name=_('Content')
     )
+    source = models.CharField(
+        choices=OCR_CONTENT_SOURCE_CHOICES, default=OCR_CONTENT_SOURCE_OCR,
+        help_text=_(
+            'Origin of the content. Either the OCR backend or the text '
+            'layer of the document file page.'
+        ), max_length=16, verbose_name=_('Source')
+    )
 
     objects = DocumentVersionPageOCRContentManager()
 
@@ -80,3 +89,40 @@ class DocumentVersionPageOCRContent(models.Model):
 
     def __str__(self):
         return force_text(s=self.document_version_page)
+
+
+class OCRResult(models.Model):
+    """
+    Content addressed store of OCR results. The checksum combines the
+    hash of the page image with the language and the OCR backend
+    configuration, allowing identical page images to reuse the text.
+    """
+    checksum = models.CharField(
+        editable=False, help_text=_(
+            'Hash of the page image, the language and the OCR backend '
+            'configuration.'
+        ), max_length=64, unique=True, verbose_name=_('Checksum')
+    )
+    content = models.TextField(
+        blank=True, help_text=_(
+            'The text content extracted by the OCR backend.'
+        ), verbose_name=_('Content')
+    )
+    datetime_created = models.DateTimeField(
+        auto_now_add=True, db_index=True, verbose_name=_('Date time created')
+    )
+    hits = models.PositiveIntegerField(
+        default=0, help_text=_(
+            'Number of times the result was reused instead of performing '
+            'OCR.'
+        ), verbose_name=_('Hits')
+    )
+
+    objects = OCRResultManager()
+
+    class Meta:
+        verbose_name = _('OCR result')
+        verbose_name_plural = _('OCR results')
+
+    def __str__(self):
+        return self.checksum
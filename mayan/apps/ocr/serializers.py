@@ -5,8 +5,9 @@ from .models import DocumentVersionPageOCRContent, DocumentTypeOCRSettings
 
 class DocumentVersionPageOCRContentSerializer(serializers.ModelSerializer):
     class Meta:
-        fields = ('content',)
+        fields = ('content', 'source')
         model = DocumentVersionPageOCRContent
+        read_only_fields = ('source',)
 
 
 class DocumentTypeOCRSettingsSerializer(serializers.ModelSerializer):
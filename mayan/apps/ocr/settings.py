@@ -3,7 +3,9 @@ from django.utils.translation import ugettext_lazy as _
 from mayan.apps.smart_settings.classes import SettingNamespace
 
 from .literals import (
-    DEFAULT_OCR_AUTO_OCR, DEFAULT_OCR_BACKEND, DEFAULT_OCR_BACKEND_ARGUMENTS
+    DEFAULT_OCR_AUTO_OCR, DEFAULT_OCR_BACKEND, DEFAULT_OCR_BACKEND_ARGUMENTS,
+    DEFAULT_OCR_PAGE_BATCH_SIZE, DEFAULT_OCR_RESULT_CACHE_ENABLED,
+    DEFAULT_OCR_TEXT_LAYER_MINIMUM_LENGTH
 )
 from .setting_migrations import OCRSettingMigration
 
@@ -26,3 +28,30 @@ setting_ocr_backend_arguments = namespace.add_setting(
     default=DEFAULT_OCR_BACKEND_ARGUMENTS,
     global_name='OCR_BACKEND_ARGUMENTS'
 )
+setting_ocr_page_batch_size = namespace.add_setting(
+    default=DEFAULT_OCR_PAGE_BATCH_SIZE, global_name='OCR_PAGE_BATCH_SIZE',
+    help_text=_(
+        'Number of document version pages processed by each OCR task. '
+        'Values bigger than 1 reduce the number of tasks and database '
+        'queries for documents with many pages. Only the failed pages of '
+        'a batch are retried.'
+    )
+)
+setting_ocr_result_cache_enabled = namespace.add_setting(
+    default=DEFAULT_OCR_RESULT_CACHE_ENABLED,
+    global_name='OCR_RESULT_CACHE_ENABLED', help_text=_(
+        'Store the OCR result of each page image and reuse it for identical '
+        'page images of the same language instead of performing OCR again. '
+        'Results are only reused with the same OCR backend, backend '
+        'arguments and backend version.'
+    )
+)
+setting_ocr_text_layer_minimum_length = namespace.add_setting(
+    default=DEFAULT_OCR_TEXT_LAYER_MINIMUM_LENGTH,
+    global_name='OCR_TEXT_LAYER_MINIMUM_LENGTH', help_text=_(
+        'Minimum number of letters and digits in the parsed content of a '
+        'document file page to use that content instead of performing '
+        'OCR. Pages of born digital documents usually have a text layer '
+        'that makes OCR unnecessary. A value of 0 disables the check.'
+    )
+)
@@ -11,6 +11,7 @@ from mayan.celery import app
 
 from .events import event_ocr_document_version_finish
 from .literals import TASK_DOCUMENT_VERSION_PAGE_OCR_RETRY_DELAY
+from .settings import setting_ocr_page_batch_size
 from .signals import signal_post_document_version_ocr
 
 logger = logging.getLogger(name=__name__)
@@ -30,14 +31,30 @@ def task_document_version_ocr_process(self, document_version_id, user_id=None):
     )
 
     try:
+        batch_size = setting_ocr_page_batch_size.value
         document_version_page_tasks = []
-        for document_version_page in document_version.pages.all():
-            document_version_page_tasks.append(
-                task_document_version_page_ocr_process.s(
-                    document_version_page_id=document_version_page.pk,
-                    user_id=user_id
-                )
+
+        if batch_size > 1:
+            document_version_page_id_list = list(
+                document_version.pages.values_list('pk', flat=True)
             )
+            for index in range(0, len(document_version_page_id_list), batch_size):
+                document_version_page_tasks.append(
+                    task_document_version_page_ocr_process_batch.s(
+                        document_version_page_id_list=document_version_page_id_list[
+                            index:index + batch_size
+                        ], user_id=user_id
+                    )
+                )
+        else:
+            for document_version_page in document_version.pages.all():
+                document_version_page_tasks.append(
+                    task_document_version_page_ocr_process.s(
+                        document_version_page_id=document_version_page.pk,
+                        user_id=user_id
+                    )
+                )
+
         chord(document_version_page_tasks)(
             task_document_version_ocr_finished.s(
                 document_version_id=document_version.pk, user_id=user_id
@@ -91,6 +108,72 @@ def task_document_version_page_ocr_process(
         raise self.retry(exc=exception)
 
 
+@app.task(
+    bind=True, default_retry_delay=TASK_DOCUMENT_VERSION_PAGE_OCR_RETRY_DELAY
+)
+def task_document_version_page_ocr_process_batch(
+    self, document_version_page_id_list, user_id=None
+):
+    """
+    OCR a batch of document version pages. Pages that fail with a
+    temporary error are retried by retrying this task with only those
+    pages.
+    """
+    CachePartitionFile = apps.get_model(
+        app_label='file_caching', model_name='CachePartitionFile'
+    )
+    DocumentVersionPageOCRContent = apps.get_model(
+        app_label='ocr', model_name='DocumentVersionPageOCRContent'
+    )
+    DocumentVersionPage = apps.get_model(
+        app_label='documents', model_name='DocumentVersionPage'
+    )
+    document_version_pages = DocumentVersionPage.objects.filter(
+        pk__in=document_version_page_id_list
+    ).select_related('document_version__document')
+
+    User = get_user_model()
+
+    if user_id:
+        user = User.objects.get(pk=user_id)
+    else:
+        user = None
+
+    exceptions = DocumentVersionPageOCRContent.objects.process_document_version_pages(
+        document_version_pages=document_version_pages, user=user
+    )
+
+    fatal_exception = None
+    retry_exception = None
+    retry_id_list = []
+
+    for document_version_page, exception in exceptions.items():
+        if isinstance(exception, CachePartitionFile.DoesNotExist):
+            logger.info(
+                'Document version page image not found. Possible cause '
+                'overloaded system or cache size too small. Retrying page.',
+            )
+        elif not isinstance(exception, (LockError, OperationalError)):
+            fatal_exception = exception
+            continue
+
+        retry_exception = exception
+        retry_id_list.append(document_version_page.pk)
+
+    if retry_id_list:
+        # Schedule the retry of the temporary failures before raising a
+        # fatal error of another page.
+        self.retry(
+            exc=retry_exception, kwargs={
+                'document_version_page_id_list': retry_id_list,
+                'user_id': user_id
+            }, throw=fatal_exception is None
+        )
+
+    if fatal_exception:
+        raise fatal_exception
+
+
 @app.task(bind=True, ignore_result=True)
 def task_document_version_ocr_finished(self, results, document_version_id, user_id=None):
     logger.info(
@@ -10,3 +10,12 @@ TEST_OCR_INDEX_NODE_TEMPLATE = '{% if "mayan" in document.version_active.ocr_con
 TEST_OCR_INDEX_NODE_TEMPLATE_LEVEL = 'mayan'
 
 TEST_UPDATE_DOCUMENT_PAGE_OCR_ACTION_DOTTED_PATH = 'mayan.apps.ocr.workflow_actions.UpdateDocumentPageOCRAction'
+
+TEST_OCR_BACKEND_DOTTED_PATH = 'mayan.apps.ocr.tests.mocks.TestOCRBackend'
+TEST_OCR_BACKEND_LOCK_ERROR_DOTTED_PATH = 'mayan.apps.ocr.tests.mocks.TestOCRBackendLockError'
+TEST_OCR_BACKEND_LOCK_ERROR_OCR_ERROR_DOTTED_PATH = 'mayan.apps.ocr.tests.mocks.TestOCRBackendLockErrorOCRError'
+TEST_OCR_LANGUAGE = 'eng'
+TEST_OCR_PAGE_BATCH_SIZE = 2
+TEST_OCR_TEXT_LAYER_CONTENT = 'Text layer content of a born digital page.'
+TEST_OCR_TEXT_LAYER_CONTENT_LOW_DENSITY = '.... ---- .... ---- .... ab12'
+TEST_OCR_TEXT_LAYER_MINIMUM_LENGTH = 10
@@ -0,0 +1,75 @@
+from mayan.apps.lock_manager.exceptions import LockError
+
+from ..backends.tesseract import TesseractAPIPool
+from ..classes import OCRBackendBase
+from ..exceptions import OCRError
+
+from .literals import TEST_DOCUMENT_VERSION_PAGE_OCR_CONTENT
+
+
+class TestOCRBackend(OCRBackendBase):
+    execute_count = 0
+    instance_count = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        TestOCRBackend.instance_count += 1
+
+    def execute(self, *args, **kwargs):
+        super().execute(*args, **kwargs)
+        TestOCRBackend.execute_count += 1
+        return TEST_DOCUMENT_VERSION_PAGE_OCR_CONTENT
+
+
+class TestOCRBackendLockError(TestOCRBackend):
+    """
+    Fail the first execution with a temporary error.
+    """
+    execute_count = 0
+
+    def execute(self, *args, **kwargs):
+        TestOCRBackendLockError.execute_count += 1
+
+        if TestOCRBackendLockError.execute_count == 1:
+            raise LockError
+
+        return super().execute(*args, **kwargs)
+
+
+class TestOCRBackendLockErrorOCRError(TestOCRBackend):
+    """
+    Fail the first execution with a temporary error and the second with
+    a fatal error.
+    """
+    execute_count = 0
+
+    def execute(self, *args, **kwargs):
+        TestOCRBackendLockErrorOCRError.execute_count += 1
+
+        if TestOCRBackendLockErrorOCRError.execute_count == 1:
+            raise LockError
+        elif TestOCRBackendLockErrorOCRError.execute_count == 2:
+            raise OCRError
+
+        return super().execute(*args, **kwargs)
+
+
+class TestTesseractAPI:
+    def __init__(self, language):
+        self.clear_count = 0
+        self.ended = False
+        self.language = language
+
+    def Clear(self):
+        self.clear_count += 1
+
+    def End(self):
+        self.ended = True
+
+
+class TestTesseractAPIPool(TesseractAPIPool):
+    _apis = {}
+
+    @staticmethod
+    def create_api(language=None):
+        return TestTesseractAPI(language=language)
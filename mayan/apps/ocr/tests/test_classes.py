@@ -0,0 +1,78 @@
+from django.test import override_settings
+
+from mayan.apps.testing.tests.base import BaseTestCase
+
+from ..classes import OCRBackendBase
+
+from .literals import TEST_OCR_BACKEND_DOTTED_PATH, TEST_OCR_LANGUAGE
+from .mocks import TestOCRBackend, TestTesseractAPIPool
+
+
+@override_settings(OCR_BACKEND=TEST_OCR_BACKEND_DOTTED_PATH)
+class OCRBackendBaseTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        OCRBackendBase.reset_instances()
+        TestOCRBackend.instance_count = 0
+
+    def tearDown(self):
+        OCRBackendBase.reset_instances()
+        super().tearDown()
+
+    def test_get_instance_arguments_change(self):
+        instance = OCRBackendBase.get_instance()
+
+        with self.override_setting(
+            global_name='OCR_BACKEND_ARGUMENTS', value={'test': 1}
+        ):
+            instance_new = OCRBackendBase.get_instance()
+
+        self.assertNotEqual(instance_new, instance)
+        self.assertEqual(instance_new.kwargs, {'test': 1})
+        self.assertEqual(TestOCRBackend.instance_count, 2)
+
+    def test_get_instance_reuse(self):
+        instance = OCRBackendBase.get_instance()
+
+        self.assertTrue(isinstance(instance, TestOCRBackend))
+        self.assertEqual(OCRBackendBase.get_instance(), instance)
+        self.assertEqual(TestOCRBackend.instance_count, 1)
+
+
+class TesseractAPIPoolTestCase(BaseTestCase):
+    def tearDown(self):
+        TestTesseractAPIPool.clear()
+        super().tearDown()
+
+    def test_api_concurrent(self):
+        with TestTesseractAPIPool.get_api(language=TEST_OCR_LANGUAGE) as api:
+            with TestTesseractAPIPool.get_api(language=TEST_OCR_LANGUAGE) as api_new:
+                self.assertNotEqual(api_new, api)
+
+        self.assertEqual(
+            len(TestTesseractAPIPool._apis[TEST_OCR_LANGUAGE]), 2
+        )
+
+    def test_api_error_discard(self):
+        with self.assertRaises(ValueError):
+            with TestTesseractAPIPool.get_api(language=TEST_OCR_LANGUAGE) as api:
+                raise ValueError
+
+        self.assertTrue(api.ended)
+
+        with TestTesseractAPIPool.get_api(language=TEST_OCR_LANGUAGE) as api_new:
+            self.assertNotEqual(api_new, api)
+
+    def test_api_per_language(self):
+        with TestTesseractAPIPool.get_api(language=TEST_OCR_LANGUAGE) as api:
+            with TestTesseractAPIPool.get_api(language=None) as api_new:
+                self.assertNotEqual(api_new, api)
+
+    def test_api_reuse(self):
+        with TestTesseractAPIPool.get_api(language=TEST_OCR_LANGUAGE) as api:
+            self.assertEqual(api.language, TEST_OCR_LANGUAGE)
+
+        with TestTesseractAPIPool.get_api(language=TEST_OCR_LANGUAGE) as api_new:
+            self.assertEqual(api_new, api)
+
+        self.assertEqual(api.clear_count, 2)
@@ -0,0 +1,45 @@
+from io import StringIO
+
+from django.core import management
+from django.test import override_settings
+
+from mayan.apps.documents.tests.base import GenericDocumentTestCase
+
+from ..models import OCRResult
+
+from .literals import TEST_OCR_BACKEND_DOTTED_PATH
+
+
+@override_settings(OCR_BACKEND=TEST_OCR_BACKEND_DOTTED_PATH)
+class OCRResultStatisticsManagementCommandTestCase(GenericDocumentTestCase):
+    def _call_test_command(self, **options):
+        out = StringIO()
+        management.call_command(
+            command_name='ocr_result_statistics', stdout=out, **options
+        )
+        return out.getvalue()
+
+    def test_ocr_result_statistics_command(self):
+        self.test_document_version.submit_for_ocr()
+        self._upload_test_document()
+        self.test_document_version.submit_for_ocr()
+
+        statistics = OCRResult.objects.get_statistics()
+
+        output = self._call_test_command()
+
+        self.assertIn(
+            'Stored results: {}'.format(statistics['result_count']), output
+        )
+        self.assertIn(
+            'Reuse rate: {:.1%}'.format(statistics['reuse_rate']), output
+        )
+        self.assertTrue(statistics['reuse_rate'] > 0)
+        self.assertTrue(OCRResult.objects.exists())
+
+    def test_ocr_result_statistics_command_purge(self):
+        self.test_document_version.submit_for_ocr()
+
+        self._call_test_command(purge=True)
+
+        self.assertFalse(OCRResult.objects.exists())
@@ -1,11 +1,34 @@
+from unittest import mock
+
+from celery.exceptions import Retry
+
 from django.test import override_settings
 
 from mayan.apps.documents.tests.base import GenericDocumentTestCase
-from mayan.apps.documents.tests.literals import TEST_DEU_DOCUMENT_PATH
+from mayan.apps.documents.tests.literals import (
+    TEST_DEU_DOCUMENT_PATH, TEST_MULTI_PAGE_TIFF_PATH
+)
+
+from mayan.apps.document_parsing.models import DocumentFilePageContent
+
+from ..exceptions import OCRError
+from ..literals import OCR_CONTENT_SOURCE_OCR, OCR_CONTENT_SOURCE_TEXT_LAYER
+from ..models import DocumentVersionPageOCRContent, OCRResult
+from ..tasks import task_document_version_page_ocr_process_batch
 
 from .literals import (
     TEST_DOCUMENT_VERSION_OCR_CONTENT, TEST_DOCUMENT_VERSION_OCR_CONTENT_DEU_1,
-    TEST_DOCUMENT_VERSION_OCR_CONTENT_DEU_2
+    TEST_DOCUMENT_VERSION_OCR_CONTENT_DEU_2,
+    TEST_DOCUMENT_VERSION_PAGE_OCR_CONTENT,
+    TEST_DOCUMENT_VERSION_PAGE_OCR_CONTENT_UPDATED,
+    TEST_OCR_BACKEND_DOTTED_PATH, TEST_OCR_BACKEND_LOCK_ERROR_DOTTED_PATH,
+    TEST_OCR_BACKEND_LOCK_ERROR_OCR_ERROR_DOTTED_PATH,
+    TEST_OCR_PAGE_BATCH_SIZE, TEST_OCR_TEXT_LAYER_CONTENT,
+    TEST_OCR_TEXT_LAYER_CONTENT_LOW_DENSITY,
+    TEST_OCR_TEXT_LAYER_MINIMUM_LENGTH
+)
+from .mocks import (
+    TestOCRBackend, TestOCRBackendLockError, TestOCRBackendLockErrorOCRError
 )
 
 
@@ -30,3 +53,193 @@ class GermanOCRSupportTestCase(GenericDocumentTestCase):
         self.assertTrue(
             TEST_DOCUMENT_VERSION_OCR_CONTENT_DEU_2 in content
         )
+
+
+@override_settings(
+    OCR_BACKEND=TEST_OCR_BACKEND_DOTTED_PATH,
+    OCR_PAGE_BATCH_SIZE=TEST_OCR_PAGE_BATCH_SIZE
+)
+class DocumentVersionPageOCRBatchTestCase(GenericDocumentTestCase):
+    test_document_path = TEST_MULTI_PAGE_TIFF_PATH
+
+    def test_document_version_ocr_batch(self):
+        self.test_document_version.submit_for_ocr()
+
+        self.assertEqual(
+            DocumentVersionPageOCRContent.objects.filter(
+                content=TEST_DOCUMENT_VERSION_PAGE_OCR_CONTENT,
+                document_version_page__document_version=self.test_document_version
+            ).count(), self.test_document_version.pages.count()
+        )
+
+    def test_document_version_ocr_batch_existing_content(self):
+        test_document_version_page = self.test_document_version.pages.first()
+        DocumentVersionPageOCRContent.objects.create(
+            content=TEST_DOCUMENT_VERSION_PAGE_OCR_CONTENT_UPDATED,
+            document_version_page=test_document_version_page
+        )
+
+        self.test_document_version.submit_for_ocr()
+
+        test_document_version_page.ocr_content.refresh_from_db()
+        self.assertEqual(
+            test_document_version_page.ocr_content.content,
+            TEST_DOCUMENT_VERSION_PAGE_OCR_CONTENT
+        )
+        self.assertEqual(
+            DocumentVersionPageOCRContent.objects.filter(
+                document_version_page__document_version=self.test_document_version
+            ).count(), self.test_document_version.pages.count()
+        )
+
+    @override_settings(OCR_BACKEND=TEST_OCR_BACKEND_LOCK_ERROR_DOTTED_PATH)
+    def test_document_version_ocr_batch_retry(self):
+        TestOCRBackendLockError.execute_count = 0
+
+        # Eager tasks raise the retry exception instead of retrying.
+        with self.assertRaises(expected_exception=Retry) as assertion:
+            self.test_document_version.submit_for_ocr()
+
+        queryset = DocumentVersionPageOCRContent.objects.filter(
+            content=TEST_DOCUMENT_VERSION_PAGE_OCR_CONTENT,
+            document_version_page__document_version=self.test_document_version
+        )
+        self.assertEqual(
+            queryset.count(), self.test_document_version.pages.count() - 1
+        )
+        self.assertEqual(
+            assertion.exception.sig.kwargs['document_version_page_id_list'],
+            [self.test_document_version.pages.first().pk]
+        )
+
+        assertion.exception.sig.apply()
+
+        self.assertEqual(
+            queryset.count(), self.test_document_version.pages.count()
+        )
+        self.assertEqual(
+            TestOCRBackendLockError.execute_count,
+            self.test_document_version.pages.count() + 1
+        )
+
+    @override_settings(
+        OCR_BACKEND=TEST_OCR_BACKEND_LOCK_ERROR_OCR_ERROR_DOTTED_PATH
+    )
+    def test_document_version_ocr_batch_retry_with_fatal_error(self):
+        TestOCRBackendLockErrorOCRError.execute_count = 0
+
+        with mock.patch.object(
+            target=task_document_version_page_ocr_process_batch,
+            attribute='retry',
+            wraps=task_document_version_page_ocr_process_batch.retry
+        ) as mock_retry:
+            with self.assertRaises(expected_exception=OCRError):
+                self.test_document_version.submit_for_ocr()
+
+        # The temporary failure is retried before the fatal error is
+        # raised.
+        self.assertEqual(mock_retry.call_count, 1)
+        self.assertEqual(
+            mock_retry.call_args[1]['kwargs']['document_version_page_id_list'],
+            [self.test_document_version.pages.first().pk]
+        )
+        self.assertFalse(mock_retry.call_args[1]['throw'])
+
+
+@override_settings(
+    OCR_BACKEND=TEST_OCR_BACKEND_DOTTED_PATH,
+    OCR_TEXT_LAYER_MINIMUM_LENGTH=TEST_OCR_TEXT_LAYER_MINIMUM_LENGTH
+)
+class DocumentVersionPageOCRTextLayerTestCase(GenericDocumentTestCase):
+    def _create_test_text_layer(self, content):
+        DocumentFilePageContent.objects.update_or_create(
+            defaults={'content': content},
+            document_file_page=self.test_document_file.pages.first()
+        )
+
+    def _get_test_document_version_page_ocr_content(self):
+        return DocumentVersionPageOCRContent.objects.get(
+            document_version_page=self.test_document_version.pages.first()
+        )
+
+    def test_text_layer(self):
+        self._create_test_text_layer(content=TEST_OCR_TEXT_LAYER_CONTENT)
+
+        self.test_document_version.submit_for_ocr()
+
+        ocr_content = self._get_test_document_version_page_ocr_content()
+        self.assertEqual(ocr_content.content, TEST_OCR_TEXT_LAYER_CONTENT)
+        self.assertEqual(ocr_content.source, OCR_CONTENT_SOURCE_TEXT_LAYER)
+
+    def test_text_layer_disabled(self):
+        self._create_test_text_layer(content=TEST_OCR_TEXT_LAYER_CONTENT)
+
+        with self.override_setting(
+            global_name='OCR_TEXT_LAYER_MINIMUM_LENGTH', value=0
+        ):
+            self.test_document_version.submit_for_ocr()
+
+        ocr_content = self._get_test_document_version_page_ocr_content()
+        self.assertEqual(
+            ocr_content.content, TEST_DOCUMENT_VERSION_PAGE_OCR_CONTENT
+        )
+        self.assertEqual(ocr_content.source, OCR_CONTENT_SOURCE_OCR)
+
+    def test_text_layer_low_density(self):
+        self._create_test_text_layer(
+            content=TEST_OCR_TEXT_LAYER_CONTENT_LOW_DENSITY
+        )
+
+        self.test_document_version.submit_for_ocr()
+
+        ocr_content = self._get_test_document_version_page_ocr_content()
+        self.assertEqual(
+            ocr_content.content, TEST_DOCUMENT_VERSION_PAGE_OCR_CONTENT
+        )
+        self.assertEqual(ocr_content.source, OCR_CONTENT_SOURCE_OCR)
+
+    def test_text_layer_short(self):
+        self._create_test_text_layer(
+            content=TEST_OCR_TEXT_LAYER_CONTENT[
+                :TEST_OCR_TEXT_LAYER_MINIMUM_LENGTH // 2
+            ]
+        )
+
+        self.test_document_version.submit_for_ocr()
+
+        ocr_content = self._get_test_document_version_page_ocr_content()
+        self.assertEqual(
+            ocr_content.content, TEST_DOCUMENT_VERSION_PAGE_OCR_CONTENT
+        )
+        self.assertEqual(ocr_content.source, OCR_CONTENT_SOURCE_OCR)
+
+
+@override_settings(OCR_BACKEND=TEST_OCR_BACKEND_DOTTED_PATH)
+class OCRResultTestCase(GenericDocumentTestCase):
+    def test_ocr_result_disabled(self):
+        with self.override_setting(
+            global_name='OCR_RESULT_CACHE_ENABLED', value=False
+        ):
+            self.test_document_version.submit_for_ocr()
+            execute_count = TestOCRBackend.execute_count
+
+            self._upload_test_document()
+            self.test_document_version.submit_for_ocr()
+
+        self.assertEqual(TestOCRBackend.execute_count, execute_count + 1)
+        self.assertEqual(OCRResult.objects.count(), 0)
+
+    def test_ocr_result_reuse(self):
+        self.test_document_version.submit_for_ocr()
+        execute_count = TestOCRBackend.execute_count
+        hit_count = OCRResult.objects.get().hits
+
+        self._upload_test_document()
+        self.test_document_version.submit_for_ocr()
+
+        self.assertEqual(TestOCRBackend.execute_count, execute_count)
+        self.assertEqual(OCRResult.objects.get().hits, hit_count + 1)
+        self.assertEqual(
+            self.test_document_version.pages.first().ocr_content.content,
+            TEST_DOCUMENT_VERSION_PAGE_OCR_CONTENT
+        )
@@ -225,11 +225,10 @@ class StagingFile:
 
         try:
             file_object = open(file=self.get_full_path(), mode='rb')
-            converter = ConverterBase.get_converter_class()(
+            with ConverterBase.get_converter_class()(
                 file_object=file_object
-            )
-
-            page_image = converter.get_page()
+            ) as converter:
+                page_image = converter.get_page()
 
             # Since open "wb+" doesn't create files, check if the file
             # exists, if not then create it
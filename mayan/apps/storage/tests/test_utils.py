@@ -1,3 +1,4 @@
+from io import BytesIO
 from pathlib import Path
 import shutil
 
@@ -8,11 +9,56 @@ from mayan.apps.documents.tests.base import GenericDocumentTestCase
 from mayan.apps.mimetype.api import get_mimetype
 from mayan.apps.testing.tests.base import BaseTestCase
 
-from ..utils import PassthroughStorageProcessor, mkdtemp, patch_files
+from ..utils import (
+    MaterializedFile, NamedTemporaryFile, PassthroughStorageProcessor,
+    get_file_object_path, mkdtemp, patch_files
+)
 
 from .mixins import StorageProcessorTestMixin
 
 
+class MaterializedFileTestCase(BaseTestCase):
+    test_content = b'test content'
+
+    def test_get_file_object_path_local_file(self):
+        with NamedTemporaryFile() as file_object:
+            file_object.write(self.test_content)
+
+            self.assertEqual(
+                get_file_object_path(file_object=file_object),
+                file_object.name
+            )
+
+    def test_get_file_object_path_memory_file(self):
+        file_object = BytesIO(self.test_content)
+        file_object.name = '/tmp/test_file'
+
+        self.assertEqual(get_file_object_path(file_object=file_object), None)
+
+    def test_local_file_not_copied(self):
+        with NamedTemporaryFile() as file_object:
+            file_object.write(self.test_content)
+
+            with MaterializedFile(file_object=file_object) as materialized_file:
+                self.assertEqual(materialized_file.get_path(), file_object.name)
+                self.assertEqual(materialized_file.temporary_file_object, None)
+
+    def test_memory_file_copied_once(self):
+        file_object = BytesIO(self.test_content)
+
+        with MaterializedFile(file_object=file_object) as materialized_file:
+            path = materialized_file.get_path()
+
+            with open(file=path, mode='rb') as materialized_file_object:
+                self.assertEqual(
+                    materialized_file_object.read(), self.test_content
+                )
+
+            self.assertEqual(materialized_file.get_path(), path)
+
+        self.assertFalse(Path(path).exists())
+
+
 class PatchFilesTestCase(BaseTestCase):
     test_replace_text = 'replaced_text'
 
@@ -14,6 +14,44 @@ from .settings import setting_temporary_directory
 logger = logging.getLogger(name=__name__)
 
 
+class MaterializedFile:
+    """
+    Filesystem path with the content of a file object. When the file object
+    reads directly from a local file, its path is used. Otherwise the
+    content is copied to a temporary file the first time the path is
+    requested. The temporary file is deleted when closed.
+    """
+    def __init__(self, file_object):
+        self.file_object = file_object
+        self.path = get_file_object_path(file_object=file_object)
+        self.temporary_file_object = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        if self.temporary_file_object:
+            self.temporary_file_object.close()
+            self.temporary_file_object = None
+            self.path = None
+
+    def get_path(self):
+        if not self.path:
+            self.temporary_file_object = NamedTemporaryFile()
+            self.file_object.seek(0)
+            shutil.copyfileobj(
+                fsrc=self.file_object, fdst=self.temporary_file_object
+            )
+            self.file_object.seek(0)
+            self.temporary_file_object.flush()
+            self.path = self.temporary_file_object.name
+
+        return self.path
+
+
 def NamedTemporaryFile(*args, **kwargs):
     kwargs.update({'dir': setting_temporary_directory.value})
     return tempfile.NamedTemporaryFile(*args, **kwargs)
@@ -103,6 +141,31 @@ def fs_cleanup(filename, suppress_exceptions=True):
                 raise
 
 
+def get_file_object_path(file_object):
+    """
+    Return the path of the local file a file object reads from or None if
+    the file object is not backed directly by a local file, like the files
+    of encrypted or compressed storages.
+    """
+    path = getattr(file_object, 'name', None)
+
+    if not isinstance(path, str) or not os.path.isabs(path):
+        return None
+
+    try:
+        # Compare the open file with the file at the path to rule out
+        # names that only look like paths.
+        file_stat = os.fstat(file_object.fileno())
+        path_stat = os.stat(path)
+    except (AttributeError, OSError, ValueError):
+        return None
+
+    if os.path.samestat(file_stat, path_stat):
+        # Write any pending data so that it can be read from the path.
+        file_object.flush()
+        return path
+
+
 def get_storage_subclass(dotted_path):
     """
     Import a storage class and return a subclass that will always return eq